@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+import create_room_from_schema as room
+import output_writer
+import schema_model
+import schema_reader
+
+
+# A benchmark of the generator on synthetic schemas.
+# Each scenario synthesizes a schema of a given shape, then times the parsing of the schema, the building of the
+# tables, each of the code emitters and the writing of the files separately, and records the peak memory allocated
+# by each stage on top of what the stages before it hold. The timings can be saved as a baseline, and later runs fail
+# when a stage is slower than its baseline by more than a threshold.
+
+# the shapes of the default scenarios, as (tables, columns per table, insert rows, indexes per table,
+# foreign keys per table)
+SCENARIOS = {
+    "small": (10, 5, 0, 1, 0),
+    "wide": (100, 500, 0, 2, 1),
+    "many-tables": (10000, 5, 0, 1, 1),
+    "dump": (10, 8, 1000000, 1, 1),
+}
+
+# the stages of the generator, in the order they run
+STAGES = ["parse", "parse_mmap", "build", "table_files", "database", "write", "rewrite"]
+
+_DATA_TYPES = ["INTEGER", "TEXT", "REAL", "BLOB", "NUMERIC", "DECIMAL(10,2)", "VARCHAR(255)", "BOOLEAN"]
+
+
+def get_input_args():
+    """
+    Retrieves and parses the command line arguments provided by the user when
+    they run the benchmark from a terminal window.
+    Parameters:
+     None - simply using argparse module to create & store command line arguments
+    Returns:
+     parse_args() -data structure that stores the command line arguments object
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="A scenario to run, may be given more than once. All of them are run by default")
+    parser.add_argument("--tables", type=int, help="Run a custom scenario with this many tables")
+    parser.add_argument("--columns", type=int, default=5, help="The number of columns per table of a custom scenario")
+    parser.add_argument("--rows", type=int, default=0, help="The number of INSERT rows of a custom scenario")
+    parser.add_argument("--indexes", type=int, default=1, help="The number of indexes per table of a custom scenario")
+    parser.add_argument("--foreign-keys", type=int, default=0,
+                        help="The number of foreign keys per table of a custom scenario")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="The number of times to run each stage, the fastest run is kept")
+    parser.add_argument("--no-memory", action="store_true", help="Do not record the peak memory of each stage")
+    parser.add_argument("-b", "--baseline", type=str, help="A baseline json file to compare the timings with")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Save the timings to the baseline file instead of comparing them")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25,
+                        help="The fraction by which a stage may be slower than its baseline before the benchmark "
+                             "fails")
+    parser.add_argument("--min-difference", type=float, default=0.005,
+                        help="The number of seconds a stage may be slower than its baseline regardless of the "
+                             "threshold, so that the noise in the timings of very fast stages is not a failure")
+    return parser.parse_args()
+
+
+def synthesize_schema(sql_file, tables, columns, rows=0, indexes=0, foreign_keys=0, seed=0):
+    """
+    Writes a synthetic sqlite dump.
+    Parameters:
+     sql_file - the path to write the schema to
+     tables - the number of tables
+     columns - the number of columns per table, besides the primary key
+     rows - the number of INSERT rows, spread over the tables
+     indexes - the number of indexes per table
+     foreign_keys - the number of foreign keys per table, referencing earlier tables
+     seed - the seed of the random column types
+    """
+    generator = random.Random(seed)
+    columns = max(columns, 1)
+    with open(sql_file, 'w') as file:
+        file.write("PRAGMA foreign_keys=OFF;\nBEGIN TRANSACTION;\n")
+        for table in range(tables):
+            definitions = ["\t`id`\tINTEGER NOT NULL PRIMARY KEY AUTOINCREMENT"]
+            for column in range(columns):
+                constraint = " NOT NULL" if generator.random() < 0.7 else ""
+                definitions.append("\t`column_{}`\t{}{}".format(column, generator.choice(_DATA_TYPES), constraint))
+            for key in range(min(foreign_keys, table, columns)):
+                definitions.append("\tFOREIGN KEY(`column_{}`) REFERENCES `table_{}`(`id`)".format(key,
+                                                                                             table - key - 1))
+            file.write("CREATE TABLE IF NOT EXISTS `table_{}` (\n{}\n);\n".format(table, ",\n".join(definitions)))
+        for table in range(tables):
+            for index in range(min(indexes, columns)):
+                file.write("CREATE {}INDEX IF NOT EXISTS `index_table_{}_column_{}` ON `table_{}` (`column_{}`);\n"
+                           .format("UNIQUE " if index == 0 else "", table, index, table, index))
+        values = ", ".join(["'text; with a semicolon'"] * columns)
+        for row in range(rows):
+            file.write("INSERT INTO `table_{}` VALUES({}, {});\n".format(row % max(tables, 1), row, values))
+        file.write("COMMIT;\n")
+
+
+def run_stages(sql_file, output_dir):
+    # run every stage of the generator once, yielding the name of each stage as it completes
+    tables_dict = schema_reader.read_sql_file(sql_file)
+    yield "parse"
+    schema_reader.read_sql_file(sql_file, use_mmap=True)
+    yield "parse_mmap"
+    tables = schema_model.build_tables(tables_dict)
+    yield "build"
+    creation_note = room.get_creation_note(deterministic=True)
+    # the files of each table as the generator creates them, with the key and page queries of its indexes
+    files = list()
+    entries = list()
+    for table in tables:
+        table_files, entity, dao_declaration = room.create_table_files("com.example.app", "AppDatabase", table,
+                                                                       creation_note)
+        files.extend(table_files)
+        entries.append((entity, dao_declaration))
+    yield "table_files"
+    files.extend(room.get_database_files("com.example.app", "AppDatabase", "app.db", [entity for entity, _ in entries],
+                                         [dao for _, dao in entries], 1, creation_note))
+    yield "database"
+    writer = output_writer.FileWriter(output_dir)
+    for filename, content in files:
+        writer.write(filename, content)
+    yield "write"
+    writer = output_writer.FileWriter(output_dir)
+    for filename, content in files:
+        writer.write(filename, content)
+    yield "rewrite"
+
+
+def measure(sql_file, repeat=3, memory=True):
+    """
+    Times each stage of the generator on a schema.
+    Parameters:
+     sql_file - the schema to generate the files for
+     repeat - the number of times to run each stage, the fastest run is kept
+     memory - whether or not to record the peak memory allocated by each stage, in an extra untimed run
+    Returns:
+     a dictionary of the stage names to dictionaries of their "seconds" and "peak_bytes", the peak memory a stage
+     allocated on top of what the stages before it still hold
+    """
+    results = {stage: {"seconds": float("inf"), "peak_bytes": None} for stage in STAGES}
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp()
+        try:
+            start_time = time.perf_counter()
+            for stage in run_stages(sql_file, output_dir):
+                end_time = time.perf_counter()
+                results[stage]["seconds"] = min(results[stage]["seconds"], end_time - start_time)
+                start_time = time.perf_counter()
+        finally:
+            shutil.rmtree(output_dir)
+    if memory:
+        output_dir = tempfile.mkdtemp()
+        tracemalloc.start()
+        try:
+            # the tables and files the earlier stages hand on are still allocated, so each stage is measured from
+            # the memory held when it starts
+            held = 0
+            for stage in run_stages(sql_file, output_dir):
+                results[stage]["peak_bytes"] = tracemalloc.get_traced_memory()[1] - held
+                tracemalloc.reset_peak()
+                held = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+            shutil.rmtree(output_dir)
+    return results
+
+
+def compare(results, baseline, threshold, min_difference=0.0):
+    # get the (scenario, stage, seconds, baseline seconds) of the stages slower than their baseline beyond threshold
+    regressions = list()
+    for scenario, stages in results.items():
+        for stage, result in stages.items():
+            baseline_seconds = baseline.get(scenario, {}).get(stage, {}).get("seconds")
+            if baseline_seconds is None or result["seconds"] - baseline_seconds <= min_difference:
+                continue
+            if result["seconds"] > baseline_seconds * (1 + threshold):
+                regressions.append((scenario, stage, result["seconds"], baseline_seconds))
+    return regressions
+
+
+def print_results(scenario, results, baseline):
+    print("\n{}".format(scenario))
+    print("{:<12}  {:>10}  {:>10}  {:>10}  {:>8}".format("stage", "seconds", "peak MB", "baseline", "change"))
+    for stage in STAGES:
+        result = results[stage]
+        peak = "-" if result["peak_bytes"] is None else "{:.1f}".format(result["peak_bytes"] / (1024 * 1024))
+        baseline_seconds = baseline.get(scenario, {}).get(stage, {}).get("seconds")
+        if baseline_seconds:
+            change = "{:+.0%}".format(result["seconds"] / baseline_seconds - 1)
+            baseline_text = "{:.4f}".format(baseline_seconds)
+        else:
+            change = baseline_text = "-"
+        print("{:<12}  {:>10.4f}  {:>10}  {:>10}  {:>8}".format(stage, result["seconds"], peak, baseline_text,
+                                                               change))
+
+
+if __name__ == '__main__':
+    in_arg = get_input_args()
+    if in_arg.save_baseline and in_arg.baseline is None:
+        print("\n\nNo baseline file provided\n\n")
+        exit(1)
+    if in_arg.tables is not None:
+        scenarios = {"custom": (in_arg.tables, in_arg.columns, in_arg.rows, in_arg.indexes, in_arg.foreign_keys)}
+    else:
+        scenarios = {name: SCENARIOS[name] for name in (in_arg.scenario or SCENARIOS)}
+
+    baseline = dict()
+    if in_arg.baseline is not None and not in_arg.save_baseline and os.path.exists(in_arg.baseline):
+        with open(in_arg.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    all_results = dict()
+    schema_dir = tempfile.mkdtemp()
+    try:
+        for scenario, shape in scenarios.items():
+            sql_file = os.path.join(schema_dir, "{}.sql".format(scenario))
+            synthesize_schema(sql_file, *shape)
+            all_results[scenario] = measure(sql_file, in_arg.repeat, not in_arg.no_memory)
+            print_results(scenario, all_results[scenario], baseline)
+    finally:
+        shutil.rmtree(schema_dir)
+
+    if in_arg.save_baseline:
+        with open(in_arg.baseline, 'w') as baseline_file:
+            json.dump(all_results, baseline_file, indent=2)
+        print("\nSaved the baseline to {}".format(in_arg.baseline))
+    else:
+        regressions = compare(all_results, baseline, in_arg.threshold, in_arg.min_difference)
+        if regressions:
+            print()
+        for scenario, stage, seconds, baseline_seconds in regressions:
+            print("Regression: the {} stage of {} took {:.4f}s against a baseline of {:.4f}s".format(
+                stage, scenario, seconds, baseline_seconds))
+        if regressions:
+            exit(1)
@@ -1,8 +1,15 @@
 import re
-import os
-import errno
-import datetime
+import sys
+import time
 import argparse
+import cProfile
+
+import instrumentation
+import output_writer
+import schema_cache
+import schema_reader
+import template_engine
+from template_engine import clean, get_creation_note
 # A program for converting an sql(ite) file into a model class for use with RoomDB for android
 
 def get_input_args():
@@ -18,100 +25,53 @@ def get_input_args():
     # Create Parse using ArgumentParser
     parser = argparse.ArgumentParser()
     # Create 4 command line arguments
-    parser.add_argument("-d", "--dir", type=str, help="The directory of the sql schema")
+    parser.add_argument("-d", "--dir", type=str, help="The directory of the sql schema, or of a sqlite database")
+    parser.add_argument("-m", "--mmap", action="store_true",
+                        help="Memory map the schema and skip over everything but the CREATE statements without "
+                             "reading it, for large database dumps")
+    parser.add_argument("-a", "--archive", type=str,
+                        help="Write all the files into a single zip archive, or a tar archive if it ends in {}, "
+                             "instead of separate files. {} streams a tar archive to standard output".format(
+                                 ", ".join(output_writer.TAR_SUFFIXES), output_writer.STDOUT))
+    parser.add_argument("-t", "--templates", type=str,
+                        help="A directory of templates to use instead of the default ones, named as in the "
+                             "templates directory")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Leave the creation time out of the generated files, so that they only change with "
+                             "the schema")
+    parser.add_argument("--timings", nargs="?", const=instrumentation.TEXT,
+                        choices=[instrumentation.TEXT, instrumentation.JSON],
+                        help="Report the time taken by each stage and table, the bytes read and written, the files "
+                             "written and skipped and the peak memory, as text or as json lines")
+    parser.add_argument("--profile", type=str,
+                        help="Write a cProfile dump of the generation of the files to this file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse the schema even if it has not changed since it was last cached")
+    parser.add_argument("--cache-dir", type=str, default=schema_cache.default_cache_dir(),
+                        help="The directory of the parsed schema cache")
+    parser.add_argument("--cache-size", type=int, default=schema_cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+                        help="The size limit of the parsed schema cache in megabytes, "
+                             "the least recently used schemas are evicted beyond it")
     
     return parser.parse_args()
 
 
-def read_sql_file(sql_file):
-    tables_dict = dict()
-    print(sql_file)
-    with open(sql_file, 'r') as file:
-        #read the file as a single line
-        data = file.read().replace('\n', '')
-        data = data.replace('"', '`')
-        # split the line into segments
-        sql_data_segments = list(data.split(";"))
-        for segment in sql_data_segments:
-            # if not a create table statement, ignore it
-            if "create table" not in segment.lower():
-                continue
-            else:
-                # get the table name from the segment, 
-                # the table name is the last word before the opening parentheses
-                #print(segment)
-                entity = clean(segment.split("(")[0].strip().split(" ")[-1])
-                # print the entity name
-                #print(entity)
-                # get the text within the parentheses
-                columns_data = re.search(r'\(.*\)', segment)
-                #print(columns_data.group(0)[1:-1].strip())
-                # split the text within the parentheses
-                dirty_columns_data = columns_data.group(0)[1:-1].strip().split(",")
-                                # add a primary key field if not was defined for any column
-                if "primary key" not in ", ".join(dirty_columns_data).lower():
-                    dirty_columns_data.append("\t`auto_incremented_id_field`\tINTEGER PRIMARY KEY AUTOINCREMENT")
-                # remove unneccesary white space from the egdes of each word
-                clean_columns_data = [x.strip().replace("\t", " ") for x in dirty_columns_data]
-                #print(clean_columns_data)
-                # get column names and other data
-                column_names = [clean(x.split(" ")[0].strip()) for x in clean_columns_data]
-                #print(column_names)
-                # get the data types for each column
-                column_data_types = [clean(x.split(" ")[1].strip()) for x in clean_columns_data]
-                #print(column_data_types)
-                # get other column data for each column
-                other_column_data = list()
-                for column in clean_columns_data:
-                    if "primary key" in column.lower():
-                        other_column_data.append("primary key")
-                    elif "not null" in column.lower():
-                        other_column_data.append("not null")
-                    else:
-                        other_column_data.append("")
-                #print(other_column_data)
-                # set the columns data for the entity in the dictionary
-                tables_dict[entity] = list(zip(column_names, column_data_types, other_column_data))
-                #print(list(tables_dict[entity]))
-    #print(tables_dict)
-    # return our tables data as a dictionary
-    return tables_dict;
-
-def clean(txt):
-    return txt.strip("`").strip("'").strip('"')
-
-def get_field_declarations(values):
-    field_declarations = ""
-    completed_fields = list()
-    for field_name, data_type, field_qualifier in values:
-        if field_name in completed_fields or field_name.lower() in ["foreign", "primary"]:# eliminate the foreign keys and primary key additional data
-            continue
-        else:
-            completed_fields.append(field_name)
-        field_declarations += "\n"
+def get_field_declarations(columns):
+    field_declarations = list()
+    for column in columns:
         # create a field declaration for our class
-        # make a camel case variable name
-        camel_cased_name = field_name.replace("_", " ").title().replace(" ", "")
-        camel_cased_name = camel_cased_name[0].lower() + camel_cased_name[1:]
-        
+        field_declarations.append("\n")
         # add the generic field data
-        if "primary key" in field_qualifier:
-            if "integer" in data_type.lower() or "timestamp" in data_type.lower():
-                field_declarations += "\n{} {};".format("int get ", camel_cased_name)
-            elif "real" in data_type.lower():
-                field_declarations += "\n{} {};".format("double get ", camel_cased_name)
-            else:
-                field_declarations += "\n{} {};".format("String get ", camel_cased_name)
+        if column.primary_key:
+            field_declarations.append("\n{} get  {};".format(column.dart_type, column.java_name))
         else:
-            if "integer" in data_type.lower() or "timestamp" in data_type.lower():
-                field_declarations += "\n@BuiltValueField(wireName: \"{}\")\n{} {};".format(field_name, "int get ", camel_cased_name)
-            elif "real" in data_type.lower():
-                field_declarations += "\n@BuiltValueField(wireName: \"{}\")\n{} {};".format(field_name, "double get ", camel_cased_name)
-            else:
-                field_declarations += "\n@BuiltValueField(wireName: \"{}\")\n{} {};".format(field_name, "String get ", camel_cased_name)
+            # a built value field is only allowed to be null if it is annotated
+            if column.nullable:
+                field_declarations.append("\n@nullable")
+            field_declarations.append("\n@BuiltValueField(wireName: \"{}\")\n{} get  {};".format(
+                column.name, column.dart_type, column.java_name))
 
-    #print(field_declarations)
-    return field_declarations
+    return "".join(field_declarations)
 
 def camel_to_snake(name):
     name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
@@ -120,39 +80,35 @@ def camel_to_snake(name):
 def lowerFirstLetter(name):
     return name[0].lower() + name[1:]
 
+# create the entity files of all the tables, taking the same arguments as the create_files of the room generator
+# so that both may be run on the same tables
+def create_files(package_name, database_class_name, database_name, tables, creation_note=None, jobs=1,
+                 executor=None, timings=None, options=None):
+    creation_note = creation_note or get_creation_note()
+    for table in tables:
+        start_time = time.perf_counter()
+        # get the fields for the entity
+        class_field_declarations = get_field_declarations(table.columns)
+        entity_file = create_entity(table.class_name, class_field_declarations, creation_note)
+        if timings is not None:
+            seconds = time.perf_counter() - start_time
+            timings.add("create entity files", seconds)
+            timings.add_table(table.name, seconds)
+        yield entity_file
+
 # write the entity class
-def create_entity(class_name, class_field_declarations):
+def create_entity(class_name, class_field_declarations, creation_note=None):
     class_name = clean(class_name)
-    date = datetime.datetime.now()
+    if creation_note is None:
+        creation_note = get_creation_note()
     
-    entity_class_content = f'''
-import 'package:built_value/built_value.dart';
-import 'package:built_value/serializer.dart';
-
-part '{camel_to_snake(class_name)}.g.dart';
-
-//
-// Created on {date}.
-//
-abstract class {class_name} implements Built<{class_name}, {class_name}Builder> {{
-    {class_field_declarations}
-
-    {class_name}._();
-    static Serializer<{class_name}> get serializer => _${lowerFirstLetter(class_name)}Serializer;
-    factory {class_name}([updates({class_name}Builder b)]) = _${class_name};
-}}
-    '''
-    # write file
+    entity_class_content = template_engine.render(template_engine.DART_ENTITY, file_name=camel_to_snake(class_name),
+                                                  class_name=class_name, creation_note=creation_note,
+                                                  class_field_declarations=class_field_declarations,
+                                                  serializer_name=lowerFirstLetter(class_name))
+    # return the file to write
     filename = "data/{}.dart".format(camel_to_snake(class_name))
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc: # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
-
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(entity_class_content)
+    return filename, entity_class_content
 
 if __name__ == '__main__':
     in_arg = get_input_args()
@@ -163,16 +119,29 @@ if __name__ == '__main__':
         print("\n\nNo sqlite database or schema provided\n\n")
         exit()
 
-    # get arguments
-    my_sql_schema = read_sql_file(in_arg.dir)
-    
-    #print(my_sql_schema)
-    for key, value in my_sql_schema.items():
-        # print(key.replace("_", " ").title().replace(" ", ""))
-        # get class name
-        class_name  = key.replace("_", " ").title().replace(" ", "")
+    # keep standard output for the archive when it is streamed there
+    log = sys.stderr if in_arg.archive == output_writer.STDOUT else sys.stdout
+    timings = instrumentation.Timings()
+    # profile the generation of the files, if asked to
+    profiler = cProfile.Profile() if in_arg.profile else None
+    if profiler is not None:
+        profiler.enable()
 
-        # get the fields for the entity
-        class_field_declarations = get_field_declarations(value)
-        
-        create_entity(class_name, class_field_declarations)
+    # get arguments
+    template_engine.use_template_dir(in_arg.templates)
+    print(in_arg.dir, file=log)
+    tables = schema_reader.read_tables(in_arg.dir, in_arg.mmap, not in_arg.no_cache, in_arg.cache_dir,
+                                       in_arg.cache_size * 1024 * 1024, timings)
+    writer = output_writer.open_writer(archive=in_arg.archive)
+
+    for filename, content in create_files(None, None, None, tables, get_creation_note(in_arg.deterministic),
+                                          timings=timings):
+        with timings.stage("write files"):
+            writer.write(filename, content)
+    writer.close()
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(in_arg.profile)
+    print(writer.summary(), file=log)
+    if in_arg.timings is not None:
+        timings.report(in_arg.timings, writer, log)
@@ -1,12 +1,46 @@
-import re
 import os
-import errno
-import datetime
+import sys
 import argparse
+import cProfile
+import json
+import time
+import concurrent.futures
+
+import create_dart_entity_from_schema
+import database_asset
+
+import instrumentation
+import output_writer
+import schema_cache
+import schema_model
+import schema_reader
+import template_engine
+import sql_tokenizer
+import sqlite_introspection
+from template_engine import clean, get_creation_note
 
 
 # A program for converting an sql(ite) file into a model class for use with RoomDB for android
 
+_PAGING_IMPORT = "import androidx.paging.PagingSource;\n"
+_DAO_LIVE_DATA_IMPORT = "import androidx.lifecycle.LiveData;\n"
+_REPOSITORY_LIVE_DATA_IMPORT = "import androidx.lifecycle.LiveData;\nimport androidx.lifecycle.Transformations;\n"
+_TYPE_CONVERTERS_IMPORT = "import androidx.room.TypeConverters;\n"
+_TYPE_CONVERTERS = "@TypeConverters(Converters.class)\n"
+# the indentation of the calls on the database builder of a release build
+_BUILDER_INDENT = "\n" + " " * 32
+
+# the targets the files may be generated for, which all emit their files from the same parsed tables
+ROOM = "room"
+DART = "dart"
+
+# the ways the generated repositories may run their queries in the background
+ASYNCTASK = "asynctask"
+EXECUTOR = "executor"
+
+# the journal modes of a release build of the database, room picks write ahead logging when it can by default
+JOURNAL_MODES = ("automatic", "truncate", "write_ahead_logging")
+
 def get_input_args():
     """
     Retrieves and parses the 4 command line arguments provided by the user when
@@ -20,661 +54,1057 @@ def get_input_args():
     # Create Parse using ArgumentParser
     parser = argparse.ArgumentParser()
     # Create 4 command line arguments
-    parser.add_argument("-d", "--dir", type=str, help="The directory of the sql schema")
+    parser.add_argument("-d", "--dir", type=str, help="The directory of the sql schema, or of a sqlite database")
     parser.add_argument("-p", "--package", type=str, default="com.example.app",
                         help="The package name of for the Java files")
     parser.add_argument("-f", "--dbfile", type=str, default="database.db", help="The database file name")
     parser.add_argument("-c", "--dbclass", type=str, default="AppDatabase",
                         help="The database class name, without the java extension")
+    parser.add_argument("-m", "--mmap", action="store_true",
+                        help="Memory map the schema and skip over everything but the CREATE statements without "
+                             "reading it, for large database dumps")
+    parser.add_argument("-o", "--output", type=str, default=".",
+                        help="The directory to write the data directory of the generated files into")
+    parser.add_argument("-a", "--archive", type=str,
+                        help="Write all the files into a single zip or srcjar archive, or a tar archive if it ends in "
+                             "{}, instead of separate files. {} streams a tar archive to standard output".format(
+                                 ", ".join(output_writer.TAR_SUFFIXES), output_writer.STDOUT))
+    parser.add_argument("-b", "--batch", type=str,
+                        help="A json manifest of the schemas of several modules to generate in one run, instead of -d")
+    parser.add_argument("-w", "--watch", action="store_true",
+                        help="Keep running, and regenerate the files of the tables that change whenever the schema "
+                             "does")
+    parser.add_argument("--watch-interval", type=float, default=0.2,
+                        help="The number of seconds between checks of the schema for changes in watch mode")
+    parser.add_argument("--target", type=parse_targets, default=[ROOM],
+                        help="A comma separated list of the targets to generate the files for, out of {}, from a "
+                             "single parse of the schema. Watch mode only generates the room files".format(
+                                 ", ".join([ROOM, DART])))
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="The number of processes to create the table files with, 0 or less for one per cpu")
+    parser.add_argument("-t", "--templates", type=str,
+                        help="A directory of templates to use instead of the default ones, named as in the "
+                             "templates directory")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Leave the creation time out of the generated files, so that they only change with "
+                             "the schema")
+    parser.add_argument("--paging", action="store_true",
+                        help="Also generate Paging 3 PagingSource queries, which need the androidx.room:room-paging "
+                             "library")
+    parser.add_argument("--repositories", choices=[ASYNCTASK, EXECUTOR], default=ASYNCTASK,
+                        help="Run the queries of the repositories with AsyncTasks, or on a bounded pool of reader "
+                             "threads and a single writer thread shared by every repository")
+    parser.add_argument("--live-data", action="store_true",
+                        help="Also generate LiveData queries, which room runs again whenever their tables change, "
+                             "and equals methods for the entities, so that the repositories only pass a result on "
+                             "when it changed. They need the androidx.lifecycle:lifecycle-livedata library")
+    parser.add_argument("--date-converters", action="store_true",
+                        help="Make the DATE, DATETIME and TIMESTAMP columns java.util.Date fields, stored as "
+                             "milliseconds since the epoch by the type converters of a generated Converters class")
+    parser.add_argument("--projections", type=str,
+                        help="A file of the projections to generate for list queries, a line of the form "
+                             "'table [ClassName]: column, column, ...' each")
+    parser.add_argument("--asset", type=str,
+                        help="Also execute the schema, with the rows it inserts, in a new sqlite database, vacuum it "
+                             "and write it to this file, such as app/src/main/assets/database.db. The database is "
+                             "then created from the asset on the first launch of the app")
+    parser.add_argument("--db-version", type=int, default=1,
+                        help="The version of the database class, and of the asset. It has to be raised, along with a "
+                             "migration, whenever the tables of an installed database change")
+    parser.add_argument("--journal-mode", choices=JOURNAL_MODES, default=JOURNAL_MODES[0],
+                        help="The journal mode of the database in release builds, debug builds always truncate the "
+                             "journal so that the database file can be inspected")
+    parser.add_argument("--builder-option", action="append", default=[], dest="builder_options",
+                        help="A call to add to the database builder, such as fallbackToDestructiveMigration(). "
+                             "May be given more than once")
+    parser.add_argument("--timings", nargs="?", const=instrumentation.TEXT,
+                        choices=[instrumentation.TEXT, instrumentation.JSON],
+                        help="Report the time taken by each stage and table, the bytes read and written, the files "
+                             "written and skipped and the peak memory, as text or as json lines")
+    parser.add_argument("--profile", type=str,
+                        help="Write a cProfile dump of the generation of the files to this file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse the schema even if it has not changed since it was last cached")
+    parser.add_argument("--cache-dir", type=str, default=schema_cache.default_cache_dir(),
+                        help="The directory of the parsed schema cache")
+    parser.add_argument("--cache-size", type=int, default=schema_cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+                        help="The size limit of the parsed schema cache in megabytes, "
+                             "the least recently used schemas are evicted beyond it")
 
     return parser.parse_args()
 
 
-def read_sql_file(sql_file):
-    tables_dict = dict()
-    print(sql_file)
-    with open(sql_file, 'r') as file:
-        # read the file as a single line
-        data = file.read().replace('\n', '')
-        data = data.replace('"', '`')
-        # split the line into segments
-        sql_data_segments = list(data.split(";"))
-        for segment in sql_data_segments:
-            # if not a create table statement, ignore it
-            if "create table" not in segment.lower():
+def get_room_options(in_arg):
+    # get the options of the generated code from the command line arguments
+    return RoomOptions(paging=in_arg.paging, repositories=in_arg.repositories,
+                       date_converters=in_arg.date_converters, live_data=in_arg.live_data,
+                       asset=database_asset.get_asset_name(in_arg.asset) if in_arg.asset else None,
+                       journal_mode=in_arg.journal_mode, builder_options=in_arg.builder_options,
+                       projections=read_projections(in_arg.projections) if in_arg.projections else (),
+                       version=in_arg.db_version)
+
+
+def read_projections(projections_file):
+    """
+    Reads the projections of the tables, the few columns a list screen needs, from a file of lines of the form
+     table [ClassName]: column, column, ...
+    where the class name is the class name of the table followed by Summary if it is left out. Blank lines and
+    everything after a # are ignored.
+    Parameters:
+     projections_file - the path of the file
+    Returns:
+     a tuple of (table name, class name, column names, location) tuples, where the location is the file and line the
+     projection is on, for the errors of a projection that does not fit the schema
+    """
+    projections = list()
+    class_names = set()
+    with open(projections_file, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
                 continue
-            else:
-                # get the table name from the segment, 
-                # the table name is the last word before the opening parentheses
-                # print(segment)
-                entity = clean(segment.split("(")[0].strip().split(" ")[-1])
-                # print the entity name
-                # print(entity)
-                # get the text within the parentheses
-                columns_data = re.search(r'\(.*\)', segment)
-                # print(columns_data.group(0)[1:-1].strip())
-                # split the text within the parentheses
-                dirty_columns_data = columns_data.group(0)[1:-1].strip().split(",")
-                # add a primary key field if not was defined for any column
-                if "primary key" not in ", ".join(dirty_columns_data).lower():
-                    dirty_columns_data.append("\t`auto_incremented_id_field`\tINTEGER PRIMARY KEY AUTOINCREMENT")
-                # remove unneccesary white space from the egdes of each word
-                clean_columns_data = [x.strip().replace("\t", " ") for x in dirty_columns_data]
-                # print(clean_columns_data)
-                # get column names and other data
-                column_names = [clean(x.split(" ")[0].strip()) for x in clean_columns_data]
-                # print(column_names)
-                # get the data types for each column
-                column_data_types = [clean(x.split(" ")[1].strip()) for x in clean_columns_data]
-                # print(column_data_types)
-                # get other column data for each column
-                other_column_data = list()
-                for column in clean_columns_data:
-                    if "primary key" in column.lower():
-                        other_column_data.append("primary key")
-                    elif "not null" in column.lower():
-                        other_column_data.append("not null")
-                    else:
-                        other_column_data.append("")
-                # print(other_column_data)
-                # set the columns data for the entity in the dictionary
-                tables_dict[entity] = list(zip(column_names, column_data_types, other_column_data))
-                # print(list(tables_dict[entity]))
-    # print(tables_dict)
-    # return our tables data as a dictionary
-    return tables_dict
-
-
-def clean(txt):
-    return txt.strip("`").strip("'").strip('"')
-
-
-def get_field_declarations(values):
-    field_declarations = ""
-    completed_fields = list()
-    for field_name, data_type, field_qualifier in values:
-        # eliminate the foreign keys and primary key additional data
-        if field_name in completed_fields or field_name.lower() in ["foreign", "primary"]:
-            continue
-        else:
-            completed_fields.append(field_name)
-        field_declarations += "\n"
+            target, separator, columns = line.partition(":")
+            names = target.split()
+            column_names = tuple(clean(column.strip()) for column in columns.split(",") if column.strip())
+            if not separator or len(names) not in (1, 2) or not column_names:
+                raise ValueError("{}:{}: expected 'table [ClassName]: column, column, ...'".format(projections_file,
+                                                                                                  line_number))
+            table_name = clean(names[0])
+            class_name = names[1] if len(names) == 2 else schema_model.pascal_case(table_name) + "Summary"
+            if class_name in class_names:
+                raise ValueError("{}:{}: there is already a projection named {}".format(projections_file, line_number,
+                                                                                         class_name))
+            class_names.add(class_name)
+            projections.append((table_name, class_name, column_names, "{}:{}".format(projections_file, line_number)))
+    return tuple(projections)
+
+
+def parse_targets(text):
+    targets = [target.strip() for target in text.split(",") if target.strip()]
+    unknown = [target for target in targets if target not in (ROOM, DART)]
+    if not targets or unknown:
+        raise argparse.ArgumentTypeError("Unknown target {!r}, expected a comma separated list of {}".format(
+            ", ".join(unknown) or text, ", ".join([ROOM, DART])))
+    return targets
+
+
+class RoomOptions:
+    """
+    The options of the generated room code.
+    Attributes:
+     paging - whether or not to generate Paging 3 PagingSource queries, which need the room-paging library
+     repositories - how the repositories run their queries in the background, ASYNCTASK or EXECUTOR
+     date_converters - whether or not to make the date columns dates, with type converters
+     asset - the path of the prepackaged database in the assets of the app to create the database from, or None. The
+      entities map the tables by their names in the schema when it is given, as in get_entity_table_name
+     journal_mode - the journal mode of a release build, one of JOURNAL_MODES
+     builder_options - the calls to add to the database builder, such as fallbackToDestructiveMigration()
+     projections - the (table name, class name, column names) of the projections, or the (table name, class name,
+      column names, location) that read_projections returns
+     live_data - whether or not to generate LiveData queries, which need the lifecycle-livedata library
+     version - the version of the database class, which room checks the databases of installed apps against
+    """
+    __slots__ = ("paging", "repositories", "date_converters", "asset", "journal_mode", "builder_options",
+                 "projections", "live_data", "version")
+
+    def __init__(self, paging=False, repositories=ASYNCTASK, date_converters=False, asset=None,
+                 journal_mode=JOURNAL_MODES[0], builder_options=(), projections=(), live_data=False, version=1):
+        if repositories not in (ASYNCTASK, EXECUTOR):
+            raise ValueError("Unknown repositories {!r}, expected {} or {}".format(repositories, ASYNCTASK, EXECUTOR))
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError("Unknown journal mode {!r}, expected one of {}".format(journal_mode,
+                                                                                   ", ".join(JOURNAL_MODES)))
+        self.paging = paging
+        self.repositories = repositories
+        self.date_converters = date_converters
+        self.asset = asset
+        self.journal_mode = journal_mode
+        # a tuple, so that the options can be hashed
+        self.builder_options = tuple(option.strip().lstrip(".") for option in builder_options)
+        self.projections = tuple((table_name, class_name, tuple(column_names), location[0] if location else None)
+                                 for table_name, class_name, column_names, *location in projections)
+        self.live_data = live_data
+        self.version = version
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, RoomOptions) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+
+def get_field_declarations(columns):
+    field_declarations = list()
+    for column in columns:
         # create a field declaration for our class
-        # make a camel case variable name
-        camel_cased_name = field_name.replace("_", " ").title().replace(" ", "")
-        camel_cased_name = camel_cased_name[0].lower() + camel_cased_name[1:]
-
-        if "primary key" in field_qualifier:
+        field_declarations.append("\n")
+        if column.primary_key:
             # add the primary key constraint
-            field_declarations += "\n{}".format("@PrimaryKey(autoGenerate = true)")
-        elif "not null" in field_qualifier:
+            field_declarations.append("\n@PrimaryKey(autoGenerate = true)")
+            field_declarations.append("\nprivate {} {};".format(column.java_type, column.java_name))
+            continue
+        if column.not_null:
             # add the non null constraint
-            field_declarations += "\n{}".format("@NonNull")
-
+            field_declarations.append("\n@NonNull")
         # add the generic field data
-        if "primary key" in field_qualifier:
-            if "integer" in data_type.lower():
-                field_declarations += "\n{} {};".format("private int", camel_cased_name)
-            elif "real" in data_type.lower():
-                field_declarations += "\n{} {};".format("private double", camel_cased_name)
-            else:
-                field_declarations += "\n{} {};".format("private String", camel_cased_name)
-        else:
-            if "integer" in data_type.lower():
-                field_declarations += "\n@ColumnInfo(name = \"{}\")\n{} {};".format(field_name, "private int",
-                                                                                    camel_cased_name)
-            elif "real" in data_type.lower():
-                field_declarations += "\n@ColumnInfo(name = \"{}\")\n{} {};".format(field_name, "private double",
-                                                                                    camel_cased_name)
-            else:
-                field_declarations += "\n@ColumnInfo(name = \"{}\")\n{} {};".format(field_name, "private String",
-                                                                                    camel_cased_name)
+        field_declarations.append("\n@ColumnInfo(name = \"{}\")\nprivate {} {};".format(column.name, column.java_type,
+                                                                                     column.java_name))
 
-    # print(field_declarations)
-    return field_declarations
+    return "".join(field_declarations)
 
 
-def get_constructor(class_name, values):
+def get_constructor(class_name, columns):
     class_name = clean(class_name)
-    # create the constructor name and opening parentheses
-    constructor_string = "public " + class_name + "("
+    # exclude the priamry key
+    fields = [column for column in columns if not column.primary_key]
     # append the constructor parameters
-    completed_fields = list()
-    for field_name, data_type, field_qualifier in values:
-        if field_name in completed_fields or field_name.lower() in ["foreign",
-                                                                    "primary"]:  # eliminate the foreign keys and primary key additional data
-            continue
-        else:
-            completed_fields.append(field_name)
-        # make a camel case variable name
-        camel_cased_name = field_name.replace("_", " ").title().replace(" ", "")
-        camel_cased_name = camel_cased_name[0].lower() + camel_cased_name[1:]
-        # exclude the priamry key
-        if "primary key" not in field_qualifier:
-            if "not null" in field_qualifier:
-                constructor_string += "@NonNull "
-
-            # append the field name to the constructor
-            if "integer" in data_type.lower():
-                constructor_string += "int " + camel_cased_name + ", "
-            elif "real" in data_type.lower():
-                constructor_string += "double " + camel_cased_name + ", "
-            else:
-                constructor_string += "String " + camel_cased_name + ", "
-
-    # remove trailing comma and space and append closing parentheses
-    constructor_string = constructor_string.strip(", ") + ") {"
+    parameters = ["{}{} {}".format("@NonNull " if column.not_null else "", column.java_type, column.java_name)
+                  for column in fields]
     # append the field initialiastions
-    completed_fields = list()
-    for field_name, data_type, field_qualifier in values:
-        # eliminate the foreign keys and primary key additional data
-        if field_name in completed_fields or field_name.lower() in ["foreign", "primary"]:
-            continue
-        else:
-            completed_fields.append(field_name)
-        # make a camel case variable name
-        camel_cased_name = field_name.replace("_", " ").title().replace(" ", "")
-        camel_cased_name = camel_cased_name[0].lower() + camel_cased_name[1:]
-        # exclude the priamry key
-        if "primary key" not in field_qualifier:
-            constructor_string += "\nthis.{} = {};".format(camel_cased_name, camel_cased_name)
-
-    # add closing braces
-    constructor_string += "}\n"
+    initialisations = ["\nthis.{} = {};".format(column.java_name, column.java_name) for column in fields]
 
     # return the constructor string
-    # print(constructor_string)
-    return constructor_string
+    return "public {}({}) {{{}}}\n".format(class_name, ", ".join(parameters), "".join(initialisations))
 
 
-def get_n_set(values):
+def get_n_set(columns):
     # append the getters and setters
-    getters_n_setters = ""
-    completed_fields = list()
-    for field_name, data_type, field_qualifier in values:
-        # eliminate the foreign keys and primary key additional data
-        if field_name in completed_fields or field_name.lower() in ["foreign", "primary"]:
+    getters_n_setters = list()
+    for column in columns:
+        getter_setter_name = column.accessor_name
+        camel_cased_name = column.java_name
+        d_type = column.java_type
+        # primitive types can not be null, so only the non null objects are annotated
+        non_null = column.not_null and d_type not in schema_model.BOXED_TYPES
+        parameter_annotation = "@NonNull " if non_null else ""
+        getter_annotation = "@NonNull\n" if non_null else ""
+
+        getters_n_setters.append("\n")
+        getters_n_setters.append(f"public void set{getter_setter_name}({parameter_annotation}{d_type} {camel_cased_name}) {{ \nthis.{camel_cased_name} = {camel_cased_name};\n}}\n\n")
+        getters_n_setters.append(f"{getter_annotation}public {d_type} get{getter_setter_name}() {{ \nreturn this.{camel_cased_name};\n}}\n")
+
+    # return our getters and setters
+    return "".join(getters_n_setters)
+
+
+def get_entity_indices(indexes):
+    # get the indices of the entity annotation, the indexes are created by room along with the table
+    if not indexes:
+        return ""
+    entries = list()
+    for index in indexes:
+        columns = ", ".join('"{}"'.format(column_name) for column_name in index.column_names)
+        entry = "@Index(name = \"{}\", value = {{{}}}".format(index.name, columns)
+        if index.where:
+            # room can not create partial indexes, so the index covers every row, and can not be unique
+            entry = "// WHERE {} is left out, room can not create partial indexes\n                {}".format(
+                index.where, entry)
+        elif index.unique:
+            entry += ", unique = true"
+        entries.append(entry + ")")
+    return ",\n        indices = {{\n                {}\n        }}".format(",\n                ".join(entries))
+
+
+def get_key_columns(table):
+    # get the columns a row can be found by, a single column primary key and the columns of single column unique
+    # indexes
+    columns = {column.name: column for column in table.columns}
+    key_columns = [column for column in table.columns if column.primary_key]
+    if len(key_columns) > 1:
+        # a column of a composite primary key does not find a single row by itself
+        key_columns = list()
+    for index in table.indexes:
+        if index.unique and not index.where and len(index.column_names) == 1:
+            column = columns[index.column_names[0]]
+            if column not in key_columns:
+                key_columns.append(column)
+    return key_columns
+
+
+def get_order_column(table):
+    # get the name of the column the pages of a table are in the order of, the rowid if there is no single primary key
+    primary_keys = [column.name for column in table.columns if column.primary_key]
+    return primary_keys[0] if len(primary_keys) == 1 else "rowid"
+
+
+def get_column_values(column):
+    # get the values of the placeholders of a column in the templates of the methods
+    return {"column_name": column.name, "java_name": column.java_name, "accessor_name": column.accessor_name,
+            "java_type": column.java_type, "boxed_type": schema_model.get_boxed_type(column.java_type)}
+
+
+def get_dao_key_queries(class_name, table_name, table):
+    # get the queries of the rows by their keys, which sqlite answers from the index of the key instead of a scan
+    values = {"class_name": class_name, "table_name": table_name}
+    return template_engine.render_methods([(template_engine.DAO_KEY_QUERIES, dict(values, **get_column_values(column)))
+                                           for column in get_key_columns(table)])
+
+
+def get_dao_page_queries(class_name, table_name, table, options=None):
+    options = options or RoomOptions()
+    values = {"class_name": class_name, "table_name": table_name, "order_column": get_order_column(table)}
+    queries = [(template_engine.DAO_PAGE_QUERY, values)]
+    # a keyset page starts after the last row of the previous page, without reading the rows before it, which needs
+    # a key that is never null
+    for column in get_key_columns(table):
+        if column.primary_key or column.not_null:
+            queries.append((template_engine.DAO_PAGE_AFTER_QUERY, dict(values, **get_column_values(column))))
+    if options.paging:
+        queries.append((template_engine.DAO_PAGING_SOURCE_QUERY, values))
+    return template_engine.render_methods(queries)
+
+
+def get_repository_key_methods(class_name, table):
+    values = {"class_name": class_name, "mod_class_name": class_name[0].lower() + class_name[1:]}
+    return template_engine.render_methods([(template_engine.REPOSITORY_KEY_METHODS,
+                                            dict(values, **get_column_values(column)))
+                                           for column in get_key_columns(table)])
+
+
+def get_repository_page_methods(class_name, table, options=None):
+    options = options or RoomOptions()
+    values = {"class_name": class_name, "mod_class_name": class_name[0].lower() + class_name[1:]}
+    methods = [(template_engine.REPOSITORY_PAGE_METHOD, values)]
+    for column in get_key_columns(table):
+        if column.primary_key or column.not_null:
+            methods.append((template_engine.REPOSITORY_PAGE_AFTER_METHOD, dict(values, **get_column_values(column))))
+    if options.paging:
+        methods.append((template_engine.REPOSITORY_PAGING_SOURCE_METHOD, values))
+    return template_engine.render_methods(methods)
+
+
+def get_projections(table, options):
+    # get the (class name, columns) of the projections of a table
+    columns = {column.name: column for column in table.columns}
+    projections = list()
+    for table_name, class_name, column_names, _ in options.projections:
+        if table_name != table.name:
             continue
+        unknown = [column_name for column_name in column_names if column_name not in columns]
+        if unknown:
+            raise ValueError("The projection {} has columns that are not in {}: {}".format(
+                class_name, table.name, ", ".join(unknown)))
+        projections.append((class_name, [columns[column_name] for column_name in column_names]))
+    return projections
+
+
+def get_projection_fields(columns):
+    # the fields of a projection are the fields of the entity without its primary key annotations
+    field_declarations = list()
+    for column in columns:
+        field_declarations.append("\n")
+        if column.not_null and column.java_type not in schema_model.BOXED_TYPES:
+            field_declarations.append("\n@NonNull")
+        field_declarations.append("\n@ColumnInfo(name = \"{}\")\nprivate {} {};".format(column.name, column.java_type,
+                                                                                     column.java_name))
+    return "".join(field_declarations)
+
+
+def get_projection_imports(package_name, projections):
+    return "".join("import {}.data.entity.{};\n".format(package_name, class_name) for class_name, _ in projections)
+
+
+def get_projection_values(class_name, columns):
+    # get the values of the placeholders of a projection in the templates of the methods
+    return {"projection_class_name": class_name, "column_names": ", ".join(column.name for column in columns),
+            "column_list": ", ".join("`{}`".format(column.name) for column in columns)}
+
+
+def get_dao_projection_queries(table_name, table, projections):
+    values = {"table_name": table_name, "order_column": get_order_column(table)}
+    return template_engine.render_methods([(template_engine.DAO_PROJECTION_QUERIES,
+                                            dict(values, **get_projection_values(class_name, columns)))
+                                           for class_name, columns in projections])
+
+
+def get_repository_projection_methods(entity_name, projections):
+    values = {"class_name": entity_name, "mod_class_name": entity_name[0].lower() + entity_name[1:]}
+    return template_engine.render_methods([(template_engine.REPOSITORY_PROJECTION_METHODS,
+                                            dict(values, **get_projection_values(class_name, columns)))
+                                           for class_name, columns in projections])
+
+
+def get_equals(class_name, columns):
+    # get the equals and hashCode methods of an entity or projection, which compare the values of all of its fields,
+    # so that a LiveData result that is the same as the last one can be told apart from a change
+    comparisons = list()
+    hashes = list()
+    for column in columns:
+        name = column.java_name
+        if column.java_type in ("int", "long", "boolean"):
+            comparisons.append(f"{name} == other.{name}")
+            hashes.append(name)
+        elif column.java_type == "double":
+            comparisons.append(f"Double.compare({name}, other.{name}) == 0")
+            hashes.append(name)
+        elif column.java_type == "byte[]":
+            comparisons.append(f"Arrays.equals({name}, other.{name})")
+            hashes.append(f"Arrays.hashCode({name})")
         else:
-            completed_fields.append(field_name)
-        getters_n_setters += "\n"
-        # make a camel case variable name
-        camel_cased_name = clean(field_name.replace("_", " ").title().replace(" ", ""))
-        getter_setter_name = camel_cased_name
-        camel_cased_name = camel_cased_name[0].lower() + camel_cased_name[1:]
-
-        # get the data type
-        d_type = "String"
-        if "integer" in data_type.lower():
-            d_type = "int"
-        elif "real" in data_type.lower():
-            d_type = "double"
-
-        if "not null" in field_qualifier:
-            getters_n_setters += f"public void set{getter_setter_name}(@NonNull {d_type} {camel_cased_name}) {{ \nthis.{camel_cased_name} = {camel_cased_name};\n}}\n\n"
-            getters_n_setters += f"@NonNull\npublic {d_type} get{getter_setter_name}() {{ \nreturn this.{camel_cased_name};\n}}\n"
-        else:
-            getters_n_setters += f"public void set{getter_setter_name}({d_type} {camel_cased_name}) {{ \nthis.{camel_cased_name} = {camel_cased_name};\n}}\n\n"
-            getters_n_setters += f"public {d_type} get{getter_setter_name}() {{ \nreturn this.{camel_cased_name};\n}}\n"
+            comparisons.append(f"Objects.equals({name}, other.{name})")
+            hashes.append(name)
+    return "\n" + template_engine.render(template_engine.EQUALS, class_name=class_name,
+                                         comparison=" &&\n".join(comparisons) or "true", hashes=", ".join(hashes))
+
+
+def get_equals_imports(columns):
+    # the arrays are only needed to compare blobs
+    if any(column.java_type == "byte[]" for column in columns):
+        return "\nimport java.util.Arrays;\nimport java.util.Objects;\n"
+    return "\nimport java.util.Objects;\n"
+
+
+def get_dao_observable_queries(class_name, table_name, table, projections):
+    # get the LiveData queries, which room runs again whenever its invalidation tracker sees their table change
+    values = {"class_name": class_name, "table_name": table_name}
+    queries = [(template_engine.DAO_OBSERVE_ALL_QUERY, values)]
+    for column in get_key_columns(table):
+        queries.append((template_engine.DAO_OBSERVE_KEY_QUERY, dict(values, **get_column_values(column))))
+    for projection_class_name, columns in projections:
+        queries.append((template_engine.DAO_OBSERVE_PROJECTION_QUERY,
+                        dict(values, **get_projection_values(projection_class_name, columns))))
+    return template_engine.render_methods(queries)
+
+
+def get_repository_observable_methods(class_name, table, projections):
+    values = {"class_name": class_name, "mod_class_name": class_name[0].lower() + class_name[1:]}
+    methods = [(template_engine.REPOSITORY_OBSERVE_ALL_METHOD, values)]
+    for column in get_key_columns(table):
+        methods.append((template_engine.REPOSITORY_OBSERVE_KEY_METHOD, dict(values, **get_column_values(column))))
+    for projection_class_name, columns in projections:
+        methods.append((template_engine.REPOSITORY_OBSERVE_PROJECTION_METHOD,
+                        dict(values, **get_projection_values(projection_class_name, columns))))
+    return template_engine.render_methods(methods)
+
+
+# create the entity, dao and repository files of a table. This is independent of every other table,
+# so the tables may be spread over a pool of processes
+def create_table_files(package_name, database_class_name, table, creation_note=None, options=None):
+    options = options or RoomOptions()
+    if options.date_converters:
+        table = schema_model.with_date_type(table)
+    # get class name
+    class_name = table.class_name
+
+    # get the fields for the entity
+    class_field_declarations = get_field_declarations(table.columns)
+
+    # get the constructor for the entity
+    class_constructor = get_constructor(class_name, table.columns)
+
+    # get the getters and setters for the entity
+    class_getters_n_setters = get_n_set(table.columns)
+    if options.live_data:
+        class_getters_n_setters += get_equals(class_name, table.columns)
+
+    table_name = get_entity_table_name(table, options)
+    projections = get_projections(table, options)
+    projection_imports = get_projection_imports(package_name, projections)
+    observable_queries = ""
+    observable_methods = ""
+    if options.live_data:
+        observable_queries = get_dao_observable_queries(class_name, table_name, table, projections)
+        observable_methods = get_repository_observable_methods(class_name, table, projections)
+
+    files = [
+        create_entity(package_name, class_name, table_name, class_field_declarations, class_constructor,
+                      class_getters_n_setters, creation_note, get_entity_indices(table.indexes),
+                      get_equals_imports(table.columns) if options.live_data else ""),
+        create_dao(package_name, class_name, table_name, creation_note,
+                   get_dao_page_queries(class_name, table_name, table, options), options,
+                   get_dao_key_queries(class_name, table_name, table),
+                   get_dao_projection_queries(table_name, table, projections), projection_imports, observable_queries),
+        create_repository(package_name, database_class_name, class_name, creation_note,
+                          get_repository_page_methods(class_name, table, options), options,
+                          get_repository_key_methods(class_name, table),
+                          get_repository_projection_methods(class_name, projections), projection_imports,
+                          observable_methods),
+    ]
+    for projection_class_name, columns in projections:
+        projection_getters_n_setters = get_n_set(columns)
+        if options.live_data:
+            projection_getters_n_setters += get_equals(projection_class_name, columns)
+        files.append(create_projection(package_name, projection_class_name, table_name, get_projection_fields(columns),
+                                       projection_getters_n_setters, creation_note,
+                                       get_equals_imports(columns) if options.live_data else ""))
+
+    return (files,) + get_database_entries(class_name)
+
+
+def get_entity_table_name(table, options):
+    # a database created from a prepackaged asset is checked against the entities, so they map the tables as they are
+    # named in the schema. otherwise the name is the plural the tables of the databases of installed apps were created
+    # with, which can not change without a migration
+    if options.asset is not None:
+        return table.name
+    if table.name.lower()[-1] == "s":
+        return table.name + "es"
+    return table.name.lower() + "s"
+
+
+def get_database_entries(class_name):
+    # get the entry of the entity in the entities list, and the declaration of its dao
+    mod_class_name = class_name[0].lower() + class_name[1:]
+    return f"{class_name}.class", f"public abstract {class_name}Dao {mod_class_name}Dao();"
+
+
+def create_timed_table_files(package_name, database_class_name, table, creation_note=None, options=None):
+    # create the files of a table, along with the number of seconds it took
+    start_time = time.perf_counter()
+    result = create_table_files(package_name, database_class_name, table, creation_note, options)
+    return result + (time.perf_counter() - start_time,)
+
+
+def get_jobs(jobs):
+    # get the number of processes to create the table files with, 0 or less meaning one per cpu
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+# create the files of all the tables, in the order of the tables, using jobs processes, or the processes of an
+# executor shared with other schemas
+def create_tables_files(package_name, database_class_name, tables, jobs=1, creation_note=None, executor=None,
+                        options=None):
+    jobs = get_jobs(jobs)
+    package_names = [package_name] * len(tables)
+    database_class_names = [database_class_name] * len(tables)
+    creation_notes = [creation_note or get_creation_note()] * len(tables)
+    options_list = [options] * len(tables)
+    if executor is None and (jobs == 1 or len(tables) < 2):
+        return list(map(create_timed_table_files, package_names, database_class_names, tables, creation_notes,
+                        options_list))
+    # hand the tables out in batches, to keep the cost of passing them between processes down
+    chunk_size = max(1, len(tables) // (jobs * 4))
+    if executor is not None:
+        return list(executor.map(create_timed_table_files, package_names, database_class_names, tables,
+                                 creation_notes, options_list, chunksize=chunk_size))
+    with create_executor(jobs) as executor:
+        return list(executor.map(create_timed_table_files, package_names, database_class_names, tables,
+                                 creation_notes, options_list, chunksize=chunk_size))
+
+
+def create_executor(jobs):
+    # the worker processes use the same templates as this one
+    return concurrent.futures.ProcessPoolExecutor(jobs, initializer=template_engine.use_template_dir,
+                                                  initargs=(template_engine.get_template_dir(),))
+
+
+def check_projections(table_names, options):
+    # a projection has to be of a table of the schema, and can not take the class name of an entity, whose file it
+    # would replace
+    unknown = [class_name for table_name, class_name, _, _ in options.projections if table_name not in table_names]
+    if unknown:
+        raise ValueError("The projections {} are of tables that are not in the schema".format(", ".join(unknown)))
+    entity_names = {schema_model.pascal_case(table_name): table_name for table_name in table_names}
+    for _, class_name, _, location in options.projections:
+        if class_name in entity_names:
+            message = "The projection {} has the class name of the entity of {}".format(class_name,
+                                                                                        entity_names[class_name])
+            raise ValueError("{}: {}".format(location, message) if location else message)
+
+
+# create all the files for a schema, in order, recording the time taken in timings if given
+def create_files(package_name, database_class_name, database_name, tables, creation_note=None, jobs=1,
+                 executor=None, timings=None, options=None):
+    version = (options or RoomOptions()).version
+    entities_list = list()
+    dao_declarations = list()
+    if options is not None:
+        check_projections([table.name for table in tables], options)
+
+    # the files of the tables are created in the order of the tables, however many jobs there are
+    start_time = time.perf_counter()
+    tables_files = create_tables_files(package_name, database_class_name, tables, jobs, creation_note, executor,
+                                       options)
+    if timings is not None:
+        timings.add("create table files", time.perf_counter() - start_time)
+    for table, (files, entity, dao_declaration, seconds) in zip(tables, tables_files):
+        if timings is not None:
+            timings.add_table(table.name, seconds)
+        yield from files
 
-    # return our getters and setters
-    # print(getters_n_setters)
-    return getters_n_setters.replace("@NonNull\npublic int", "public int").replace("@NonNull int", "int").replace(
-        "@NonNull\npublic double", "public double").replace("@NonNull double", "double")
+        # add the entity to the entities list
+        entities_list.append(entity)
+
+        # add the dao to the dao list
+        dao_declarations.append(dao_declaration)
+
+    start_time = time.perf_counter()
+    database_files = get_database_files(package_name, database_class_name, database_name, entities_list,
+                                        dao_declarations, version, creation_note, options)
+    if timings is not None:
+        timings.add("create database files", time.perf_counter() - start_time)
+    yield from database_files
+
+
+# create the files shared by all the tables, the database class and the classes every repository uses
+def get_database_files(package_name, database_class_name, database_name, entities_list, dao_declarations, version=1,
+                       creation_note=None, options=None):
+    options = options or RoomOptions()
+    database_files = [
+        create_db_class(package_name, ", ".join(entities_list), version, database_class_name, database_name,
+                        "\n\n".join(dao_declarations), creation_note, options),
+        create_base_repository(package_name, creation_note),
+        create_data_listener(package_name, creation_note),
+    ]
+    if options.repositories == EXECUTOR:
+        database_files.append(create_database_executors(package_name, creation_note))
+    if options.date_converters:
+        database_files.append(create_converters(package_name, creation_note))
+    return database_files
+
+
+def iter_generated_files(schema_file, package_name, database_class_name, database_name, targets=(ROOM,),
+                         use_mmap=False, use_cache=True, cache_dir=None, cache_size=schema_cache.DEFAULT_MAX_SIZE,
+                         creation_note=None, jobs=1, executor=None, timings=None, options=None):
+    """
+    Reads a schema once and creates the files of each target for it, without writing them.
+    Parameters:
+     schema_file - the sql schema or sqlite database to read, or a file object of sql text
+     package_name - the package name for the java files
+     database_class_name - the database class name
+     database_name - the database file name
+     targets - the targets to generate the files for, from TARGETS
+     use_mmap, use_cache, cache_dir, cache_size - how to read the schema, as in schema_reader.read_tables
+     creation_note - the note the files are stamped with, from get_creation_note
+     jobs - the number of processes to create the table files with
+     executor - a process pool executor shared with other schemas to use instead of starting one
+     timings - an instrumentation.Timings to record the time taken by each stage and table in
+     options - the RoomOptions of the generated code
+    Yields:
+     the (filename, content) of each file, the filename being relative to the output directory
+    """
+    timings = timings or instrumentation.Timings()
+    tables = schema_reader.read_tables(schema_file, use_mmap, use_cache, cache_dir, cache_size, timings)
+    yield from iter_target_files(package_name, database_class_name, database_name, tables, targets, creation_note,
+                                 jobs, executor, timings, options)
+
+
+def iter_target_files(package_name, database_class_name, database_name, tables, targets=(ROOM,), creation_note=None,
+                      jobs=1, executor=None, timings=None, options=None):
+    # create the files of each target for tables that have already been read, as in iter_generated_files
+    # the same tables are used by every target, and the creation note is the same on all of their files
+    creation_note = creation_note or get_creation_note()
+    for target in targets:
+        yield from TARGETS[target](package_name, database_class_name, database_name, tables, creation_note, jobs,
+                                   executor, timings, options)
+
+
+def generate(schema, package_name="com.example.app", database_class_name="AppDatabase", database_name="database.db",
+             targets=(ROOM,), output_dir=None, template_dir=None, deterministic=False, use_mmap=False, use_cache=False,
+             cache_dir=None, jobs=1, options=None):
+    """
+    Generates the files for a schema in memory, for calling the generator from other python code.
+    Nothing is written to disk unless output_dir or use_cache is given.
+    Parameters:
+     schema - the path of the sql schema or sqlite database, or a file object of sql text
+     package_name, database_class_name, database_name, targets - as in iter_generated_files
+     output_dir - a directory to also write the files into, only files whose content changed are written
+     template_dir - a directory of templates to use instead of the default ones
+     deterministic - whether or not to leave the creation time out of the generated files
+     use_mmap, use_cache, cache_dir - how to read the schema, as in schema_reader.read_tables
+     jobs - the number of processes to create the table files with, 0 or less for one per cpu
+     options - the RoomOptions of the generated code
+    Returns:
+     a dictionary of the filenames of the generated files, relative to the output directory, to their content
+    """
+    template_engine.use_template_dir(template_dir)
+    files = dict(iter_generated_files(schema, package_name, database_class_name, database_name, targets, use_mmap,
+                                      use_cache, cache_dir, creation_note=get_creation_note(deterministic),
+                                      jobs=jobs, options=options))
+    if output_dir is not None:
+        writer = output_writer.FileWriter(output_dir)
+        for filename, content in files.items():
+            writer.write(filename, content)
+        writer.close()
+    return files
+
+
+def generate_module(schema_file, package_name, database_class_name, database_name, output_dir=".", use_mmap=False,
+                    use_cache=True, cache_dir=None, cache_size=schema_cache.DEFAULT_MAX_SIZE, creation_note=None,
+                    jobs=1, executor=None, timings=None, targets=(ROOM,), writer=None, options=None):
+    """
+    Reads a schema once and writes the files generated for it for each target.
+    Parameters:
+     schema_file, package_name, database_class_name, database_name - as in iter_generated_files
+     output_dir - the directory to write the data directory of the files into
+     use_mmap, use_cache, cache_dir, cache_size, creation_note, jobs, executor, timings, targets, options - as in
+     iter_generated_files
+     writer - a writer from output_writer.open_writer to write the files with instead of a FileWriter into
+      output_dir, which is left open
+    Returns:
+     the writer the files were written with, with a count of the files written
+    """
+    timings = timings or instrumentation.Timings()
+    close = writer is None
+    writer = writer or output_writer.FileWriter(output_dir)
+    for filename, content in iter_generated_files(schema_file, package_name, database_class_name, database_name,
+                                                  targets, use_mmap, use_cache, cache_dir, cache_size, creation_note,
+                                                  jobs, executor, timings, options):
+        with timings.stage("write files"):
+            writer.write(filename, content)
+    if close:
+        writer.close()
+    return writer
+
+
+class SchemaWatcher:
+    """
+    Keeps the tables of a schema in memory, and regenerates the files of the tables that change whenever the schema
+    file does. Only the statements that changed are parsed again, only the tables whose columns or indexes changed are
+    rendered again, and the database class is only rendered again when tables are added or removed.
+    Parameters:
+     schema_file, package_name, database_class_name, database_name, output_dir, use_mmap - as in generate_module
+     deterministic - whether or not to leave the creation time out of the generated files
+     options - the RoomOptions of the generated code
+    """
+
+    def __init__(self, schema_file, package_name, database_class_name, database_name, output_dir=".", use_mmap=False,
+                 deterministic=False, options=None):
+        self.schema_file = schema_file
+        self.package_name = package_name
+        self.database_class_name = database_class_name
+        self.database_name = database_name
+        self.use_mmap = use_mmap
+        self.deterministic = deterministic
+        self.options = options
+        self.writer = output_writer.FileWriter(output_dir)
+        # the size and modification time of the schema file when it was last read
+        self._stat = None
+        # the tables parsed from each statement of the schema, so that unchanged statements are not parsed again
+        self._statements = dict()
+        # the hashes of the columns of each table, and the files created for it
+        self._table_hashes = dict()
+        self._table_files = dict()
+        # the tables listed in the database class
+        self._table_names = None
+
+    def poll(self):
+        # regenerate the files if the schema file changed since it was last read, returning whether or not it did
+        try:
+            stat = os.stat(self.schema_file)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self._stat:
+            return False
+        # the schema is only read again once it changes, a schema that fails to generate waits for the next change
+        self._stat = (stat.st_mtime_ns, stat.st_size)
+        try:
+            self.update()
+        except Exception as exc:
+            # keep the tables and files of the last schema that generated, and keep watching
+            print("{}: {}".format(self.schema_file, exc), file=sys.stderr)
+            return False
+        return True
+
+    def iter_statements(self):
+        if self.use_mmap:
+            yield from sql_tokenizer.iter_mapped_schema_statements(self.schema_file)
+        else:
+            with open(self.schema_file, 'r') as file:
+                yield from sql_tokenizer.iter_schema_statements(file)
+
+    def read_tables_dict(self):
+        if sqlite_introspection.is_sqlite_database(self.schema_file):
+            return sqlite_introspection.read_sqlite_database(self.schema_file)
+        statements = dict()
+        for statement in self.iter_statements():
+            if statement in self._statements:
+                statements[statement] = self._statements[statement]
+            else:
+                statements[statement] = schema_reader.parse_statement(statement)
+        # forget the statements that are no longer in the schema
+        self._statements = statements
+        return schema_reader.build_tables_dict(statements.values())
+
+    def update(self):
+        start_time = time.perf_counter()
+        written, unchanged = self.writer.written, self.writer.unchanged
+        creation_note = get_creation_note(self.deterministic)
+        tables_dict = self.read_tables_dict()
+        if self.options is not None:
+            check_projections(list(tables_dict), self.options)
+        table_hashes = {name: schema_cache.hash_table(columns) for name, columns in tables_dict.items()}
+
+        # create the files of the new and changed tables
+        changed_tables = [name for name in tables_dict if table_hashes[name] != self._table_hashes.get(name)]
+        for name in changed_tables:
+            files = create_table_files(self.package_name, self.database_class_name,
+                                       schema_model.build_table(name, tables_dict[name]), creation_note,
+                                       self.options)[0]
+            for filename, content in files:
+                self.writer.write(filename, content)
+            self._table_files[name] = [filename for filename, _ in files]
+
+        # remove the files of the tables that were dropped
+        removed_tables = [name for name in self._table_hashes if name not in table_hashes]
+        for name in removed_tables:
+            for filename in self._table_files.pop(name):
+                self.writer.remove(filename)
+
+        # the database class lists every table, so it only changes with the set of tables
+        if list(table_hashes) != self._table_names:
+            self._table_names = list(table_hashes)
+            self.write_database_files(self._table_names, creation_note)
+        self._table_hashes = table_hashes
+
+        print("{}: {} tables changed, {} removed, {} files written, {} unchanged in {:.1f}ms".format(
+            self.schema_file, len(changed_tables), len(removed_tables), self.writer.written - written,
+            self.writer.unchanged - unchanged, (time.perf_counter() - start_time) * 1000))
+
+    def write_database_files(self, table_names, creation_note):
+        entries = [get_database_entries(schema_model.pascal_case(name)) for name in table_names]
+        for filename, content in get_database_files(self.package_name, self.database_class_name, self.database_name,
+                                                    [entity for entity, _ in entries],
+                                                    [dao_declaration for _, dao_declaration in entries],
+                                                    (self.options or RoomOptions()).version, creation_note,
+                                                    self.options):
+            self.writer.write(filename, content)
+
+
+def watch(watchers, interval=0.2):
+    # poll the schemas of the watchers until interrupted, regenerating the files of the ones that change
+    print("Watching {} for changes, press Ctrl+C to stop".format(", ".join(w.schema_file for w in watchers)))
+    try:
+        while True:
+            for watcher in watchers:
+                watcher.poll()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def read_manifest(manifest_file, in_arg):
+    """
+    Reads the modules of a batch manifest.
+    The manifest is a json file of the form
+     {"modules": [{"name": ..., "schema": ..., "package": ..., "dbclass": ..., "dbfile": ..., "output": ...}]}
+    where the paths are relative to the manifest, and every key but schema may be left out to use the command line
+    arguments instead.
+    Parameters:
+     manifest_file - the path of the manifest
+     in_arg - the command line arguments
+    Returns:
+     a list of (name, schema file, package name, database class name, database name, output directory) tuples
+    """
+    with open(manifest_file, 'r') as file:
+        manifest = json.load(file)
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    modules = list()
+    for index, module in enumerate(manifest["modules"]):
+        modules.append((module.get("name", "module {}".format(index + 1)), os.path.join(base_dir, module["schema"]),
+                        module.get("package", in_arg.package), module.get("dbclass", in_arg.dbclass),
+                        module.get("dbfile", in_arg.dbfile), os.path.join(base_dir, module.get("output", "."))))
+    return modules
+
+
+def run_batch(manifest_file, in_arg, timings=None):
+    """
+    Generates the files for every module listed in a manifest, in one process with one shared pool of workers.
+    Parameters:
+     manifest_file - the path of the manifest, as read by read_manifest
+     in_arg - the command line arguments, for the options shared by all the modules
+     timings - an instrumentation.Timings to record the time taken by the stages of all the modules in
+    Returns:
+     a list of (module name, FileWriter, seconds taken) tuples
+    """
+    creation_note = get_creation_note(in_arg.deterministic)
+    jobs = get_jobs(in_arg.jobs)
+    executor = create_executor(jobs) if jobs > 1 else None
+    results = list()
+    try:
+        for name, schema_file, package_name, database_class_name, database_name, output_dir in read_manifest(
+                manifest_file, in_arg):
+            start_time = time.perf_counter()
+            writer = generate_module(schema_file, package_name, database_class_name, database_name, output_dir,
+                                     in_arg.mmap, not in_arg.no_cache, in_arg.cache_dir,
+                                     in_arg.cache_size * 1024 * 1024, creation_note, jobs, executor, timings,
+                                     in_arg.target, options=get_room_options(in_arg))
+            results.append((name, writer, time.perf_counter() - start_time))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def print_batch_summary(results):
+    name_width = max([len("module")] + [len(name) for name, _, _ in results])
+    print("{:<{}}  {:>8}  {:>9}  {:>8}".format("module", name_width, "written", "unchanged", "seconds"))
+    for name, writer, seconds in results:
+        print("{:<{}}  {:>8}  {:>9}  {:>8.3f}".format(name, name_width, writer.written, writer.unchanged, seconds))
+    print("{} modules in {:.3f} seconds".format(len(results), sum(seconds for _, _, seconds in results)))
 
 
 # write the dao class, this is rather straight forward
-def create_dao(package_name, class_name, table_name):
+def create_dao(package_name, class_name, table_name, creation_note=None, page_queries="", options=None,
+               key_queries="", projection_queries="", projection_imports="", observable_queries=""):
     class_name = clean(class_name)
+    options = options or RoomOptions()
     # print(package_name)
-    date = datetime.datetime.now()
-
-    dao_interface_content = f'''
-package {package_name}.data.dao;
-
-import androidx.room.Dao;
-import androidx.room.Insert;
-import androidx.room.OnConflictStrategy;
-import androidx.room.Query;
-
-import {package_name}.data.entity.{class_name};
-
-import java.util.List;
-
-/**
- * Created on {date}.
- */
-@Dao
-public interface {class_name}Dao {{
-    /**
-     * insert a singular item
-     */
-    @Insert(onConflict = OnConflictStrategy.REPLACE)
-    public void insert({class_name} item);
-
-    /**
-     * insert multiple items
-     */
-    @Insert(onConflict = OnConflictStrategy.REPLACE)
-    public void insertAll({class_name}... items);
-
-    /**
-     * delete all rows
-     */
-    @Query("DELETE FROM {table_name}")
-    public void deleteAll();
-
-    /**
-     * @return all rows
-     */
-    @Query("SELECT * FROM {table_name}")
-    List<{class_name}> getAll();
-}}
-    '''  # .format(date, package_name, class_name, table_name)
-    # write file
+    if creation_note is None:
+        creation_note = get_creation_note()
+
+    dao_interface_content = template_engine.render(template_engine.DAO, package_name=package_name,
+                                                   class_name=class_name, table_name=table_name,
+                                                   creation_note=creation_note, page_queries=page_queries,
+                                                   key_queries=key_queries, projection_queries=projection_queries,
+                                                   projection_imports=projection_imports,
+                                                   observable_queries=observable_queries,
+                                                   live_data_import=_DAO_LIVE_DATA_IMPORT if options.live_data else "",
+                                                   paging_import=_PAGING_IMPORT if options.paging else "")
+    # return the file to write
     filename = "data/dao/{}Dao.java".format(class_name)
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
-
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(dao_interface_content)
+    return filename, dao_interface_content
 
 
 # write the entity class
 def create_entity(package_name, class_name, table_name, class_field_declarations, class_constructor,
-                  class_getters_n_setters):
+                  class_getters_n_setters, creation_note=None, entity_indices="", equals_imports=""):
     class_name = clean(class_name)
-    date = datetime.datetime.now()
-
-    entity_class_content = f'''
-package {package_name}.data.entity;
-
-import androidx.room.ColumnInfo;
-import androidx.room.Entity;
-import androidx.room.Ignore;
-import androidx.annotation.NonNull;
-import androidx.room.PrimaryKey;
-
-import static {package_name}.data.entity.{class_name}.TABLE_NAME;
-
-/**
- * Created on {date}.
- */
-@Entity(tableName = TABLE_NAME)
-public class {class_name} {{
-    /**
-     * The table name
-     */
-    @Ignore
-    public static final String TABLE_NAME = "{table_name}";
-
-    {class_field_declarations}
-
-    {class_constructor}
-
-    {class_getters_n_setters}
-}}
-    '''
-    # write file
+    if creation_note is None:
+        creation_note = get_creation_note()
+
+    entity_class_content = template_engine.render(template_engine.ENTITY, package_name=package_name,
+                                                  class_name=class_name, table_name=table_name,
+                                                  creation_note=creation_note,
+                                                  class_field_declarations=class_field_declarations,
+                                                  class_constructor=class_constructor,
+                                                  class_getters_n_setters=class_getters_n_setters,
+                                                  entity_indices=entity_indices, equals_imports=equals_imports)
+    # return the file to write
     filename = "data/entity/{}.java".format(class_name)
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
-
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(entity_class_content)
+    return filename, entity_class_content
+
+
+# write a projection class, a few of the columns of an entity
+def create_projection(package_name, class_name, table_name, class_field_declarations, class_getters_n_setters,
+                      creation_note=None, equals_imports=""):
+    if creation_note is None:
+        creation_note = get_creation_note()
+
+    projection_class_content = template_engine.render(template_engine.PROJECTION, package_name=package_name,
+                                                      class_name=class_name, table_name=table_name,
+                                                      creation_note=creation_note,
+                                                      class_field_declarations=class_field_declarations,
+                                                      class_getters_n_setters=class_getters_n_setters,
+                                                      equals_imports=equals_imports)
+    # return the file to write
+    filename = "data/entity/{}.java".format(class_name)
+    return filename, projection_class_content
 
 
 # create the db class
-def create_db_class(package_name, entities_list, version, database_class_name, database_name, dao_declarations):
-    date = datetime.datetime.now()
-
-    db_class_content = f'''
-package {package_name}.data;
-
-import android.content.Context;
-
-import androidx.annotation.NonNull;
-import androidx.room.Database;
-import androidx.room.Room;
-import androidx.room.RoomDatabase;
-import androidx.sqlite.db.SupportSQLiteDatabase;
-
-import {package_name}.BuildConfig;
-import {package_name}.data.dao.*;
-import {package_name}.data.entity.*;
-
-/**
- * Created on {date}.
- */
-@Database(entities = {{{entities_list}}}, version = {version})
-public abstract class {database_class_name} extends RoomDatabase {{
-    /**
-     * The database file name
-     */
-    public static final String DATABASE_NAME = "{database_name}";
-
-    {dao_declarations}
-
-    // make the database a singleton
-    private static volatile {database_class_name} INSTANCE;
-
-    public static {database_class_name} getDatabase(final Context context) {{
-        if (INSTANCE == null) {{
-            synchronized ({database_class_name}.class) {{
-                if (INSTANCE == null) {{
-                    // Create database here
-                    // In debug build, do not use Write Ahead Logging, so that we can view the sqlite file directly
-                    if (!BuildConfig.DEBUG)
-                        INSTANCE = Room.databaseBuilder(context.getApplicationContext(),
-                                {database_class_name}.class, DATABASE_NAME)
-                                .addCallback(sRoomDatabaseCallback)
-                                .build();
-                    else INSTANCE = Room.databaseBuilder(context.getApplicationContext(),
-                            {database_class_name}.class, DATABASE_NAME)
-                            .addCallback(sRoomDatabaseCallback).setJournalMode(JournalMode.TRUNCATE).build();
-                }}
-            }}
-        }}
-        return INSTANCE;
-    }}
-
-    private static RoomDatabase.Callback sRoomDatabaseCallback =
-            new RoomDatabase.Callback() {{
-
-                @Override
-                public void onOpen(@NonNull SupportSQLiteDatabase db) {{
-                    super.onOpen(db);
-                }}
-            }};
-}}
-    '''
-    # write file
+def create_db_class(package_name, entities_list, version, database_class_name, database_name, dao_declarations,
+                    creation_note=None, options=None):
+    options = options or RoomOptions()
+    if creation_note is None:
+        creation_note = get_creation_note()
+    builder_calls = list()
+    if options.asset is not None:
+        builder_calls.append('createFromAsset("{}")'.format(options.asset))
+    builder_calls.extend(options.builder_options)
+    release_calls = list(builder_calls)
+    if options.journal_mode != JOURNAL_MODES[0]:
+        release_calls.append("setJournalMode(JournalMode.{})".format(options.journal_mode.upper()))
+
+    db_class_content = template_engine.render(template_engine.DATABASE, package_name=package_name,
+                                              entities_list=entities_list, version=version,
+                                              database_class_name=database_class_name, database_name=database_name,
+                                              dao_declarations=dao_declarations, creation_note=creation_note,
+                                              type_converters_import=_TYPE_CONVERTERS_IMPORT
+                                              if options.date_converters else "",
+                                              type_converters=_TYPE_CONVERTERS if options.date_converters else "",
+                                              release_builder_options="".join(_BUILDER_INDENT + "." + call
+                                                                              for call in release_calls),
+                                              debug_builder_options="".join("." + call for call in builder_calls))
+    # return the file to write
     filename = "data/{}.java".format(database_class_name)
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
-
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(db_class_content)
+    return filename, db_class_content
 
 
 # create the data repository classes for handling data access in the background
-def create_repository(package_name, database_class_name, entity_name):
+def create_repository(package_name, database_class_name, entity_name, creation_note=None, page_methods="",
+                      options=None, key_methods="", projection_methods="", projection_imports="",
+                      observable_methods=""):
     entity_name = clean(entity_name)
-    date = datetime.datetime.now()
+    options = options or RoomOptions()
+    if creation_note is None:
+        creation_note = get_creation_note()
 
     # create a prepender for Dao instances
     mod_class_name = entity_name[0].lower() + entity_name[1:]
 
-    repository_class_content = f'''
-package {package_name}.data.repository;
-
-import android.content.Context;
-import android.os.AsyncTask;
-
-import {package_name}.data.DataAccessListener;
-import {package_name}.data.{database_class_name};
-import {package_name}.data.dao.{entity_name}Dao;
-import {package_name}.data.entity.{entity_name};
-
-import java.util.ArrayList;
-import java.util.List;
-
-/**
- * Created on {date}.
- */
-public class {entity_name}Repository extends BaseRepository {{
-    private {database_class_name} db;
-    private static {entity_name}Repository thisInstance;
-    
-    /**
-     * A method to initialise the class and load the relevant data from the data streams provided
-     *
-     * @param context a {{@link Context}} instance to interact with the data
-     */
-    private {entity_name}Repository(Context context) {{
-        db = {database_class_name}.getDatabase(context);
-    }}
-
-    public static synchronized {entity_name}Repository getInstance(Context context) {{
-        if (thisInstance == null)
-            thisInstance = new {entity_name}Repository(context);
-        return thisInstance;
-    }}
-
-    /**
-     * Asynchronously insert a  entity into our local database
-     *
-     * @param entity the entity to insert
-     */
-    public void insert({entity_name} entity) {{
-        new Save{entity_name}sAsync(db).execute(entity);
-    }}
-
-    /**
-     * Asynchronously insert a list of entities into our local database
-     *
-     * @param entity the entity to insert
-     */
-    public void insert({entity_name}[] entity) {{
-        new Save{entity_name}sAsync(db).execute(entity);
-    }}
-
-    public void save{entity_name}s(List<{entity_name}> entities) {{
-        if (entities != null) {{
-            {entity_name}[] items = new {entity_name}[entities.size()];
-            items = entities.toArray(items);
-            new Save{entity_name}sAsync(db).execute(items);
-        }}
-    }}
-
-    /**
-     * A method to get the list of {{@link {entity_name}}}s in our database and notify listeners when the data is available.
-     */
-    public void load{entity_name}s() {{
-        {entity_name}Repository.Get{entity_name}sAsync task = new {entity_name}Repository.Get{entity_name}sAsync(db, mDataAccessListener);
-        task.execute();
-    }}
-
-    /**
-     * An {{@link AsyncTask}} class for saving entity data
-     */
-    private static class Save{entity_name}sAsync extends AsyncTask<{entity_name}, Integer, Integer> {{
-        private final {entity_name}Dao m{entity_name}Dao;
-
-        Save{entity_name}sAsync({database_class_name} db) {{
-            m{entity_name}Dao = db.{mod_class_name}Dao();
-        }}
-
-        @Override
-        protected Integer doInBackground(final {entity_name}... params) {{
-            m{entity_name}Dao.insertAll(params);
-            return 0;
-        }}
-
-        @Override
-        protected void onProgressUpdate(Integer... values) {{
-            super.onProgressUpdate(values);
-        }}
-
-        @Override
-        protected void onPostExecute(Integer integer) {{
-            super.onPostExecute(integer);
-        }}
-    }}
-
-    /**
-     * A class to get entities asynchronously
-     */
-    private static class Get{entity_name}sAsync extends AsyncTask<Void, Integer, ArrayList<{entity_name}>> {{
-        private final {entity_name}Dao m{entity_name}Dao;
-        private DataAccessListener mDataAccessListener;
-        private int requestCode = 0;
-
-        Get{entity_name}sAsync({database_class_name} db, DataAccessListener listener) {{
-            m{entity_name}Dao = db.{mod_class_name}Dao();
-            mDataAccessListener = listener;
-        }}
-
-        @Override
-        protected ArrayList<{entity_name}> doInBackground(final Void... params) {{
-            return new ArrayList<>(m{entity_name}Dao.getAll());
-        }}
-
-        @Override
-        protected void onProgressUpdate(Integer... values) {{
-            super.onProgressUpdate(values);
-        }}
-
-        @Override
-        protected void onPostExecute(ArrayList<{entity_name}> entities) {{
-            super.onPostExecute(entities);
-            if (entities != null)
-                if (mDataAccessListener != null) {{
-                    {entity_name}[] entitiesArray = new {entity_name}[entities.size()];
-                    entitiesArray = entities.toArray(entitiesArray);
-                    if (requestCode == 0)
-                        mDataAccessListener.onDataLoaded(entitiesArray);
-                    else mDataAccessListener.onDataRequestCompleted(requestCode, entitiesArray);
-                }}
-        }}
-    }}
-}}
-    '''
-    # write file
+    template = template_engine.EXECUTOR_REPOSITORY if options.repositories == EXECUTOR else template_engine.REPOSITORY
+    repository_class_content = template_engine.render(template, package_name=package_name,
+                                                      database_class_name=database_class_name, entity_name=entity_name,
+                                                      mod_class_name=mod_class_name, creation_note=creation_note,
+                                                      page_methods=page_methods, key_methods=key_methods,
+                                                      projection_methods=projection_methods,
+                                                      projection_imports=projection_imports,
+                                                      observable_methods=observable_methods,
+                                                      live_data_import=_REPOSITORY_LIVE_DATA_IMPORT
+                                                      if options.live_data else "",
+                                                      paging_import=_PAGING_IMPORT if options.paging else "")
+    # return the file to write
     filename = f"data/repository/{entity_name}Repository.java"
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
-
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(repository_class_content)
+    return filename, repository_class_content
 
 
 # create the base repository class
-def create_base_repository(package_name):
-    date = datetime.datetime.now()
-
-    base_repository_content = f'''
-package {package_name}.repository;
-
-import androidx.annotation.Nullable;
-
-import {package_name}.data.DataAccessListener;
-
-/**
- * Created on {date}
- */
-public class BaseRepository {{
-    /**
-     * A parameter for checking whether there is an observer waiting for the result for a data request or not
-     */
-    boolean hasPendingDataRequest = false;
-    /**
-     * A listener for reporting changes during data access
-     */
-    DataAccessListener mDataAccessListener = null;
-
-    /**
-     * A method to get the current data access listener for the class
-     *
-     * @return the {{@link DataAccessListener}} for the class
-     */
-    @Nullable
-    public DataAccessListener getDataAccessListener() {{
-        return mDataAccessListener;
-    }}
-
-    /**
-     * A method to set the data access listener for the class
-     *
-     * @param listener the data access listener
-     */
-    public void setDataAccessListener(@Nullable DataAccessListener listener) {{
-        this.mDataAccessListener = listener;
-    }}
-}}
-
-    '''
-    # write file
-    filename = "data/repository/BaseRepository.java"
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
+def create_base_repository(package_name, creation_note=None):
+    if creation_note is None:
+        creation_note = get_creation_note()
 
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(base_repository_content)
+    base_repository_content = template_engine.render(template_engine.BASE_REPOSITORY, package_name=package_name,
+                                                     creation_note=creation_note)
+    # return the file to write
+    filename = "data/repository/BaseRepository.java"
+    return filename, base_repository_content
 
 
 # create the base repository class
-def create_data_listener(package_name):
-    date = datetime.datetime.now()
-
-    base_repository_content = f'''
-package {package_name}.data;
-
-/**
- * Created on {date}
- */
-public interface DataAccessListener {{
-    /**
-     * A method to return results after a data query transaction is completed
-     *
-     * @param results the results returned
-     */
-    public void onDataLoaded(Object[] results);
-
-    /**
-     * A method to notify observers when data save has completed
-     */
-    public void onDataSaved();
-
-    /**
-     * A method to notify observers when data save has completed
-     *
-     * @param requestCode the request that initiated this action
-     */
-    default void onDataSaved(int requestCode) {{
-    }}
-
-    /**
-     * A method to return results after a data query transaction is completed
-     *
-     * @param requestCode the code to use to differentiate results
-     * @param results     the results returned
-     */
-    public void onDataRequestCompleted(int requestCode, Object[] results);
-}}
-
-    '''
-    # write file
+def create_data_listener(package_name, creation_note=None):
+    if creation_note is None:
+        creation_note = get_creation_note()
+
+    base_repository_content = template_engine.render(template_engine.DATA_ACCESS_LISTENER, package_name=package_name,
+                                                     creation_note=creation_note)
+    # return the file to write
     filename = "data/DataAccessListener.java"
-    if not os.path.exists(os.path.dirname(filename)):
-        try:
-            os.makedirs(os.path.dirname(filename))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != errno.EEXIST:
-                raise
+    return filename, base_repository_content
+
+
+# create the executors shared by the repositories, when they do not use AsyncTasks
+def create_database_executors(package_name, creation_note=None):
+    if creation_note is None:
+        creation_note = get_creation_note()
+
+    database_executors_content = template_engine.render(template_engine.DATABASE_EXECUTORS,
+                                                        package_name=package_name, creation_note=creation_note)
+    # return the file to write
+    filename = "data/DatabaseExecutors.java"
+    return filename, database_executors_content
+
+
+# create the type converters of the dates, when the date columns are dates rather than their stored values
+def create_converters(package_name, creation_note=None):
+    if creation_note is None:
+        creation_note = get_creation_note()
+
+    converters_content = template_engine.render(template_engine.CONVERTERS, package_name=package_name,
+                                                creation_note=creation_note)
+    # return the file to write
+    filename = "data/Converters.java"
+    return filename, converters_content
 
-    with open(filename, 'w+') as entity_file:
-        entity_file.write(base_repository_content)
+
+# the functions that create the files of each target, which all take the arguments of create_files
+TARGETS = {
+    ROOM: create_files,
+    DART: create_dart_entity_from_schema.create_files,
+}
 
 
 if __name__ == '__main__':
@@ -682,55 +1112,61 @@ if __name__ == '__main__':
     if in_arg is None:
         print("\n\nNo arguments provided\n\n")
         exit()
-    elif in_arg.dir is None:
+    elif in_arg.batch is None and in_arg.dir is None:
         print("\n\nNo sqlite database or schema provided\n\n")
         exit()
+    elif in_arg.archive is not None and (in_arg.batch is not None or in_arg.watch):
+        print("\n\nAn archive can only be written for a single schema, without watching it\n\n")
+        exit()
+    elif in_arg.asset is not None and (in_arg.batch is not None or in_arg.watch):
+        print("\n\nA database asset can only be built for a single schema, without watching it\n\n")
+        exit()
 
     # get arguments
-    version = 1
-    database_name = in_arg.dbfile
-    package_name = in_arg.package
-    database_class_name = in_arg.dbclass
-    my_sql_schema = read_sql_file(in_arg.dir)
-
-    entities_list = list()
-    dao_declarations = list()
-
-    # print(my_sql_schema)
-    for key, value in my_sql_schema.items():
-        # print(key.replace("_", " ").title().replace(" ", ""))
-        # get class name
-        class_name = key.replace("_", " ").title().replace(" ", "")
-
-        # get the fields for the entity
-        class_field_declarations = get_field_declarations(value)
-
-        # get the constructor for the entity
-        class_constructor = get_constructor(class_name, value)
-
-        # get the getters and setters for the entity
-        class_getters_n_setters = get_n_set(value)
-
-        # format the table name
-        table_name = key.lower() + "s"
-        if (key.lower()[-1] == "s"):
-            table_name = key + "es"
-
-        create_entity(package_name, class_name, table_name, class_field_declarations, class_constructor,
-                      class_getters_n_setters)
-
-        create_dao(package_name, class_name, table_name)
-
-        create_repository(package_name, database_class_name, class_name)
-
-        # add the entity to the entities list
-        entities_list.append(f"{class_name}.class")
-
-        # add the dao to the dao list
-        mod_class_name = class_name[0].lower() + class_name[1:]
-        dao_declarations.append(f"public abstract {class_name}Dao {mod_class_name}Dao();")
+    template_engine.use_template_dir(in_arg.templates)
+    if in_arg.watch:
+        if in_arg.batch is not None:
+            modules = [module[1:] for module in read_manifest(in_arg.batch, in_arg)]
+        else:
+            modules = [(in_arg.dir, in_arg.package, in_arg.dbclass, in_arg.dbfile, in_arg.output)]
+        watch([SchemaWatcher(*module, use_mmap=in_arg.mmap, deterministic=in_arg.deterministic,
+                             options=get_room_options(in_arg)) for module in modules], in_arg.watch_interval)
+        exit()
 
-    create_db_class(package_name, ", ".join(entities_list), version, database_class_name, database_name,
-                    "\n\n".join(dao_declarations))
-    create_base_repository(package_name)
-    create_data_listener(package_name)
+    # keep standard output for the archive when it is streamed there
+    log = sys.stderr if in_arg.archive == output_writer.STDOUT else sys.stdout
+    timings = instrumentation.Timings()
+    # profile the generation of the files, if asked to
+    profiler = cProfile.Profile() if in_arg.profile else None
+    if profiler is not None:
+        profiler.enable()
+    if in_arg.batch is not None:
+        results = run_batch(in_arg.batch, in_arg, timings)
+        writer = output_writer.FileWriter()
+        for _, module_writer, _ in results:
+            writer.written += module_writer.written
+            writer.unchanged += module_writer.unchanged
+            writer.bytes_written += module_writer.bytes_written
+    else:
+        print(in_arg.dir, file=log)
+        if in_arg.asset is not None:
+            # build the asset first, so that a schema sqlite fails to execute leaves the generated files as they were
+            with timings.stage("build database asset"):
+                written = database_asset.build_database_asset(in_arg.dir, in_arg.asset, in_arg.db_version)
+            print("{} {}".format(in_arg.asset, "written" if written else "unchanged"), file=log)
+        writer = output_writer.open_writer(in_arg.output, in_arg.archive)
+        generate_module(in_arg.dir, in_arg.package, in_arg.dbclass, in_arg.dbfile, in_arg.output, in_arg.mmap,
+                        not in_arg.no_cache, in_arg.cache_dir, in_arg.cache_size * 1024 * 1024,
+                        get_creation_note(in_arg.deterministic), get_jobs(in_arg.jobs), timings=timings,
+                        targets=in_arg.target, writer=writer, options=get_room_options(in_arg))
+        writer.close()
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(in_arg.profile)
+
+    if in_arg.batch is not None:
+        print_batch_summary(results)
+    else:
+        print(writer.summary(), file=log)
+    if in_arg.timings is not None:
+        timings.report(in_arg.timings, writer, log)
@@ -0,0 +1,106 @@
+import os
+import errno
+import filecmp
+import sqlite3
+
+import schema_model
+import sql_tokenizer
+import sqlite_introspection
+
+
+# Builds the prepackaged database of an app, which room copies into place on the first launch, instead of creating
+# an empty database that the app then fills in a row at a time.
+
+# the statements of a dump that control its transaction, which is replaced by one around the whole dump
+_TRANSACTION_KEYWORDS = {"BEGIN", "COMMIT", "END"}
+
+# the directory of the assets of an android module
+ASSETS_DIR = "assets"
+
+
+def get_asset_name(asset_file):
+    # get the path room opens an asset by, which is relative to the assets directory if the asset is in one
+    parts = os.path.abspath(asset_file).split(os.sep)
+    for index in range(len(parts) - 2, -1, -1):
+        if parts[index] == ASSETS_DIR:
+            return "/".join(parts[index + 1:])
+    return os.path.basename(asset_file)
+
+
+def iter_sql_statements(file):
+    # read the statements of an sql file but those that control its transaction, a chunk at a time so that a dump
+    # never has to be in memory as a whole
+    return sql_tokenizer.iter_statements(file, keep=lambda keywords: keywords[0] not in _TRANSACTION_KEYWORDS)
+
+
+def create_unique_constraint_indexes(connection):
+    # room only checks the indexes created with CREATE INDEX, and the entities declare the index of each unique
+    # constraint by the name schema_model gives it, so the asset gets an index of that name on the same columns
+    quote_identifier = sqlite_introspection.quote_identifier
+    tables = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    for table_name, in tables.fetchall():
+        for _, name, _, origin, _ in connection.execute(
+                "PRAGMA index_list({})".format(quote_identifier(table_name))).fetchall():
+            if origin != "u":
+                continue
+            column_names = [column_name for _, _, column_name in connection.execute(
+                "PRAGMA index_info({})".format(quote_identifier(name))).fetchall()]
+            connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS {} ON {} ({})".format(
+                quote_identifier(schema_model.get_index_name(table_name, column_names)),
+                quote_identifier(table_name), ", ".join(quote_identifier(column) for column in column_names)))
+
+
+def build_database_asset(schema_file, asset_file, version=1):
+    """
+    Builds a prepackaged database from a schema.
+    An sql schema is executed in a new database, along with the rows it inserts, in a single transaction, and a
+    sqlite database is copied. Either way the unique constraints get the named indexes the entities declare for them,
+    and the database is vacuumed, so that it is as small as it can be, and is given the version of the database
+    class, which room checks before using it.
+    Parameters:
+     schema_file - the path of the sql schema, or of a sqlite database
+     asset_file - the path to write the database to
+     version - the version of the database class
+    Returns:
+     whether or not the asset had to be written, it is left as it is if it is already up to date
+    """
+    asset_dir = os.path.dirname(os.path.abspath(asset_file))
+    try:
+        os.makedirs(asset_dir)
+    except OSError as exc:  # Guard against race condition
+        if exc.errno != errno.EEXIST:
+            raise
+    # build the database next to the asset and move it into place, so that the asset is never left half written
+    temporary_filename = "{}.{}.tmp".format(os.path.abspath(asset_file), os.getpid())
+    if os.path.exists(temporary_filename):
+        # left behind by a run that was killed, sqlite would add to it rather than start again
+        os.unlink(temporary_filename)
+    try:
+        connection = sqlite3.connect(temporary_filename, isolation_level=None)
+        try:
+            if sqlite_introspection.is_sqlite_database(schema_file):
+                source = sqlite_introspection.connect(schema_file)
+                try:
+                    source.backup(connection)
+                finally:
+                    source.close()
+            else:
+                connection.execute("BEGIN")
+                with open(schema_file, 'r') as file:
+                    for statement in iter_sql_statements(file):
+                        connection.execute(statement)
+                connection.execute("COMMIT")
+            create_unique_constraint_indexes(connection)
+            connection.execute("PRAGMA user_version = {:d}".format(version))
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+        if os.path.exists(asset_file) and filecmp.cmp(temporary_filename, asset_file, shallow=False):
+            os.unlink(temporary_filename)
+            return False
+        os.replace(temporary_filename, asset_file)
+    except BaseException:
+        if os.path.exists(temporary_filename):
+            os.unlink(temporary_filename)
+        raise
+    return True
@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import collections
+import socketserver
+
+import create_room_from_schema as room
+import output_writer
+import schema_cache
+import schema_model
+import schema_reader
+import template_engine
+
+
+# A long running generator, for build tools that generate the files of many modules and can not afford to start
+# python for each of them.
+# Requests are read as json lines from standard input, or from the connections to a unix socket, and each is
+# answered with a json line. The tables of each schema are kept in memory along with the hash of the schema file, so
+# an unchanged schema is never parsed again, and the files generated for it are kept too when they are deterministic,
+# so a request for an unchanged schema costs little more than hashing the schema and comparing the files on disk.
+#
+# A request is of the form
+#  {"id": ..., "schema": ..., "package": ..., "dbclass": ..., "dbfile": ..., "output": ..., "targets": [...] or "...",
+#   "deterministic": ..., "paging": ..., "repositories": ..., "date_converters": ...,
+#   "asset": ..., "journal_mode": ..., "builder_options": [...], "projections": ...,
+#   "live_data": ..., "version": ...}
+# where every key but schema may be left out, and the keys after deterministic are the RoomOptions of the code. The
+# files are written into output if it is given, and returned in the "files" of the response otherwise.
+# {"command": "stop"} stops the server.
+
+# the default number of schemas to keep in memory
+DEFAULT_MAX_SCHEMAS = 32
+
+GENERATE = "generate"
+STOP = "stop"
+
+
+def get_input_args():
+    """
+    Retrieves and parses the command line arguments provided by the user when
+    they run the server from a terminal window.
+    Parameters:
+     None - simply using argparse module to create & store command line arguments
+    Returns:
+     parse_args() -data structure that stores the command line arguments object
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--socket", type=str,
+                        help="The path of a unix socket to serve the requests on, instead of standard input")
+    parser.add_argument("-t", "--templates", type=str,
+                        help="A directory of templates to use instead of the default ones, named as in the "
+                             "templates directory")
+    parser.add_argument("-m", "--mmap", action="store_true",
+                        help="Memory map the schemas and skip over everything but the CREATE statements without "
+                             "reading them, for large database dumps")
+    parser.add_argument("--max-schemas", type=int, default=DEFAULT_MAX_SCHEMAS,
+                        help="The number of schemas to keep in memory, the least recently used are forgotten "
+                             "beyond it")
+    return parser.parse_args()
+
+
+class GeneratorServer:
+    """
+    Answers generate requests, keeping the tables of the schemas and the files generated for them in memory.
+    Parameters:
+     use_mmap - whether or not to memory map the schemas when reading them
+     max_schemas - the number of schemas to keep in memory
+    """
+
+    def __init__(self, use_mmap=False, max_schemas=DEFAULT_MAX_SCHEMAS):
+        self.use_mmap = use_mmap
+        self.max_schemas = max_schemas
+        self.stopped = False
+        # the (signature, hash, tables) of each schema file, and the files generated for each schema and set of
+        # options, in the order they were last used
+        self._tables = collections.OrderedDict()
+        self._files = collections.OrderedDict()
+
+    def get_tables(self, schema_file):
+        # get the (hash, tables) of a schema, reading them again only if the schema changed since they were last read.
+        # the schema is only hashed again when its size, modification time or inode changed
+        signature = schema_cache.get_file_signature(schema_file)
+        entry = self._tables.get(schema_file)
+        if entry is None or entry[0] != signature:
+            file_hash = schema_cache.hash_file(schema_file)
+            if entry is None or entry[1] != file_hash:
+                tables = schema_model.build_tables(schema_reader.read_schema(schema_file, self.use_mmap))
+            else:
+                tables = entry[2]
+            entry = (signature, file_hash, tables)
+        self._remember(self._tables, schema_file, entry)
+        return entry[1:]
+
+    def get_files(self, schema_file, package_name, database_class_name, database_name, targets, deterministic,
+                  options=None):
+        # get the files generated for a schema, generating them again only if the schema or the options changed
+        file_hash, tables = self.get_tables(schema_file)
+        if not deterministic:
+            # the creation time is on every file, so they are different every time
+            return dict(room.iter_target_files(package_name, database_class_name, database_name, tables, targets,
+                                               options=options))
+        key = (schema_file, file_hash, package_name, database_class_name, database_name, tuple(targets), options)
+        files = self._files.get(key)
+        if files is None:
+            files = dict(room.iter_target_files(package_name, database_class_name, database_name, tables, targets,
+                                                room.get_creation_note(deterministic), options=options))
+        self._remember(self._files, key, files)
+        return files
+
+    def handle(self, request):
+        """
+        Answers a request.
+        Parameters:
+         request - the dictionary of the request
+        Returns:
+         the dictionary of the response, with the id of the request and either the result or an "error"
+        """
+        start_time = time.perf_counter()
+        response = {"id": request.get("id")}
+        try:
+            command = request.get("command", GENERATE)
+            if command == STOP:
+                self.stopped = True
+            elif command == GENERATE:
+                response.update(self.generate(request))
+            else:
+                raise ValueError("Unknown command {!r}".format(command))
+        except Exception as exc:
+            response["error"] = "{}: {}".format(type(exc).__name__, exc)
+        response["seconds"] = time.perf_counter() - start_time
+        return response
+
+    def generate(self, request):
+        targets = request.get("targets", [room.ROOM])
+        if isinstance(targets, str):
+            # a comma separated list, as --target takes
+            targets = [target.strip() for target in targets.split(",") if target.strip()]
+        if not isinstance(targets, list) or not targets or not all(isinstance(target, str) for target in targets):
+            raise ValueError("targets must be a list of targets or a comma separated string of them, got {!r}".format(
+                request["targets"]))
+        unknown = [target for target in targets if target not in room.TARGETS]
+        if unknown:
+            raise ValueError("Unknown targets {}".format(", ".join(unknown)))
+        files = self.get_files(request["schema"], request.get("package", "com.example.app"),
+                               request.get("dbclass", "AppDatabase"), request.get("dbfile", "database.db"), targets,
+                               request.get("deterministic", False), get_room_options(request))
+        if request.get("output") is None:
+            return {"files": files}
+        writer = output_writer.FileWriter(request["output"])
+        for filename, content in files.items():
+            writer.write(filename, content)
+        writer.close()
+        return {"written": writer.written, "unchanged": writer.unchanged}
+
+    def serve_lines(self, input_file, output_file):
+        # answer the json lines of input_file with json lines on output_file, until it ends or the server is stopped
+        for line in input_file:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a json object")
+            except ValueError as exc:
+                response = {"id": None, "error": "Invalid request: {}".format(exc)}
+            else:
+                response = self.handle(request)
+            output_file.write(json.dumps(response) + "\n")
+            output_file.flush()
+            if self.stopped:
+                break
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_schemas:
+            cache.popitem(last=False)
+
+
+def get_room_options(request):
+    return room.RoomOptions(paging=request.get("paging", False),
+                            repositories=request.get("repositories", room.ASYNCTASK),
+                            date_converters=request.get("date_converters", False), asset=request.get("asset"),
+                            journal_mode=request.get("journal_mode", room.JOURNAL_MODES[0]),
+                            builder_options=request.get("builder_options", ()),
+                            projections=room.read_projections(request["projections"])
+                            if request.get("projections") else (),
+                            live_data=request.get("live_data", False), version=request.get("version", 1))
+
+
+def serve_socket(server, socket_path):
+    # answer the requests of every connection to a unix socket, one connection at a time
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform")
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            server.serve_lines((line.decode("utf-8") for line in self.rfile), _SocketWriter(self.wfile))
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as socket_server:
+        try:
+            while not server.stopped:
+                socket_server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
+class _SocketWriter:
+    # write text to the binary stream of a socket
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        self.stream.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.stream.flush()
+
+
+if __name__ == '__main__':
+    in_arg = get_input_args()
+    template_engine.use_template_dir(in_arg.templates)
+    generator_server = GeneratorServer(in_arg.mmap, in_arg.max_schemas)
+    if in_arg.socket is not None:
+        serve_socket(generator_server, in_arg.socket)
+    else:
+        try:
+            generator_server.serve_lines(sys.stdin, sys.stdout)
+        except KeyboardInterrupt:
+            pass
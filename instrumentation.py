@@ -0,0 +1,99 @@
+import sys
+import json
+import time
+import contextlib
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None
+
+
+# Timings of a generator run, for finding out where the time goes when a regeneration is slow.
+# The wall time of each stage and each table, the bytes read and written, the files written and skipped and the
+# peak memory of the process are recorded, and reported as text or as json lines.
+
+TEXT = "text"
+JSON = "json"
+
+
+def get_peak_rss():
+    # get the peak resident set size of this process in bytes, or None if it is not known
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, mac os bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Timings:
+    """
+    The timings of a generator run.
+    Attributes:
+     stages - the seconds spent in each stage, in the order the stages were first entered
+     tables - the seconds spent creating the files of each table
+     bytes_read - the number of bytes of schema read
+    """
+
+    def __init__(self):
+        self.stages = dict()
+        self.tables = dict()
+        self.bytes_read = 0
+        self._start_time = time.perf_counter()
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, stage):
+        # time the body of a with statement as part of a stage
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start_time)
+
+    def add_table(self, table_name, seconds):
+        self.tables[table_name] = self.tables.get(table_name, 0.0) + seconds
+
+    def get_summary(self, writer=None):
+        summary = {"seconds": time.perf_counter() - self._start_time, "bytes_read": self.bytes_read,
+                   "peak_rss_bytes": get_peak_rss()}
+        if writer is not None:
+            summary.update({"bytes_written": writer.bytes_written, "files_written": writer.written,
+                            "files_unchanged": writer.unchanged})
+        return summary
+
+    def report(self, output_format=TEXT, writer=None, file=None):
+        """
+        Writes the timings out.
+        Parameters:
+         output_format - TEXT for a human readable table, or JSON for one json object per line
+         writer - the FileWriter of the run, for the bytes and files written
+         file - the file to write the timings to, standard output by default
+        """
+        file = file or sys.stdout
+        summary = self.get_summary(writer)
+        if output_format == JSON:
+            for stage, seconds in self.stages.items():
+                print(json.dumps({"type": "stage", "name": stage, "seconds": seconds}), file=file)
+            for table_name, seconds in self.tables.items():
+                print(json.dumps({"type": "table", "name": table_name, "seconds": seconds}), file=file)
+            summary["type"] = "summary"
+            print(json.dumps(summary), file=file)
+            return
+
+        print("{:<24}  {:>10}".format("stage", "seconds"), file=file)
+        for stage, seconds in self.stages.items():
+            print("{:<24}  {:>10.4f}".format(stage, seconds), file=file)
+        if self.tables:
+            # the slowest tables are the interesting ones
+            print("\n{:<24}  {:>10}".format("slowest tables", "seconds"), file=file)
+            for table_name, seconds in sorted(self.tables.items(), key=lambda item: -item[1])[:10]:
+                print("{:<24}  {:>10.4f}".format(table_name, seconds), file=file)
+        print("\ntotal {:.4f} seconds, {} bytes read".format(summary["seconds"], summary["bytes_read"]), file=file)
+        if writer is not None:
+            print("{} bytes written, {} files written, {} unchanged".format(
+                summary["bytes_written"], summary["files_written"], summary["files_unchanged"]), file=file)
+        if summary["peak_rss_bytes"] is not None:
+            print("peak memory {:.1f} MB".format(summary["peak_rss_bytes"] / (1024 * 1024)), file=file)
@@ -0,0 +1,211 @@
+import io
+import os
+import sys
+import gzip
+import errno
+import tarfile
+import zipfile
+import tempfile
+
+
+# The output layer for the generated files.
+# A file is only rewritten when its content has changed, so that a regeneration which changes nothing leaves every
+# file, and the build tools that watch them, untouched.
+
+# the permissions of new files, as open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+# the archive name that streams a tar archive to standard output
+STDOUT = "-"
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz")
+# the time stamped on the files of an archive, the earliest a zip file can hold, so that an archive only changes with
+# the files in it
+_ARCHIVE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def open_writer(output_dir=".", archive=None):
+    """
+    Gets the writer for the generated files.
+    Parameters:
+     output_dir - the directory to write the files into, when they are not written into an archive
+     archive - the path of a zip or srcjar archive, or of a tar archive ending in one of TAR_SUFFIXES, or STDOUT to
+      stream a tar archive to standard output, to write all the files into instead of separate files
+    Returns:
+     a FileWriter, ZipWriter or TarWriter
+    """
+    if archive is None:
+        return FileWriter(output_dir)
+    if archive == STDOUT or archive.endswith(TAR_SUFFIXES):
+        return TarWriter(archive)
+    return ZipWriter(archive)
+
+
+class FileWriter:
+    """
+    Writes generated files atomically, skipping the files whose content is already up to date.
+    Parameters:
+     output_dir - the directory the file names are relative to
+    Attributes:
+     written - the number of files written
+     bytes_written - the number of bytes written
+     unchanged - the number of files skipped because they were up to date
+     removed - the number of files removed
+    """
+
+    def __init__(self, output_dir="."):
+        self.output_dir = output_dir
+        self.written = 0
+        self.bytes_written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self._directories = set()
+
+    def write(self, filename, content):
+        # write a generated file, returning whether or not it had to be written
+        return self.write_bytes(filename, content.encode("utf-8"))
+
+    def write_bytes(self, filename, data):
+        filename = os.path.join(self.output_dir, filename)
+        if self._is_unchanged(filename, data):
+            self.unchanged += 1
+            return False
+        self._make_directory(os.path.dirname(filename))
+        # write to a temporary file next to the file and move it into place, so that the file is never left
+        # half written
+        descriptor, temporary_filename = tempfile.mkstemp(dir=os.path.dirname(filename) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as temporary_file:
+                temporary_file.write(data)
+            os.chmod(temporary_filename, _FILE_MODE)
+            os.replace(temporary_filename, filename)
+        except BaseException:
+            os.unlink(temporary_filename)
+            raise
+        self.written += 1
+        self.bytes_written += len(data)
+        return True
+
+    def remove(self, filename):
+        # remove a file that is no longer generated
+        try:
+            os.remove(os.path.join(self.output_dir, filename))
+        except FileNotFoundError:
+            return
+        self.removed += 1
+
+    def close(self):
+        pass
+
+    def summary(self):
+        return "{} files written, {} unchanged".format(self.written, self.unchanged)
+
+    def _is_unchanged(self, filename, data):
+        try:
+            # compare the sizes first, to avoid reading the files that have obviously changed
+            if os.stat(filename).st_size != len(data):
+                return False
+            with open(filename, 'rb') as existing_file:
+                return existing_file.read() == data
+        except OSError:
+            return False
+
+    def _make_directory(self, directory):
+        if not directory or directory in self._directories:
+            return
+        try:
+            os.makedirs(directory)
+        except OSError as exc:  # Guard against race condition
+            if exc.errno != errno.EEXIST:
+                raise
+        self._directories.add(directory)
+
+
+class ZipWriter:
+    """
+    Writes generated files into a single zip archive, such as a srcjar, instead of a file and directory each.
+    The archive is put together in memory, and written in one go when the writer is closed, unless an archive of the
+    same content is already there.
+    Parameters:
+     path - the path of the archive
+    Attributes:
+     written, bytes_written, unchanged, removed - as for FileWriter, counting the files in the archive
+     archive_unchanged - whether or not the archive was left as it was, once the writer is closed
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.bytes_written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.archive_unchanged = False
+        self._buffer = io.BytesIO()
+        self._archive = zipfile.ZipFile(self._buffer, 'w', zipfile.ZIP_DEFLATED)
+
+    def write(self, filename, content):
+        data = content.encode("utf-8")
+        info = zipfile.ZipInfo(filename.replace(os.sep, "/"), date_time=_ARCHIVE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = (0o100000 | _FILE_MODE) << 16
+        self._archive.writestr(info, data)
+        self.written += 1
+        self.bytes_written += len(data)
+        return True
+
+    def close(self):
+        self._archive.close()
+        self.archive_unchanged = not FileWriter().write_bytes(self.path, self._buffer.getvalue())
+
+    def summary(self):
+        return "{} files written into {}{}".format(self.written, self.path,
+                                                   ", unchanged" if self.archive_unchanged else "")
+
+
+class TarWriter:
+    """
+    Writes generated files into a single tar archive, compressed with gzip if its name ends in .gz or .tgz.
+    A tar archive written to STDOUT is streamed as the files are written, any other is written as for ZipWriter.
+    Parameters:
+     path - the path of the archive, or STDOUT
+    Attributes:
+     written, bytes_written, unchanged, removed, archive_unchanged - as for ZipWriter
+    """
+
+    def __init__(self, path=STDOUT):
+        self.path = path
+        self.written = 0
+        self.bytes_written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.archive_unchanged = False
+        self._buffer = sys.stdout.buffer if path == STDOUT else io.BytesIO()
+        self._stream = self._buffer
+        if path.endswith((".gz", ".tgz")):
+            # leave the time out of the gzip header, so that the archive only changes with the files in it
+            self._stream = gzip.GzipFile(fileobj=self._buffer, mode='wb', mtime=0)
+        self._archive = tarfile.open(fileobj=self._stream, mode='w|')
+
+    def write(self, filename, content):
+        data = content.encode("utf-8")
+        info = tarfile.TarInfo(filename.replace(os.sep, "/"))
+        info.size = len(data)
+        info.mode = _FILE_MODE
+        self._archive.addfile(info, io.BytesIO(data))
+        self.written += 1
+        self.bytes_written += len(data)
+        return True
+
+    def close(self):
+        self._archive.close()
+        if self._stream is not self._buffer:
+            self._stream.close()
+        if self.path == STDOUT:
+            self._buffer.flush()
+            return
+        self.archive_unchanged = not FileWriter().write_bytes(self.path, self._buffer.getvalue())
+
+    def summary(self):
+        path = "standard output" if self.path == STDOUT else self.path
+        return "{} files written into {}{}".format(self.written, path, ", unchanged" if self.archive_unchanged else "")
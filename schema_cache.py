@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import errno
+import hashlib
+import tempfile
+
+
+# An on-disk cache of parsed schemas, keyed by a hash of the schema file, so that an unchanged schema
+# is loaded from the cache instead of being parsed again.
+
+# the modules whose code decides what is parsed out of a schema and how it is cached, any change to which invalidates
+# the cached schemas
+_PARSER_MODULES = ("schema_cache.py", "schema_reader.py", "sql_tokenizer.py", "sqlite_introspection.py")
+
+# the default limit on the total size of the cache, in bytes
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# the number of bytes to hash at a time
+_HASH_CHUNK_SIZE = 1 << 20
+
+# the suffixes of the cached schemas, and of the hashes of the schema files they were cached for
+_ENTRY_SUFFIX = ".json"
+_SIGNATURE_SUFFIX = ".stat"
+
+_parser_version = None
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sql-to-room-utility")
+
+
+def hash_file(path):
+    # hash the contents of a file, a chunk at a time
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_table(table_data):
+    # hash the columns and indexes of a single table, so that changed tables can be told apart from unchanged ones
+    return hashlib.blake2b(json.dumps(table_data).encode(), digest_size=20).hexdigest()
+
+
+def get_parser_version():
+    # get a hash of the code of the parsers, so that the schemas cached by another version of them are never used
+    global _parser_version
+    if _parser_version is None:
+        digest = hashlib.blake2b(digest_size=8)
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+        for module in _PARSER_MODULES:
+            with open(os.path.join(module_dir, module), 'rb') as module_file:
+                digest.update(module_file.read())
+        _parser_version = digest.hexdigest()
+    return _parser_version
+
+
+def get_file_signature(path):
+    # the size, modification time and inode of a file, one of which changes whenever the file is written
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def get_cache_key(schema_file, cache_dir):
+    """
+    Gets the cache key of a schema file, made of the version of the parsers and the hash of the file.
+    The hash is kept in the cache along with the signature of the file it was computed for, and the file is only read
+    and hashed again when its signature changes, so that an unchanged schema of any size is looked up with a stat.
+    Parameters:
+     schema_file - the path of the schema file
+     cache_dir - the directory of the cache
+    Returns:
+     the cache key
+    """
+    version = get_parser_version()
+    signature = get_file_signature(schema_file)
+    path_hash = hashlib.blake2b(os.path.abspath(schema_file).encode(), digest_size=20).hexdigest()
+    signature_filename = os.path.join(cache_dir, path_hash + _SIGNATURE_SUFFIX)
+    try:
+        with open(signature_filename, 'r') as signature_file:
+            entry = json.load(signature_file)
+        if entry["version"] == version and entry["signature"] == signature:
+            return "{}-{}".format(version, entry["hash"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    file_hash = hash_file(schema_file)
+    try:
+        write_entry(signature_filename, {"version": version, "signature": signature, "hash": file_hash})
+    except OSError:
+        # the file is just hashed again on the next run, the cache itself reports an unwritable directory
+        pass
+    return "{}-{}".format(version, file_hash)
+
+
+def load(key, cache_dir):
+    """
+    Loads a parsed schema from the cache.
+    Parameters:
+     key - the cache key of the schema file, from get_cache_key
+     cache_dir - the directory of the cache
+    Returns:
+     the dictionary of tables, or None if the schema is not in the cache
+    """
+    filename = os.path.join(cache_dir, key + _ENTRY_SUFFIX)
+    try:
+        with open(filename, 'r') as cache_file:
+            entry = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != get_parser_version():
+        return None
+    # mark the entry as recently used, the least recently used entries are evicted first
+    try:
+        os.utime(filename)
+    except OSError:
+        pass
+    tables_dict = dict()
+    for table_name, table_data in entry["tables"]:
+        tables_dict[table_name] = {"columns": [tuple(column) for column in table_data["columns"]],
+                                   "indexes": [tuple(index) for index in table_data["indexes"]],
+                                   "foreign_keys": [tuple(key) for key in table_data["foreign_keys"]]}
+    return tables_dict
+
+
+def store(key, tables_dict, cache_dir, max_size=DEFAULT_MAX_SIZE):
+    """
+    Saves a parsed schema to the cache, then evicts the least recently used entries over the size limit.
+    Parameters:
+     key - the cache key of the schema file, from get_cache_key
+     tables_dict - the parsed tables
+     cache_dir - the directory of the cache
+     max_size - the limit on the total size of the cache, in bytes
+    """
+    entry = {"version": get_parser_version(), "tables": list(tables_dict.items())}
+    write_entry(os.path.join(cache_dir, key + _ENTRY_SUFFIX), entry)
+    evict(cache_dir, max_size)
+
+
+def write_entry(filename, entry):
+    cache_dir = os.path.dirname(filename)
+    try:
+        os.makedirs(cache_dir)
+    except OSError as exc:  # Guard against race condition
+        if exc.errno != errno.EEXIST:
+            raise
+    # write to a temporary file and move it into place, so that a concurrent run never reads half an entry
+    descriptor, temporary_filename = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'w') as cache_file:
+            json.dump(entry, cache_file, separators=(",", ":"))
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        os.unlink(temporary_filename)
+        raise
+
+
+def evict(cache_dir, max_size=DEFAULT_MAX_SIZE):
+    # remove the least recently used entries until the cache fits within max_size bytes
+    entries = list()
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith((_ENTRY_SUFFIX, _SIGNATURE_SUFFIX)):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total_size -= size
+
+
+def read_cached(schema_file, read, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """
+    Reads a schema through the cache, parsing it only if it has changed since it was last cached.
+    Parameters:
+     schema_file - the path of the schema file
+     read - a function which parses the schema file into a dictionary of tables
+     cache_dir - the directory of the cache, default_cache_dir() if not given
+     max_size - the limit on the total size of the cache, in bytes
+    Returns:
+     the dictionary of tables
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    key = get_cache_key(schema_file, cache_dir)
+    cached = load(key, cache_dir)
+    if cached is not None:
+        return cached
+    tables_dict = read(schema_file)
+    try:
+        store(key, tables_dict, cache_dir, max_size)
+    except OSError as exc:
+        # the cache is only an optimisation, a read only or full disk should not fail the run
+        # on standard error, as standard output may be carrying a streamed archive
+        print("Unable to write the schema cache: {}".format(exc), file=sys.stderr)
+    return tables_dict
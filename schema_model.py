@@ -0,0 +1,236 @@
+import re
+import copy
+
+
+# The tables and columns of a parsed schema, as consumed by the code generators.
+# Everything the generators need about a column, such as its java and dart names and types, is worked out once
+# when the table is built, instead of every time a piece of code is generated for it.
+
+# the names left behind by table constraints in older parses, which are not columns
+_CONSTRAINT_NAMES = {"foreign", "primary"}
+
+
+def pascal_case(name):
+    # make a pascal case class or accessor name
+    return name.replace("_", " ").title().replace(" ", "")
+
+
+def get_index_name(table_name, column_names):
+    # the name room gives an index that is not named
+    return "index_{}_{}".format(table_name, "_".join(column_names))
+
+
+# the type affinities of sqlite, which decide how a column stores its values whatever type it was declared with
+INTEGER = "INTEGER"
+TEXT = "TEXT"
+BLOB = "BLOB"
+REAL = "REAL"
+NUMERIC = "NUMERIC"
+
+# the declared types that hold 32 bit integers, every other integer column may hold 64 bit integers such as row ids
+# and times in milliseconds
+_INT_TYPES = re.compile(r'^(TINYINT|SMALLINT|MEDIUMINT|INT|INT2)\b', re.IGNORECASE)
+_BOOLEAN_TYPES = re.compile(r'^BOOL', re.IGNORECASE)
+# the declared types of dates, which sqlite stores as text, or as numbers for timestamps
+_DATE_TYPES = re.compile(r'^(DATE|DATETIME|TIMESTAMP)\b', re.IGNORECASE)
+_TIMESTAMP_TYPES = re.compile(r'^TIMESTAMP\b', re.IGNORECASE)
+
+# the java type of the date columns when the room type converters are used
+DATE_TYPE = "java.util.Date"
+
+# the classes of the primitive java types, for the places a primitive can not go, such as a List or a nullable field
+BOXED_TYPES = {"int": "Integer", "long": "Long", "double": "Double", "boolean": "Boolean"}
+
+
+def get_affinity(data_type):
+    # get the affinity of a declared type, by the rules of section 3.1 of https://www.sqlite.org/datatype3.html
+    data_type = data_type.upper()
+    if "INT" in data_type:
+        return INTEGER
+    if "CHAR" in data_type or "CLOB" in data_type or "TEXT" in data_type:
+        return TEXT
+    if "BLOB" in data_type or not data_type.strip():
+        return BLOB
+    if "REAL" in data_type or "FLOA" in data_type or "DOUB" in data_type:
+        return REAL
+    return NUMERIC
+
+
+def is_date_type(data_type):
+    return _DATE_TYPES.match(data_type.strip()) is not None
+
+
+def get_java_type(data_type, nullable=False):
+    """
+    Gets the java type of a column from its declared type.
+    Parameters:
+     data_type - the declared type of the column
+     nullable - whether or not the column may be null, which needs the class of a primitive type
+    Returns:
+     the java type
+    """
+    data_type = data_type.strip()
+    affinity = get_affinity(data_type)
+    if _BOOLEAN_TYPES.match(data_type):
+        java_type = "boolean"
+    elif affinity == INTEGER:
+        java_type = "int" if _INT_TYPES.match(data_type) else "long"
+    elif affinity == REAL:
+        java_type = "double"
+    elif affinity == NUMERIC:
+        # dates are text unless they are timestamps, which are numbers
+        if is_date_type(data_type):
+            java_type = "long" if _TIMESTAMP_TYPES.match(data_type) else "String"
+        else:
+            java_type = "double"
+    elif affinity == BLOB and data_type:
+        java_type = "byte[]"
+    else:
+        # a column without a declared type takes any value, which a string holds best
+        java_type = "String"
+    if nullable:
+        return get_boxed_type(java_type)
+    return java_type
+
+
+def get_boxed_type(java_type):
+    return BOXED_TYPES.get(java_type, java_type)
+
+
+def get_dart_type(data_type):
+    # dart integers are 64 bit, and blobs and dates are strings in the json of the built values
+    data_type = data_type.strip()
+    affinity = get_affinity(data_type)
+    if _BOOLEAN_TYPES.match(data_type):
+        return "bool"
+    elif affinity == INTEGER or _TIMESTAMP_TYPES.match(data_type):
+        return "int"
+    elif affinity == REAL or (affinity == NUMERIC and not is_date_type(data_type)):
+        return "double"
+    return "String"
+
+
+class Column:
+    """
+    A column of a table.
+    Attributes:
+     name - the name of the column in the database
+     data_type - the declared data type of the column
+     primary_key - whether or not the column is the primary key of its table
+     not_null - whether or not the column is declared NOT NULL
+     nullable - whether or not the column may be null, which an integer primary key never is as it is the row id
+     affinity - the sqlite type affinity of the column
+     date - whether or not the column is declared as a date, which the room type converters make a DATE_TYPE
+     java_name - the camel case name of the field for the column
+     accessor_name - the pascal case name used in the getter and setter of the field
+     java_type - the java type of the field, the class of a primitive type if the column is nullable
+     dart_type - the dart type of the field
+    """
+    __slots__ = ("name", "data_type", "primary_key", "not_null", "nullable", "affinity", "date", "java_name",
+                 "accessor_name", "java_type", "dart_type")
+
+    def __init__(self, name, data_type, qualifier):
+        self.name = name
+        self.data_type = data_type
+        self.primary_key = "primary key" in qualifier
+        self.not_null = "not null" in qualifier
+        self.affinity = get_affinity(data_type)
+        self.nullable = not (self.not_null or (self.primary_key and self.affinity == INTEGER))
+        self.date = is_date_type(data_type)
+        # make a camel case variable name
+        self.accessor_name = pascal_case(name)
+        self.java_name = self.accessor_name[0].lower() + self.accessor_name[1:]
+        self.java_type = get_java_type(data_type, self.nullable)
+        self.dart_type = get_dart_type(data_type)
+
+    def __repr__(self):
+        return "Column({!r}, {!r})".format(self.name, self.data_type)
+
+
+class Index:
+    """
+    An index on the columns of a table.
+    Attributes:
+     name - the name of the index in the database
+     unique - whether or not the index is unique
+     column_names - the names of the indexed columns, in order
+     where - the where clause of a partial index, or an empty string
+    """
+    __slots__ = ("name", "unique", "column_names", "where")
+
+    def __init__(self, name, unique, column_names, where=""):
+        self.name = name
+        self.unique = unique
+        self.column_names = column_names
+        self.where = where
+
+    def __repr__(self):
+        return "Index({!r}, {!r})".format(self.name, self.column_names)
+
+
+class Table:
+    """
+    A table of the schema.
+    Attributes:
+     name - the name of the table in the database
+     class_name - the name of the class generated for the table
+     columns - the columns of the table, in the order they were declared, without duplicates
+     indexes - the indexes on the columns of the table
+    """
+    __slots__ = ("name", "class_name", "columns", "indexes")
+
+    def __init__(self, name, columns, indexes=()):
+        self.name = name
+        self.class_name = pascal_case(name)
+        self.columns = columns
+        self.indexes = list(indexes)
+
+    def __repr__(self):
+        return "Table({!r}, {!r})".format(self.name, self.columns)
+
+
+def build_table(name, table_data):
+    """
+    Builds a table from its data, as returned by the schema readers.
+    Parameters:
+     name - the name of the table
+     table_data - a dictionary of the (name, data type, qualifier) tuples of the "columns" of the table and the
+      (name, unique, column names, where clause) tuples of its "indexes". Its "foreign_keys" are left out, as none of
+      the generated code declares them
+    Returns:
+     the Table
+    """
+    columns = list()
+    completed_fields = set()
+    for field_name, data_type, field_qualifier in table_data["columns"]:
+        # eliminate the foreign keys and primary key additional data
+        if field_name in completed_fields or field_name.lower() in _CONSTRAINT_NAMES:
+            continue
+        completed_fields.add(field_name)
+        columns.append(Column(field_name, data_type, field_qualifier))
+    # leave out the indexes of columns that are not in the table, and the duplicates of an index
+    indexes = list()
+    completed_indexes = set()
+    for index_name, unique, column_names, where in table_data.get("indexes", ()):
+        key = (tuple(column_names), unique, where)
+        if key in completed_indexes or not set(column_names) <= completed_fields:
+            continue
+        completed_indexes.add(key)
+        indexes.append(Index(index_name, unique, list(column_names), where))
+    return Table(name, columns, indexes)
+
+
+def with_date_type(table):
+    # get a copy of a table whose date columns are DATE_TYPE fields, for the room type converters
+    columns = list()
+    for column in table.columns:
+        if column.date:
+            column = copy.copy(column)
+            column.java_type = DATE_TYPE
+        columns.append(column)
+    return Table(table.name, columns, table.indexes)
+
+
+def build_tables(tables_dict):
+    # build the tables of a parsed schema, in the order they were declared
+    return [build_table(name, columns_data) for name, columns_data in tables_dict.items()]
@@ -0,0 +1,268 @@
+import os
+
+import instrumentation
+import schema_cache
+import schema_model
+import sql_tokenizer
+import sqlite_introspection
+
+
+# The schema reader shared by the generators.
+# A schema is read once, from the catalogue of a sqlite database or from the CREATE TABLE statements of an sql
+# schema, into the (name, data type, qualifier) tuples of the columns of each table, and built into the tables of
+# schema_model that every generator emits its files from.
+
+# the keywords that start a table constraint rather than a column definition
+TABLE_CONSTRAINTS = {"CONSTRAINT", "PRIMARY", "FOREIGN", "UNIQUE", "CHECK"}
+# the keywords that start a column constraint, ending the data type of the column
+COLUMN_CONSTRAINTS = {"CONSTRAINT", "PRIMARY", "NOT", "NULL", "UNIQUE", "CHECK", "DEFAULT", "COLLATE", "REFERENCES",
+                      "GENERATED", "AS"}
+
+
+def read_schema(schema_file, use_mmap=False):
+    # read the tables of a sqlite database from its catalogue, and those of an sql schema from its text
+    if sqlite_introspection.is_sqlite_database(schema_file):
+        return sqlite_introspection.read_sqlite_database(schema_file)
+    return read_sql_file(schema_file, use_mmap)
+
+
+# the kinds of the parsed statements
+TABLE = "table"
+INDEX = "index"
+
+# the words that may follow the column name of an index column, anything else makes it an expression
+_INDEX_COLUMN_WORDS = {"ASC", "DESC", "COLLATE"}
+
+
+def read_sql_file(sql_file, use_mmap=False):
+    if use_mmap:
+        # jump over the data in a database dump without reading it
+        statements = sql_tokenizer.iter_mapped_schema_statements(sql_file)
+        tables_dict = build_tables_dict(parse_statement(statement) for statement in statements)
+    else:
+        with open(sql_file, 'r') as file:
+            tables_dict = read_sql(file)
+    # return our tables data as a dictionary
+    return tables_dict
+
+
+def read_sql(file):
+    # read the tables of an open sql schema, or of any other file object of sql text
+    # read the create table and create index statements from the file, a chunk at a time
+    statements = sql_tokenizer.iter_schema_statements(file)
+    return build_tables_dict(parse_statement(statement) for statement in statements)
+
+
+def build_tables_dict(parsed_statements):
+    """
+    Puts the tables dictionary of a schema together from its parsed statements.
+    Parameters:
+     parsed_statements - the results of parse_statement for the statements of the schema, in order
+    Returns:
+     a dictionary of the table names to dictionaries of their "columns", as (name, data type, qualifier) tuples, and
+     their "indexes", as (name, unique, column names, where clause) tuples, and their "foreign_keys", as (parent
+     table, column names, parent column names, on update, on delete) tuples
+    """
+    tables_dict = dict()
+    indexes = list()
+    for parsed in parsed_statements:
+        if parsed is None:
+            continue
+        kind, name, data = parsed
+        if kind == TABLE:
+            # copy the indexes, the parsed statements may be kept and used again
+            tables_dict[name] = {"columns": data["columns"], "indexes": list(data["indexes"]),
+                                 "foreign_keys": data["foreign_keys"]}
+        else:
+            indexes.append((name, data))
+    # an index may come before or after its table
+    for table_name, index in indexes:
+        if table_name in tables_dict:
+            tables_dict[table_name]["indexes"].append(index)
+    return tables_dict
+
+
+def parse_statement(statement):
+    # parse a create table statement into (TABLE, table name, table data), as in build_tables_dict, and a create index
+    # statement into (INDEX, table name, index), or None if there is nothing in it to generate code from
+    if sql_tokenizer.is_create_index(sql_tokenizer.leading_keywords(statement)):
+        index = parse_create_index(statement)
+        return None if index is None else (INDEX,) + index
+    table = parse_create_table(statement)
+    return None if table is None else (TABLE,) + table
+
+
+def parse_create_table(statement):
+    # get the table name and the table data, as in build_tables_dict, from a create table statement, with the indexes
+    # of its unique constraints
+    tokens = list(sql_tokenizer.tokenize(statement))
+    # the table name is the last name before the opening parentheses
+    index = 0
+    entity = None
+    while index < len(tokens) and tokens[index] != ("symbol", "("):
+        kind, value = tokens[index]
+        if kind == "word" and value.upper() == "AS":
+            # a table created from a select statement has no column definitions
+            return None
+        if kind in ("word", "identifier", "string"):
+            entity = sql_tokenizer.unquote(value)
+        index += 1
+    if entity is None or index == len(tokens):
+        return None
+    definitions, _ = sql_tokenizer.split_parenthesized(tokens, index)
+
+    columns = list()
+    primary_keys = list()
+    unique_keys = list()
+    foreign_keys = list()
+    for definition in definitions:
+        kind, value = definition[0]
+        if kind == "word" and value.upper() in TABLE_CONSTRAINTS:
+            # get the columns of a table level primary key, unique constraint or foreign key
+            words = [v.upper() for k, v in definition if k == "word"]
+            if "PRIMARY" in words or "UNIQUE" in words or "FOREIGN" in words:
+                if ("symbol", "(") not in definition:
+                    raise get_parse_error(entity, statement, "a key without a list of columns")
+                start = definition.index(("symbol", "("))
+                key_columns, end = sql_tokenizer.split_parenthesized(definition, start)
+                if not key_columns:
+                    raise get_parse_error(entity, statement, "a key without a list of columns")
+                key_names = [sql_tokenizer.unquote(key[0][1]) for key in key_columns]
+                if "FOREIGN" in words:
+                    foreign_keys.append(parse_references(definition, end, key_names, entity, statement))
+                elif "PRIMARY" in words:
+                    primary_keys.extend(key_names)
+                else:
+                    unique_keys.append(key_names)
+            continue
+        columns.append(parse_column_definition(definition))
+        words = [v.upper() for k, v in definition[1:] if k == "word"]
+        if "UNIQUE" in words:
+            unique_keys.append([columns[-1][0]])
+        if "REFERENCES" in words:
+            foreign_keys.append(parse_references(definition, 1, [columns[-1][0]], entity, statement))
+
+    if len(primary_keys) == 1:
+        # a single column primary key may also be declared after the columns
+        columns = [(name, data_type, "primary key" if name == primary_keys[0] else qualifier)
+                   for name, data_type, qualifier in columns]
+    # add a primary key field if not was defined for any column
+    if not primary_keys and "primary key" not in [qualifier for _, _, qualifier in columns]:
+        columns.append(("auto_incremented_id_field", "INTEGER", "primary key"))
+    # sqlite enforces a unique constraint with an index, which room has to be told to create
+    indexes = [(schema_model.get_index_name(entity, key_names), True, key_names, "") for key_names in unique_keys]
+    return entity, {"columns": columns, "indexes": indexes, "foreign_keys": foreign_keys}
+
+
+def parse_references(definition, start, column_names, entity=None, statement=""):
+    # get the (parent table, column names, parent column names, on update, on delete) of a foreign key from the
+    # tokens of a column definition or table constraint, from the REFERENCES clause on or after start. entity and
+    # statement are the table and the create table statement the key is of, for the error of a malformed clause
+    index = start
+    while index < len(definition) and not (definition[index][0] == "word"
+                                           and definition[index][1].upper() == "REFERENCES"):
+        index += 1
+    if index + 1 >= len(definition) or definition[index + 1][0] not in ("word", "identifier", "string"):
+        raise get_parse_error(entity, statement, "a foreign key without a parent table")
+    parent = sql_tokenizer.unquote(definition[index + 1][1])
+    index += 2
+    # the parent columns are left out of a key on the primary key of the parent
+    parent_column_names = list()
+    if index < len(definition) and definition[index] == ("symbol", "("):
+        parent_columns, index = sql_tokenizer.split_parenthesized(definition, index)
+        parent_column_names = [sql_tokenizer.unquote(column[0][1]) for column in parent_columns]
+    actions = {"UPDATE": "NO ACTION", "DELETE": "NO ACTION"}
+    words = [value.upper() for kind, value in definition[index:] if kind == "word"]
+    for position, word in enumerate(words):
+        event = words[position + 1] if position + 1 < len(words) else None
+        if word == "ON" and event in actions:
+            action = words[position + 2:position + 4]
+            # SET NULL, SET DEFAULT and NO ACTION are two words, CASCADE and RESTRICT one
+            actions[event] = " ".join(action if action[:1] in (["SET"], ["NO"]) else action[:1])
+    return parent, column_names, parent_column_names, actions["UPDATE"], actions["DELETE"]
+
+
+def get_parse_error(entity, statement, reason):
+    # the error of a create table statement that can not be parsed, naming the table and the statement
+    return ValueError("Unable to parse the table {}, {}: {}".format(entity, reason, statement.strip()))
+
+
+def parse_create_index(statement):
+    # get the table name and the (name, unique, column names, where clause) of an index from a create index
+    # statement, or None if it indexes expressions rather than columns
+    tokens = list(sql_tokenizer.tokenize(statement))
+    words = [value.upper() for kind, value in tokens if kind == "word"]
+    unique = words[1:2] == ["UNIQUE"]
+    # the index name is the last name before ON, and the table name the one after it
+    index = 0
+    index_name = None
+    while index < len(tokens) and not (tokens[index][0] == "word" and tokens[index][1].upper() == "ON"):
+        kind, value = tokens[index]
+        if kind in ("identifier", "string") or (kind == "word" and value.upper() not in (
+                "CREATE", "UNIQUE", "INDEX", "IF", "NOT", "EXISTS")):
+            index_name = sql_tokenizer.unquote(value)
+        index += 1
+    if index_name is None or index + 2 >= len(tokens) or tokens[index + 2] != ("symbol", "("):
+        return None
+    table_name = sql_tokenizer.unquote(tokens[index + 1][1])
+    column_definitions, index = sql_tokenizer.split_parenthesized(tokens, index + 2)
+
+    column_names = list()
+    for definition in column_definitions:
+        kind, value = definition[0]
+        if kind not in ("word", "identifier", "string") or \
+                any(k != "word" or v.upper() not in _INDEX_COLUMN_WORDS for k, v in definition[1:2]):
+            return None
+        column_names.append(sql_tokenizer.unquote(value))
+    # the where clause of a partial index
+    where = ""
+    if index < len(tokens) and tokens[index][0] == "word" and tokens[index][1].upper() == "WHERE":
+        where = sql_tokenizer.join_tokens(tokens[index + 1:])
+    return table_name, (index_name, unique, column_names, where)
+
+
+def parse_column_definition(definition):
+    # get the name, data type and qualifier of a column from the tokens of its definition
+    name = sql_tokenizer.unquote(definition[0][1])
+    # the data type is made up of the words before the first constraint, and their arguments if any
+    index = 1
+    while index < len(definition) and definition[index][0] == "word" \
+            and definition[index][1].upper() not in COLUMN_CONSTRAINTS:
+        index += 1
+    if index < len(definition) and index > 1 and definition[index] == ("symbol", "("):
+        _, index = sql_tokenizer.split_parenthesized(definition, index)
+    data_type = sql_tokenizer.join_tokens(definition[1:index])
+
+    # get the other column data
+    words = [value.upper() for kind, value in definition[index:] if kind == "word"]
+    pairs = list(zip(words, words[1:]))
+    if ("PRIMARY", "KEY") in pairs:
+        qualifier = "primary key"
+    elif ("NOT", "NULL") in pairs:
+        qualifier = "not null"
+    else:
+        qualifier = ""
+    return name, data_type, qualifier
+
+
+def read_tables(schema_file, use_mmap=False, use_cache=True, cache_dir=None, cache_size=schema_cache.DEFAULT_MAX_SIZE,
+                timings=None):
+    # read the tables of a schema file, or of a file object of sql text, from the cache of sql schemas unless it is not
+    # to be used
+    timings = timings or instrumentation.Timings()
+    if hasattr(schema_file, "read"):
+        with timings.stage("read schema"):
+            tables_dict = read_sql(schema_file)
+        with timings.stage("build tables"):
+            return schema_model.build_tables(tables_dict)
+    with timings.stage("read schema"):
+        # the catalogue of a sqlite database is read about as quickly as a cache entry, and hashing the database to
+        # look the entry up would read all of it
+        if use_cache and not sqlite_introspection.is_sqlite_database(schema_file):
+            tables_dict = schema_cache.read_cached(schema_file, lambda path: read_schema(path, use_mmap), cache_dir,
+                                                   cache_size)
+        else:
+            tables_dict = read_schema(schema_file, use_mmap)
+    timings.bytes_read += os.path.getsize(schema_file)
+    with timings.stage("build tables"):
+        return schema_model.build_tables(tables_dict)
@@ -0,0 +1,301 @@
+import mmap
+import os
+import re
+
+
+# A streaming tokenizer for sql(ite) scripts.
+# Statements are split on top level semicolons while taking string literals, quoted identifiers
+# and comments into account, and the input is consumed in chunks so that a schema file of any size
+# is handled in a single pass, holding at most one statement in memory at a time.
+
+# the number of characters to read from the input at a time
+CHUNK_SIZE = 1 << 16
+
+# a run of statement text up to, but not including, a top level semicolon.
+# every alternative starts with a different character, so the expression never backtracks
+_STATEMENT_BODY = re.compile(r'''(?:[^;'"`\[\-/]+|'[^']*'|"[^"]*"|`[^`]*`|\[[^\]]*\]'''
+                             r'''|--[^\n]*\n|/\*.*?\*/|-(?!-)|/(?!\*))*''', re.S)
+
+# the white space and comments between statements
+_SPACE = r'''(?:\s|--[^\n]*(?:\n|\Z)|/\*.*?(?:\*/|\Z))*'''
+
+# a run of whole statements that do not start with CREATE, such as the INSERT statements of a database dump.
+# the run is bounded so that the regular expression engine does not have to track millions of repetitions at a time,
+# and the body of each statement is matched in a lookahead, which is atomic, so that a statement with no terminating
+# semicolon fails in linear time instead of backtracking through every way of splitting its text
+_NON_DDL_RUN = re.compile(r'''(?:%s(?!create\b)[a-z_](?=(?P<body>%s))(?P=body);){0,1024}'''
+                          % (_SPACE, _STATEMENT_BODY.pattern), re.S | re.I)
+
+# a single token of sql text
+_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'[^']*(?:''[^']*)*'?)
+  | (?P<identifier>"[^"]*(?:""[^"]*)*"?|`[^`]*(?:``[^`]*)*`?|\[[^\]]*\]?)
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<word>[^\W\d][\w$]*)
+  | (?P<symbol>\|\||<<|>>|<=|>=|==|!=|<>|.)
+''', re.S | re.X)
+
+# a keyword, along with the white space and comments before it
+_KEYWORD = re.compile(_SPACE + r'([^\W\d]\w*)', re.S)
+
+# the byte string versions of the expressions, for reading memory mapped files without decoding them
+_STATEMENT_BODY_BYTES = re.compile(_STATEMENT_BODY.pattern.encode(), re.S)
+_NON_DDL_RUN_BYTES = re.compile(_NON_DDL_RUN.pattern.encode(), re.S | re.I)
+_KEYWORD_BYTES = re.compile(_SPACE.encode() + rb'([A-Za-z_]\w*)', re.S)
+_SPACE_BYTES = re.compile(_SPACE.encode(), re.S)
+
+# the keywords that open and close a block within a trigger body
+_BLOCK_OPENERS = {"BEGIN", "CASE"}
+_BLOCK_CLOSERS = {"END"}
+
+
+def tokenize(text):
+    """
+    Splits a piece of sql text into tokens, dropping white space and comments.
+    Parameters:
+     text - the sql text to tokenize
+    Returns:
+     a generator of (kind, value) tuples where kind is one of
+     string, identifier, number, word or symbol
+    """
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == "space" or kind == "comment":
+            continue
+        yield kind, match.group(kind)
+
+
+def unquote(identifier):
+    # remove the quotes around an sql identifier or string literal, if any
+    if len(identifier) > 1:
+        first, last = identifier[0], identifier[-1]
+        if first == "[" and last == "]":
+            return identifier[1:-1]
+        if first in "`'\"" and last == first:
+            return identifier[1:-1].replace(first * 2, first)
+    return identifier
+
+
+def leading_keywords(text, count=3):
+    # get the first few keywords of a statement, in upper case
+    keywords = list()
+    position = 0
+    while len(keywords) < count:
+        match = _KEYWORD.match(text, position)
+        if match is None:
+            break
+        keywords.append(match.group(1).upper())
+        position = match.end()
+    return keywords
+
+
+def is_create_table(keywords):
+    # CREATE [TEMP | TEMPORARY] TABLE, virtual tables have no column definitions of their own
+    if keywords[:1] != ["CREATE"]:
+        return False
+    if keywords[1:2] in (["TEMP"], ["TEMPORARY"]):
+        return keywords[2:3] == ["TABLE"]
+    return keywords[1:2] == ["TABLE"]
+
+
+def is_create_index(keywords):
+    # CREATE [UNIQUE] INDEX
+    return keywords[:1] == ["CREATE"] and "INDEX" in keywords[1:3]
+
+
+def is_create_table_or_index(keywords):
+    return is_create_table(keywords) or is_create_index(keywords)
+
+
+def _is_create_trigger(keywords):
+    return keywords[:1] == ["CREATE"] and "TRIGGER" in keywords[1:3]
+
+
+def _is_complete_trigger(text):
+    # the semicolons within the BEGIN ... END body of a trigger do not end the statement
+    depth = 0
+    opened = False
+    for kind, value in tokenize(text):
+        if kind != "word":
+            continue
+        value = value.upper()
+        if value in _BLOCK_OPENERS:
+            depth += 1
+            opened = True
+        elif value in _BLOCK_CLOSERS:
+            depth -= 1
+    return opened and depth <= 0
+
+
+def _find_statement_end(buffer, start):
+    # get the position of the semicolon that ends the statement starting at start, or -1 if the
+    # buffer does not yet hold the whole statement
+    end = _STATEMENT_BODY.match(buffer, start).end()
+    if end < len(buffer) and buffer[end] == ";":
+        return end
+    return -1
+
+
+def iter_statements(file, chunk_size=CHUNK_SIZE, keep=None):
+    """
+    Reads the sql statements from a file object in chunks.
+    Parameters:
+     file - a text file object to read the statements from
+     chunk_size - the number of characters to read at a time
+     keep - an optional function which is given the leading keywords of each statement and
+            returns whether or not the statement should be yielded
+    Returns:
+     a generator of the statements, without the terminating semicolon
+    """
+    buffer = ""
+    start = 0
+    eof = False
+    while True:
+        end = _find_statement_end(buffer, start)
+        while end != -1:
+            keywords = leading_keywords(buffer[start:end])
+            if _is_create_trigger(keywords) and not _is_complete_trigger(buffer[start:end]):
+                # the semicolon belongs to a statement within the trigger body, keep looking
+                end = _find_statement_end(buffer, end + 1)
+                continue
+            if keywords and (keep is None or keep(keywords)):
+                yield buffer[start:end].strip()
+            start = end + 1
+            end = _find_statement_end(buffer, start)
+        if eof:
+            break
+        # drop the statements we are done with and read some more of the file,
+        # growing the read size with the pending statement so that it is rescanned a bounded
+        # number of times, no matter how long it is
+        buffer = buffer[start:]
+        start = 0
+        chunk = file.read(max(chunk_size, len(buffer)))
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+    # the last statement need not be terminated by a semicolon
+    remainder = buffer[start:]
+    keywords = leading_keywords(remainder)
+    if keywords and (keep is None or keep(keywords)):
+        yield remainder.strip()
+
+
+def iter_create_table_statements(file, chunk_size=CHUNK_SIZE):
+    # get the CREATE TABLE statements from a file object
+    return iter_statements(file, chunk_size, keep=is_create_table)
+
+
+def iter_schema_statements(file, chunk_size=CHUNK_SIZE):
+    # get the CREATE TABLE and CREATE INDEX statements from a file object
+    return iter_statements(file, chunk_size, keep=is_create_table_or_index)
+
+
+def _mapped_leading_keywords(data, position, count=3):
+    # get the first few keywords of the statement starting at position in a memory mapped file
+    keywords = list()
+    while len(keywords) < count:
+        match = _KEYWORD_BYTES.match(data, position)
+        if match is None:
+            break
+        keywords.append(match.group(1).decode("ascii").upper())
+        position = match.end()
+    return keywords
+
+
+def iter_mapped_ddl_statements(sql_file, keep=None, encoding="utf-8"):
+    """
+    Reads the CREATE statements from a memory mapped file, jumping over all the other statements
+    without decoding or copying them. This is much faster than iter_statements for database dumps,
+    where almost all of the file is made up of INSERT statements.
+    Parameters:
+     sql_file - the path of the file to read the statements from
+     keep - an optional function which is given the leading keywords of each statement and
+            returns whether or not the statement should be yielded
+     encoding - the text encoding of the file
+    Returns:
+     a generator of the CREATE statements, without the terminating semicolon
+    """
+    with open(sql_file, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while position < size:
+                # skip the runs of statements we have no use for
+                end = _NON_DDL_RUN_BYTES.match(data, position).end()
+                if end != position:
+                    position = end
+                    continue
+                keywords = _mapped_leading_keywords(data, position)
+                if not keywords:
+                    if _SPACE_BYTES.match(data, position).end() >= size:
+                        # only white space and comments are left
+                        break
+                    # an empty statement, or one that does not start with a keyword
+                    position = _STATEMENT_BODY_BYTES.match(data, position).end() + 1
+                    continue
+                end = _STATEMENT_BODY_BYTES.match(data, position).end()
+                if _is_create_trigger(keywords):
+                    # the semicolons within the body of a trigger do not end the statement
+                    while end < size and not _is_complete_trigger(data[position:end].decode(encoding)):
+                        end = _STATEMENT_BODY_BYTES.match(data, end + 1).end()
+                if data[end:end + 1] != b";":
+                    # a statement that is not terminated by a semicolon runs to the end of the file
+                    end = size
+                if keep is None or keep(keywords):
+                    yield data[position:end].decode(encoding).strip()
+                position = end + 1
+
+
+def iter_mapped_create_table_statements(sql_file, encoding="utf-8"):
+    # get the CREATE TABLE statements from a memory mapped file
+    return iter_mapped_ddl_statements(sql_file, keep=is_create_table, encoding=encoding)
+
+
+def iter_mapped_schema_statements(sql_file, encoding="utf-8"):
+    # get the CREATE TABLE and CREATE INDEX statements from a memory mapped file
+    return iter_mapped_ddl_statements(sql_file, keep=is_create_table_or_index, encoding=encoding)
+
+
+def split_parenthesized(tokens, start):
+    """
+    Splits the tokens within a pair of parentheses on the top level commas.
+    Parameters:
+     tokens - a list of (kind, value) tokens
+     start - the index of the opening parenthesis
+    Returns:
+     a list of the token lists between the commas and the index after the closing parenthesis
+    """
+    groups = [[]]
+    depth = 0
+    index = start + 1
+    while index < len(tokens):
+        token = tokens[index]
+        index += 1
+        if token == ("symbol", "("):
+            depth += 1
+        elif token == ("symbol", ")"):
+            if depth == 0:
+                break
+            depth -= 1
+        elif token == ("symbol", ",") and depth == 0:
+            groups.append([])
+            continue
+        groups[-1].append(token)
+    return [group for group in groups if group], index
+
+
+def join_tokens(tokens):
+    # put a list of tokens back together as sql text
+    text = ""
+    previous = None
+    for kind, value in tokens:
+        if previous is not None and previous not in ("(", ".") and value not in (")", ",", ".", "("):
+            text += " "
+        text += value
+        previous = value
+    return text
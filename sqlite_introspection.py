@@ -0,0 +1,129 @@
+import os
+import sqlite3
+from urllib.parse import quote
+
+import schema_model
+import sql_tokenizer
+
+
+# Reads the tables of a binary sqlite database straight from its catalogue,
+# instead of parsing the sql text that created them.
+
+# the first bytes of every sqlite 3 database file
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+def is_sqlite_database(path):
+    # check the file header to see if a file is a sqlite database rather than an sql script
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def connect(path):
+    # open the database read only, and immutable so that sqlite neither locks nor copies anything
+    uri = "file:{}?mode=ro&immutable=1".format(quote(os.path.abspath(path)))
+    return sqlite3.connect(uri, uri=True)
+
+
+def quote_identifier(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def read_sqlite_database(database_file):
+    """
+    Reads the tables of a sqlite database from sqlite_master, PRAGMA table_info, PRAGMA index_list and
+    PRAGMA foreign_key_list.
+    Parameters:
+     database_file - the path of the sqlite database
+    Returns:
+     a dictionary of the table names to dictionaries of the (name, data type, qualifier) tuples of their "columns",
+     the (name, unique, column names, where clause) tuples of their "indexes" and the (parent table, column names,
+     parent column names, on update, on delete) tuples of their "foreign_keys", just as read_sql_file returns for an
+     sql schema
+    """
+    tables_dict = dict()
+    connection = connect(database_file)
+    try:
+        tables = connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+        ).fetchall()
+        for table_name, sql in tables:
+            # virtual tables have no column definitions of their own
+            if sql is None or sql.lstrip().upper().startswith("CREATE VIRTUAL"):
+                continue
+            tables_dict[table_name] = {"columns": read_columns(connection, table_name),
+                                       "indexes": read_indexes(connection, table_name),
+                                       "foreign_keys": read_foreign_keys(connection, table_name)}
+    finally:
+        connection.close()
+    return tables_dict
+
+
+def read_columns(connection, table_name):
+    columns = connection.execute("PRAGMA table_info({})".format(quote_identifier(table_name))).fetchall()
+    # the pk field is the position of the column in the primary key, or 0 if it is not part of it
+    primary_keys = [name for _, name, _, _, _, pk in columns if pk]
+    columns_data = list()
+    for _, name, data_type, not_null, _, pk in columns:
+        if pk and len(primary_keys) == 1:
+            qualifier = "primary key"
+        elif not_null:
+            qualifier = "not null"
+        else:
+            qualifier = ""
+        columns_data.append((name, data_type, qualifier))
+    # add a primary key field if not was defined for any column
+    if not primary_keys:
+        columns_data.append(("auto_incremented_id_field", "INTEGER", "primary key"))
+    return columns_data
+
+
+def read_indexes(connection, table_name):
+    indexes = list()
+    for _, name, unique, origin, partial in connection.execute(
+            "PRAGMA index_list({})".format(quote_identifier(table_name))).fetchall():
+        # the index of the primary key is the table itself as far as room is concerned
+        if origin == "pk":
+            continue
+        column_names = [column_name for _, _, column_name in connection.execute(
+            "PRAGMA index_info({})".format(quote_identifier(name))).fetchall()]
+        # the column name is null for an expression
+        if None in column_names:
+            continue
+        where = ""
+        if partial:
+            sql = connection.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+                                     (name,)).fetchone()[0]
+            where = get_where_clause(sql)
+        if origin == "u":
+            # the indexes of unique constraints are named by sqlite, rather than by the schema
+            name = schema_model.get_index_name(table_name, column_names)
+        indexes.append((name, bool(unique), column_names, where))
+    # index_list lists the most recently created indexes first
+    indexes.reverse()
+    # a prepackaged database has an index of the same name for each unique constraint, see database_asset
+    names = [name for name, _, _, _ in indexes]
+    return [index for position, index in enumerate(indexes) if index[0] not in names[:position]]
+
+
+def read_foreign_keys(connection, table_name):
+    foreign_keys = dict()
+    for key_id, _, parent, column_name, parent_column_name, on_update, on_delete, _ in connection.execute(
+            "PRAGMA foreign_key_list({})".format(quote_identifier(table_name))).fetchall():
+        foreign_key = foreign_keys.setdefault(key_id, (parent, list(), list(), on_update, on_delete))
+        foreign_key[1].append(column_name)
+        # the parent column is null for a key on the primary key of the parent, which is left out of the schema too
+        if parent_column_name is not None:
+            foreign_key[2].append(parent_column_name)
+    # foreign_key_list lists the last declared keys first
+    return [foreign_keys[key_id] for key_id in sorted(foreign_keys, reverse=True)]
+
+
+def get_where_clause(sql):
+    # get the where clause of the create index statement of a partial index
+    tokens = list(sql_tokenizer.tokenize(sql))
+    _, index = sql_tokenizer.split_parenthesized(tokens, tokens.index(("symbol", "(")))
+    return sql_tokenizer.join_tokens(tokens[index + 1:])
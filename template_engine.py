@@ -0,0 +1,130 @@
+import os
+import re
+import datetime
+
+
+# The templates of the generated files.
+# A template is plain text with ${name} placeholders. It is split into its literal text and placeholder names once,
+# when it is first used, and rendered by joining the literal text with the values, so rendering a file costs no more
+# than the size of the file.
+# The default templates are in the templates directory next to this file, and any of them may be overridden by a
+# file of the same name in a user's template directory.
+
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# the template names of the generated artifacts
+ENTITY = "entity.java"
+PROJECTION = "projection.java"
+DAO = "dao.java"
+REPOSITORY = "repository.java"
+EXECUTOR_REPOSITORY = "repository_executor.java"
+DATABASE_EXECUTORS = "database_executors.java"
+CONVERTERS = "converters.java"
+BASE_REPOSITORY = "base_repository.java"
+DATABASE = "database.java"
+DATA_ACCESS_LISTENER = "data_access_listener.java"
+DART_ENTITY = "entity.dart"
+
+# the template names of the methods added to the data access objects and repositories, some of which are rendered once
+# for each key or projection of a table
+DAO_PAGE_QUERY = "dao_page_query.java"
+DAO_PAGE_AFTER_QUERY = "dao_page_after_query.java"
+DAO_PAGING_SOURCE_QUERY = "dao_paging_source_query.java"
+REPOSITORY_PAGE_METHOD = "repository_page_method.java"
+REPOSITORY_PAGE_AFTER_METHOD = "repository_page_after_method.java"
+REPOSITORY_PAGING_SOURCE_METHOD = "repository_paging_source_method.java"
+DAO_KEY_QUERIES = "dao_key_queries.java"
+REPOSITORY_KEY_METHODS = "repository_key_methods.java"
+DAO_PROJECTION_QUERIES = "dao_projection_queries.java"
+REPOSITORY_PROJECTION_METHODS = "repository_projection_methods.java"
+DAO_OBSERVE_ALL_QUERY = "dao_observe_all_query.java"
+DAO_OBSERVE_KEY_QUERY = "dao_observe_key_query.java"
+DAO_OBSERVE_PROJECTION_QUERY = "dao_observe_projection_query.java"
+REPOSITORY_OBSERVE_ALL_METHOD = "repository_observe_all_method.java"
+REPOSITORY_OBSERVE_KEY_METHOD = "repository_observe_key_method.java"
+REPOSITORY_OBSERVE_PROJECTION_METHOD = "repository_observe_projection_method.java"
+# the equals and hashCode methods of the entities and projections
+EQUALS = "equals.java"
+
+_PLACEHOLDER = re.compile(r'\$\{(\w+)\}')
+
+# the user's template directory, if any, and the templates compiled so far
+_template_dir = None
+_templates = dict()
+
+
+class Template:
+    """
+    A compiled template.
+    Attributes:
+     name - the name of the template
+     parts - the literal text of the template, alternating with the names of its placeholders
+    """
+    __slots__ = ("name", "parts")
+
+    def __init__(self, name, text):
+        self.name = name
+        self.parts = _PLACEHOLDER.split(text)
+
+    def render(self, **values):
+        # fill the placeholders in with the values, and join the result in a single pass
+        parts = list(self.parts)
+        try:
+            parts[1::2] = [str(values[name]) for name in self.parts[1::2]]
+        except KeyError as exc:
+            raise KeyError("No value for the placeholder ${{{}}} of the {} template".format(exc.args[0], self.name))
+        return "".join(parts)
+
+
+def use_template_dir(template_dir):
+    # override the default templates with those in template_dir, or go back to the defaults if it is None
+    global _template_dir
+    if template_dir != _template_dir:
+        _template_dir = template_dir
+        _templates.clear()
+
+
+def get_template_dir():
+    return _template_dir
+
+
+def get_template(name):
+    # get a compiled template, compiling it the first time it is asked for
+    template = _templates.get(name)
+    if template is None:
+        filename = os.path.join(DEFAULT_TEMPLATE_DIR, name)
+        if _template_dir is not None and os.path.exists(os.path.join(_template_dir, name)):
+            filename = os.path.join(_template_dir, name)
+        # keep the line endings of the template as they are
+        with open(filename, 'r', newline='') as template_file:
+            template = Template(name, template_file.read())
+        _templates[name] = template
+    return template
+
+
+def render(name, **values):
+    return get_template(name).render(**values)
+
+
+def render_methods(methods):
+    """
+    Renders the methods added to a class, each after a blank line.
+    Parameters:
+     methods - a list of (template name, values) tuples, one for each method, or few methods, to render
+    Returns:
+     the methods, without the newline the template files end with, so that they end where the class goes on
+    """
+    return "".join("\n\n" + render(name, **values).rstrip("\r\n") for name, values in methods)
+
+
+def get_creation_note(deterministic=False):
+    # stamp the generated files with the time they were created on, unless their content should only depend on the
+    # schema, so that regenerating an unchanged schema leaves every file as it is
+    if deterministic:
+        return "Generated from the database schema"
+    return "Created on {}".format(datetime.datetime.now())
+
+
+def clean(txt):
+    # remove the quotes around a name from the schema, for the class names of the generated files
+    return txt.strip("`").strip("'").strip('"')
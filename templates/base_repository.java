@@ -0,0 +1,41 @@
+
+package ${package_name}.repository;
+
+import androidx.annotation.Nullable;
+
+import ${package_name}.data.DataAccessListener;
+
+/**
+ * ${creation_note}
+ */
+public class BaseRepository {
+    /**
+     * A parameter for checking whether there is an observer waiting for the result for a data request or not
+     */
+    boolean hasPendingDataRequest = false;
+    /**
+     * A listener for reporting changes during data access
+     */
+    DataAccessListener mDataAccessListener = null;
+
+    /**
+     * A method to get the current data access listener for the class
+     *
+     * @return the {@link DataAccessListener} for the class
+     */
+    @Nullable
+    public DataAccessListener getDataAccessListener() {
+        return mDataAccessListener;
+    }
+
+    /**
+     * A method to set the data access listener for the class
+     *
+     * @param listener the data access listener
+     */
+    public void setDataAccessListener(@Nullable DataAccessListener listener) {
+        this.mDataAccessListener = listener;
+    }
+}
+
+    
\ No newline at end of file
@@ -0,0 +1,33 @@
+package ${package_name}.data;
+
+import androidx.room.TypeConverter;
+
+import java.util.Date;
+
+/**
+ * ${creation_note}
+ */
+public class Converters {
+    /**
+     * A method to read a date from the database
+     *
+     * @param value the milliseconds since the epoch, as stored in the database
+     * @return the date, or null if there is none
+     */
+    @TypeConverter
+    public static Date fromTimestamp(Long value) {
+        return value == null ? null : new Date(value);
+    }
+
+    /**
+     * A method to store a date in the database
+     *
+     * @param date the date
+     * @return the milliseconds since the epoch, or null if there is no date
+     */
+    @TypeConverter
+    public static Long toTimestamp(Date date) {
+        return date == null ? null : date.getTime();
+    }
+}
+
@@ -0,0 +1,87 @@
+
+package ${package_name}.data.dao;
+
+${live_data_import}${paging_import}import androidx.room.Dao;
+import androidx.room.Insert;
+import androidx.room.OnConflictStrategy;
+import androidx.room.Query;
+
+import ${package_name}.data.entity.${class_name};
+${projection_imports}
+import java.util.ArrayList;
+import java.util.List;
+
+/**
+ * ${creation_note}.
+ */
+@Dao
+public interface ${class_name}Dao {
+    /**
+     * insert a singular item
+     */
+    @Insert(onConflict = OnConflictStrategy.REPLACE)
+    public void insert(${class_name} item);
+
+    /**
+     * insert multiple items
+     */
+    @Insert(onConflict = OnConflictStrategy.REPLACE)
+    public void insertAll(${class_name}... items);
+
+    /**
+     * insert a chunk of items, in a single transaction
+     */
+    @Insert(onConflict = OnConflictStrategy.REPLACE)
+    public void insertChunk(List<${class_name}> items);
+
+    /**
+     * insert items a chunk at a time, each chunk in a transaction of its own, so that a large import neither holds
+     * the database in one long transaction nor needs all of its items in an array
+     *
+     * @param items     the items to insert, which are only read once
+     * @param chunkSize the number of items to insert in each transaction
+     * @param listener  told the number of items inserted after each chunk, or null
+     * @return the number of items inserted
+     */
+    default int insertInChunks(Iterable<${class_name}> items, int chunkSize, ProgressListener listener) {
+        List<${class_name}> chunk = new ArrayList<>(chunkSize);
+        int inserted = 0;
+        for (${class_name} item : items) {
+            chunk.add(item);
+            if (chunk.size() == chunkSize) {
+                insertChunk(chunk);
+                inserted += chunk.size();
+                chunk.clear();
+                if (listener != null)
+                    listener.onProgress(inserted);
+            }
+        }
+        if (!chunk.isEmpty()) {
+            insertChunk(chunk);
+            inserted += chunk.size();
+            if (listener != null)
+                listener.onProgress(inserted);
+        }
+        return inserted;
+    }
+
+    /**
+     * delete all rows
+     */
+    @Query("DELETE FROM ${table_name}")
+    public void deleteAll();
+
+    /**
+     * @return all rows
+     */
+    @Query("SELECT * FROM ${table_name}")
+    List<${class_name}> getAll();${key_queries}${page_queries}${projection_queries}${observable_queries}
+
+    /**
+     * A listener for the progress of insertInChunks
+     */
+    interface ProgressListener {
+        void onProgress(int inserted);
+    }
+}
+    
\ No newline at end of file
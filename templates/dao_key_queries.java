@@ -0,0 +1,29 @@
+    /**
+     * @param ${java_name} the ${column_name} of the row
+     * @return the row with the ${column_name}, or null if there is none
+     */
+    @Query("SELECT * FROM ${table_name} WHERE `${column_name}` = :${java_name} LIMIT 1")
+    ${class_name} getBy${accessor_name}(${java_type} ${java_name});
+
+    /**
+     * @param ${java_name}s the ${column_name}s of the rows, at most 999 as that is as many as sqlite binds
+     * @return the rows with the ${column_name}s, in no particular order
+     */
+    @Query("SELECT * FROM ${table_name} WHERE `${column_name}` IN (:${java_name}s)")
+    List<${class_name}> getBy${accessor_name}s(List<${boxed_type}> ${java_name}s);
+
+    /**
+     * @param ${java_name} the ${column_name} of the row
+     * @return whether or not there is a row with the ${column_name}
+     */
+    @Query("SELECT EXISTS(SELECT 1 FROM ${table_name} WHERE `${column_name}` = :${java_name})")
+    boolean existsBy${accessor_name}(${java_type} ${java_name});
+
+    /**
+     * delete the rows with some ${column_name}s
+     *
+     * @param ${java_name}s the ${column_name}s of the rows, at most 999 as that is as many as sqlite binds
+     * @return the number of rows deleted
+     */
+    @Query("DELETE FROM ${table_name} WHERE `${column_name}` IN (:${java_name}s)")
+    int deleteBy${accessor_name}s(List<${boxed_type}> ${java_name}s);
@@ -0,0 +1,5 @@
+    /**
+     * @return all rows, queried again whenever the table changes
+     */
+    @Query("SELECT * FROM ${table_name}")
+    LiveData<List<${class_name}>> observeAll();
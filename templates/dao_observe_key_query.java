@@ -0,0 +1,6 @@
+    /**
+     * @param ${java_name} the ${column_name} of the row
+     * @return the row with the ${column_name}, or null if there is none, queried again whenever the table changes
+     */
+    @Query("SELECT * FROM ${table_name} WHERE `${column_name}` = :${java_name} LIMIT 1")
+    LiveData<${class_name}> observeBy${accessor_name}(${java_type} ${java_name});
@@ -0,0 +1,5 @@
+    /**
+     * @return the ${column_names} of all rows, queried again whenever the table changes
+     */
+    @Query("SELECT ${column_list} FROM ${table_name}")
+    LiveData<List<${projection_class_name}>> observe${projection_class_name}List();
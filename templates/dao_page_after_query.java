@@ -0,0 +1,7 @@
+    /**
+     * @param ${java_name} the ${column_name} of the last row of the previous page
+     * @param limit the largest number of rows to return
+     * @return the page of rows after ${java_name}, in the order of ${column_name}
+     */
+    @Query("SELECT * FROM ${table_name} WHERE `${column_name}` > :${java_name} ORDER BY `${column_name}` LIMIT :limit")
+    List<${class_name}> getPageAfter${accessor_name}(${java_type} ${java_name}, int limit);
@@ -0,0 +1,7 @@
+    /**
+     * @param limit  the largest number of rows to return
+     * @param offset the number of rows to skip
+     * @return a page of rows, in the order of ${order_column}
+     */
+    @Query("SELECT * FROM ${table_name} ORDER BY `${order_column}` LIMIT :limit OFFSET :offset")
+    List<${class_name}> getPage(int limit, int offset);
@@ -0,0 +1,5 @@
+    /**
+     * @return a source of the pages of rows for the Paging library, in the order of ${order_column}
+     */
+    @Query("SELECT * FROM ${table_name} ORDER BY `${order_column}`")
+    PagingSource<Integer, ${class_name}> getPagingSource();
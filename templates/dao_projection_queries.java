@@ -0,0 +1,13 @@
+    /**
+     * @return the ${column_names} of all rows, without reading the other columns
+     */
+    @Query("SELECT ${column_list} FROM ${table_name}")
+    List<${projection_class_name}> get${projection_class_name}List();
+
+    /**
+     * @param limit  the largest number of rows to return
+     * @param offset the number of rows to skip
+     * @return a page of the ${column_names} of the rows, in the order of ${order_column}
+     */
+    @Query("SELECT ${column_list} FROM ${table_name} ORDER BY `${order_column}` LIMIT :limit OFFSET :offset")
+    List<${projection_class_name}> get${projection_class_name}Page(int limit, int offset);
@@ -0,0 +1,46 @@
+
+package ${package_name}.data;
+
+/**
+ * ${creation_note}
+ */
+public interface DataAccessListener {
+    /**
+     * A method to return results after a data query transaction is completed
+     *
+     * @param results the results returned
+     */
+    public void onDataLoaded(Object[] results);
+
+    /**
+     * A method to notify observers when data save has completed
+     */
+    public void onDataSaved();
+
+    /**
+     * A method to notify observers when data save has completed
+     *
+     * @param requestCode the request that initiated this action
+     */
+    default void onDataSaved(int requestCode) {
+    }
+
+    /**
+     * A method to notify observers of the progress of an import
+     *
+     * @param requestCode the request that initiated this action
+     * @param saved       the number of items saved so far
+     */
+    default void onDataSaveProgress(int requestCode, int saved) {
+    }
+
+    /**
+     * A method to return results after a data query transaction is completed
+     *
+     * @param requestCode the code to use to differentiate results
+     * @param results     the results returned
+     */
+    public void onDataRequestCompleted(int requestCode, Object[] results);
+}
+
+    
\ No newline at end of file
@@ -0,0 +1,60 @@
+
+package ${package_name}.data;
+
+import android.content.Context;
+
+import androidx.annotation.NonNull;
+import androidx.room.Database;
+import androidx.room.Room;
+import androidx.room.RoomDatabase;
+${type_converters_import}import androidx.sqlite.db.SupportSQLiteDatabase;
+
+import ${package_name}.BuildConfig;
+import ${package_name}.data.dao.*;
+import ${package_name}.data.entity.*;
+
+/**
+ * ${creation_note}.
+ */
+${type_converters}@Database(entities = {${entities_list}}, version = ${version})
+public abstract class ${database_class_name} extends RoomDatabase {
+    /**
+     * The database file name
+     */
+    public static final String DATABASE_NAME = "${database_name}";
+
+    ${dao_declarations}
+
+    // make the database a singleton
+    private static volatile ${database_class_name} INSTANCE;
+
+    public static ${database_class_name} getDatabase(final Context context) {
+        if (INSTANCE == null) {
+            synchronized (${database_class_name}.class) {
+                if (INSTANCE == null) {
+                    // Create database here
+                    // In debug build, do not use Write Ahead Logging, so that we can view the sqlite file directly
+                    if (!BuildConfig.DEBUG)
+                        INSTANCE = Room.databaseBuilder(context.getApplicationContext(),
+                                ${database_class_name}.class, DATABASE_NAME)
+                                .addCallback(sRoomDatabaseCallback)${release_builder_options}
+                                .build();
+                    else INSTANCE = Room.databaseBuilder(context.getApplicationContext(),
+                            ${database_class_name}.class, DATABASE_NAME)
+                            .addCallback(sRoomDatabaseCallback)${debug_builder_options}.setJournalMode(JournalMode.TRUNCATE).build();
+                }
+            }
+        }
+        return INSTANCE;
+    }
+
+    private static RoomDatabase.Callback sRoomDatabaseCallback =
+            new RoomDatabase.Callback() {
+
+                @Override
+                public void onOpen(@NonNull SupportSQLiteDatabase db) {
+                    super.onOpen(db);
+                }
+            };
+}
+    
\ No newline at end of file
@@ -0,0 +1,88 @@
+package ${package_name}.data;
+
+import android.os.Handler;
+import android.os.Looper;
+
+import java.util.concurrent.Executor;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * ${creation_note}
+ */
+public class DatabaseExecutors {
+    /**
+     * The number of threads to run queries on, a few at most since sqlite only reads so much in parallel
+     */
+    private static final int READER_THREADS = Math.max(2, Math.min(4, Runtime.getRuntime().availableProcessors()));
+
+    private static volatile DatabaseExecutors INSTANCE;
+
+    private final ExecutorService reader;
+    private final ExecutorService writer;
+    private final Executor mainThread;
+
+    private DatabaseExecutors() {
+        reader = Executors.newFixedThreadPool(READER_THREADS, new NamedThreadFactory("database-reader"));
+        writer = Executors.newSingleThreadExecutor(new NamedThreadFactory("database-writer"));
+        Handler handler = new Handler(Looper.getMainLooper());
+        mainThread = handler::post;
+    }
+
+    public static DatabaseExecutors getInstance() {
+        if (INSTANCE == null) {
+            synchronized (DatabaseExecutors.class) {
+                if (INSTANCE == null)
+                    INSTANCE = new DatabaseExecutors();
+            }
+        }
+        return INSTANCE;
+    }
+
+    /**
+     * The executor shared by the queries of every repository
+     *
+     * @return a bounded pool of background threads
+     */
+    public ExecutorService reader() {
+        return reader;
+    }
+
+    /**
+     * The executor shared by the writes of every repository, which runs them one at a time in the order they are made
+     *
+     * @return a single background thread
+     */
+    public ExecutorService writer() {
+        return writer;
+    }
+
+    /**
+     * The executor that hands results back to the listeners, as AsyncTask did
+     *
+     * @return an executor of the main thread
+     */
+    public Executor mainThread() {
+        return mainThread;
+    }
+
+    /**
+     * A thread factory which names its threads, so that they can be told apart when debugging
+     */
+    private static class NamedThreadFactory implements ThreadFactory {
+        private final String name;
+        private final AtomicInteger count = new AtomicInteger();
+
+        NamedThreadFactory(String name) {
+            this.name = name;
+        }
+
+        @Override
+        public Thread newThread(Runnable runnable) {
+            return new Thread(runnable, name + "-" + count.incrementAndGet());
+        }
+    }
+}
+
@@ -0,0 +1,17 @@
+
+import 'package:built_value/built_value.dart';
+import 'package:built_value/serializer.dart';
+
+part '${file_name}.g.dart';
+
+//
+// ${creation_note}.
+//
+abstract class ${class_name} implements Built<${class_name}, ${class_name}Builder> {
+    ${class_field_declarations}
+
+    ${class_name}._();
+    static Serializer<${class_name}> get serializer => _$${serializer_name}Serializer;
+    factory ${class_name}([updates(${class_name}Builder b)]) = _$${class_name};
+}
+    
\ No newline at end of file
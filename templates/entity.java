@@ -0,0 +1,30 @@
+
+package ${package_name}.data.entity;
+
+import androidx.room.ColumnInfo;
+import androidx.room.Entity;
+import androidx.room.Ignore;
+import androidx.room.Index;
+import androidx.annotation.NonNull;
+import androidx.room.PrimaryKey;
+${equals_imports}
+import static ${package_name}.data.entity.${class_name}.TABLE_NAME;
+
+/**
+ * ${creation_note}.
+ */
+@Entity(tableName = TABLE_NAME${entity_indices})
+public class ${class_name} {
+    /**
+     * The table name
+     */
+    @Ignore
+    public static final String TABLE_NAME = "${table_name}";
+
+    ${class_field_declarations}
+
+    ${class_constructor}
+
+    ${class_getters_n_setters}
+}
+    
\ No newline at end of file
@@ -0,0 +1,14 @@
+@Override
+public boolean equals(Object object) {
+if (this == object)
+return true;
+if (object == null || getClass() != object.getClass())
+return false;
+${class_name} other = (${class_name}) object;
+return ${comparison};
+}
+
+@Override
+public int hashCode() {
+return Objects.hash(${hashes});
+}
@@ -0,0 +1,16 @@
+
+package ${package_name}.data.entity;
+
+import androidx.room.ColumnInfo;
+import androidx.annotation.NonNull;
+${equals_imports}
+/**
+ * ${creation_note}.
+ * Some of the columns of ${table_name}, for the queries that do not need the rest of them.
+ */
+public class ${class_name} {
+    ${class_field_declarations}
+
+    ${class_getters_n_setters}
+}
+
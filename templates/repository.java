@@ -0,0 +1,240 @@
+
+package ${package_name}.data.repository;
+
+import android.content.Context;
+import android.os.AsyncTask;
+
+${live_data_import}${paging_import}
+import ${package_name}.data.DataAccessListener;
+import ${package_name}.data.${database_class_name};
+import ${package_name}.data.dao.${entity_name}Dao;
+import ${package_name}.data.entity.${entity_name};
+${projection_imports}
+import java.util.Collections;
+import java.util.List;
+
+/**
+ * ${creation_note}.
+ */
+public class ${entity_name}Repository extends BaseRepository {
+    /**
+     * The number of entities imported in each transaction
+     */
+    private static final int IMPORT_CHUNK_SIZE = 500;
+
+    private ${database_class_name} db;
+    private static ${entity_name}Repository thisInstance;
+    
+    /**
+     * A method to initialise the class and load the relevant data from the data streams provided
+     *
+     * @param context a {@link Context} instance to interact with the data
+     */
+    private ${entity_name}Repository(Context context) {
+        db = ${database_class_name}.getDatabase(context);
+    }
+
+    public static synchronized ${entity_name}Repository getInstance(Context context) {
+        if (thisInstance == null)
+            thisInstance = new ${entity_name}Repository(context);
+        return thisInstance;
+    }
+
+    /**
+     * Asynchronously insert a  entity into our local database
+     *
+     * @param entity the entity to insert
+     */
+    public void insert(${entity_name} entity) {
+        save(entity);
+    }
+
+    /**
+     * Asynchronously insert a list of entities into our local database
+     *
+     * @param entity the entity to insert
+     */
+    public void insert(${entity_name}[] entity) {
+        save(entity);
+    }
+
+    public void save${entity_name}s(List<${entity_name}> entities) {
+        if (entities != null) {
+            ${entity_name}[] items = new ${entity_name}[entities.size()];
+            items = entities.toArray(items);
+            save(items);
+        }
+    }
+
+    /**
+     * Asynchronously import any number of entities into our local database, a chunk at a time, reporting the
+     * progress to the listener with onDataSaveProgress and the end of the import with onDataSaved
+     *
+     * @param entities    the entities to import, which are read in the background and never copied into an array
+     * @param requestCode the code to report the import with, or 0 to report its end with onDataSaved()
+     */
+    public void import${entity_name}s(Iterable<${entity_name}> entities, int requestCode) {
+        new Import${entity_name}sAsync(db, entities, mDataAccessListener, requestCode).execute();
+    }
+
+    /**
+     * A method to get the list of {@link ${entity_name}}s in our database and notify listeners when the data is available.
+     */
+    public void load${entity_name}s() {
+        load(() -> db.${mod_class_name}Dao().getAll(), 0);
+    }${key_methods}${page_methods}${projection_methods}${observable_methods}
+
+    /**
+     * A query for {@link ${entity_name}}s, or for projections of them, to run in the background
+     */
+    private interface Query<T> {
+        List<T> run();
+    }
+
+    /**
+     * Saves entities in the background
+     *
+     * @param entities the entities to save
+     */
+    private void save(${entity_name}... entities) {
+        new Save${entity_name}sAsync(db).execute(entities);
+    }
+
+    /**
+     * Runs a write in the background, after the writes made before it
+     *
+     * @param write the write to run
+     */
+    private void write(Runnable write) {
+        AsyncTask.execute(write);
+    }
+
+    /**
+     * Runs a query for {@link ${entity_name}}s in the background and returns them to the listener
+     *
+     * @param query       the query to run
+     * @param requestCode the code to return the results with, or 0 to return them with onDataLoaded
+     */
+    private void load(Query<${entity_name}> query, int requestCode) {
+        load(query, new ${entity_name}[0], requestCode);
+    }
+
+    /**
+     * Runs a query in the background and returns its results to the listener
+     *
+     * @param query       the query to run
+     * @param empty       an empty array of the type of the results
+     * @param requestCode the code to return the results with, or 0 to return them with onDataLoaded
+     */
+    private <T> void load(Query<T> query, T[] empty, int requestCode) {
+        new GetAsync<>(query, empty, mDataAccessListener, requestCode).execute();
+    }
+
+    /**
+     * An {@link AsyncTask} class for saving entity data
+     */
+    private static class Save${entity_name}sAsync extends AsyncTask<${entity_name}, Integer, Integer> {
+        private final ${entity_name}Dao m${entity_name}Dao;
+
+        Save${entity_name}sAsync(${database_class_name} db) {
+            m${entity_name}Dao = db.${mod_class_name}Dao();
+        }
+
+        @Override
+        protected Integer doInBackground(final ${entity_name}... params) {
+            m${entity_name}Dao.insertAll(params);
+            return 0;
+        }
+
+        @Override
+        protected void onProgressUpdate(Integer... values) {
+            super.onProgressUpdate(values);
+        }
+
+        @Override
+        protected void onPostExecute(Integer integer) {
+            super.onPostExecute(integer);
+        }
+    }
+
+    /**
+     * An {@link AsyncTask} class for importing entities a chunk at a time
+     */
+    private static class Import${entity_name}sAsync extends AsyncTask<Void, Integer, Integer> {
+        private final ${entity_name}Dao m${entity_name}Dao;
+        private final Iterable<${entity_name}> mEntities;
+        private DataAccessListener mDataAccessListener;
+        private int requestCode;
+
+        Import${entity_name}sAsync(${database_class_name} db, Iterable<${entity_name}> entities,
+                DataAccessListener listener, int requestCode) {
+            m${entity_name}Dao = db.${mod_class_name}Dao();
+            mEntities = entities;
+            mDataAccessListener = listener;
+            this.requestCode = requestCode;
+        }
+
+        @Override
+        protected Integer doInBackground(final Void... params) {
+            return m${entity_name}Dao.insertInChunks(mEntities, IMPORT_CHUNK_SIZE,
+                    inserted -> publishProgress(inserted));
+        }
+
+        @Override
+        protected void onProgressUpdate(Integer... values) {
+            super.onProgressUpdate(values);
+            if (mDataAccessListener != null)
+                mDataAccessListener.onDataSaveProgress(requestCode, values[0]);
+        }
+
+        @Override
+        protected void onPostExecute(Integer integer) {
+            super.onPostExecute(integer);
+            if (mDataAccessListener != null) {
+                if (requestCode == 0)
+                    mDataAccessListener.onDataSaved();
+                else mDataAccessListener.onDataSaved(requestCode);
+            }
+        }
+    }
+
+    /**
+     * A class to get entities, or projections of them, asynchronously
+     */
+    private static class GetAsync<T> extends AsyncTask<Void, Integer, List<T>> {
+        private final Query<T> mQuery;
+        private final T[] mEmpty;
+        private DataAccessListener mDataAccessListener;
+        private int requestCode;
+
+        GetAsync(Query<T> query, T[] empty, DataAccessListener listener, int requestCode) {
+            mQuery = query;
+            mEmpty = empty;
+            mDataAccessListener = listener;
+            this.requestCode = requestCode;
+        }
+
+        @Override
+        protected List<T> doInBackground(final Void... params) {
+            return mQuery.run();
+        }
+
+        @Override
+        protected void onProgressUpdate(Integer... values) {
+            super.onProgressUpdate(values);
+        }
+
+        @Override
+        protected void onPostExecute(List<T> entities) {
+            super.onPostExecute(entities);
+            if (entities != null)
+                if (mDataAccessListener != null) {
+                    T[] entitiesArray = entities.toArray(mEmpty);
+                    if (requestCode == 0)
+                        mDataAccessListener.onDataLoaded(entitiesArray);
+                    else mDataAccessListener.onDataRequestCompleted(requestCode, entitiesArray);
+                }
+        }
+    }
+}
+    
\ No newline at end of file
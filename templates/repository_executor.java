@@ -0,0 +1,156 @@
+package ${package_name}.data.repository;
+
+import android.content.Context;
+
+${live_data_import}${paging_import}
+import ${package_name}.data.DataAccessListener;
+import ${package_name}.data.DatabaseExecutors;
+import ${package_name}.data.${database_class_name};
+import ${package_name}.data.entity.${entity_name};
+${projection_imports}
+import java.util.Collections;
+import java.util.List;
+
+/**
+ * ${creation_note}.
+ */
+public class ${entity_name}Repository extends BaseRepository {
+    /**
+     * The number of entities imported in each transaction
+     */
+    private static final int IMPORT_CHUNK_SIZE = 500;
+
+    private ${database_class_name} db;
+    private static ${entity_name}Repository thisInstance;
+
+    /**
+     * A method to initialise the class and load the relevant data from the data streams provided
+     *
+     * @param context a {@link Context} instance to interact with the data
+     */
+    private ${entity_name}Repository(Context context) {
+        db = ${database_class_name}.getDatabase(context);
+    }
+
+    public static synchronized ${entity_name}Repository getInstance(Context context) {
+        if (thisInstance == null)
+            thisInstance = new ${entity_name}Repository(context);
+        return thisInstance;
+    }
+
+    /**
+     * Asynchronously insert a  entity into our local database
+     *
+     * @param entity the entity to insert
+     */
+    public void insert(${entity_name} entity) {
+        save(entity);
+    }
+
+    /**
+     * Asynchronously insert a list of entities into our local database
+     *
+     * @param entity the entity to insert
+     */
+    public void insert(${entity_name}[] entity) {
+        save(entity);
+    }
+
+    public void save${entity_name}s(List<${entity_name}> entities) {
+        if (entities != null) {
+            ${entity_name}[] items = new ${entity_name}[entities.size()];
+            items = entities.toArray(items);
+            save(items);
+        }
+    }
+
+    /**
+     * Asynchronously import any number of entities into our local database, a chunk at a time, reporting the
+     * progress to the listener with onDataSaveProgress and the end of the import with onDataSaved
+     *
+     * @param entities    the entities to import, which are read in the background and never copied into an array
+     * @param requestCode the code to report the import with, or 0 to report its end with onDataSaved()
+     */
+    public void import${entity_name}s(Iterable<${entity_name}> entities, int requestCode) {
+        final DataAccessListener listener = mDataAccessListener;
+        DatabaseExecutors executors = DatabaseExecutors.getInstance();
+        executors.writer().execute(() -> {
+            db.${mod_class_name}Dao().insertInChunks(entities, IMPORT_CHUNK_SIZE, inserted -> {
+                if (listener != null)
+                    executors.mainThread().execute(() -> listener.onDataSaveProgress(requestCode, inserted));
+            });
+            if (listener != null)
+                executors.mainThread().execute(() -> {
+                    if (requestCode == 0)
+                        listener.onDataSaved();
+                    else listener.onDataSaved(requestCode);
+                });
+        });
+    }
+
+    /**
+     * A method to get the list of {@link ${entity_name}}s in our database and notify listeners when the data is available.
+     */
+    public void load${entity_name}s() {
+        load(() -> db.${mod_class_name}Dao().getAll(), 0);
+    }${key_methods}${page_methods}${projection_methods}${observable_methods}
+
+    /**
+     * A query for {@link ${entity_name}}s, or for projections of them, to run in the background
+     */
+    private interface Query<T> {
+        List<T> run();
+    }
+
+    /**
+     * Saves entities on the writer executor, which runs the writes of every table one at a time
+     *
+     * @param entities the entities to save
+     */
+    private void save(final ${entity_name}... entities) {
+        DatabaseExecutors.getInstance().writer().execute(() -> db.${mod_class_name}Dao().insertAll(entities));
+    }
+
+    /**
+     * Runs a write on the writer executor, after the writes made before it
+     *
+     * @param write the write to run
+     */
+    private void write(Runnable write) {
+        DatabaseExecutors.getInstance().writer().execute(write);
+    }
+
+    /**
+     * Runs a query for {@link ${entity_name}}s in the background and returns them to the listener
+     *
+     * @param query       the query to run
+     * @param requestCode the code to return the results with, or 0 to return them with onDataLoaded
+     */
+    private void load(Query<${entity_name}> query, int requestCode) {
+        load(query, new ${entity_name}[0], requestCode);
+    }
+
+    /**
+     * Runs a query on the reader executor and returns its results to the listener on the main thread
+     *
+     * @param query       the query to run
+     * @param empty       an empty array of the type of the results
+     * @param requestCode the code to return the results with, or 0 to return them with onDataLoaded
+     */
+    private <T> void load(final Query<T> query, final T[] empty, final int requestCode) {
+        final DataAccessListener listener = mDataAccessListener;
+        DatabaseExecutors executors = DatabaseExecutors.getInstance();
+        executors.reader().execute(() -> {
+            List<T> entities = query.run();
+            if (entities == null || listener == null)
+                return;
+            T[] entitiesArray = entities.toArray(empty);
+            executors.mainThread().execute(() -> {
+                if (requestCode == 0)
+                    listener.onDataLoaded(entitiesArray);
+                else listener.onDataRequestCompleted(requestCode, entitiesArray);
+            });
+        });
+    }
+}
+
@@ -0,0 +1,33 @@
+    /**
+     * A method to get the {@link ${class_name}} with a ${column_name} and notify listeners when it is available,
+     * as an array of the entity, or an empty array if there is none.
+     *
+     * @param ${java_name} the ${column_name} of the entity
+     * @param requestCode the code to return the entity with, or 0 to return it with onDataLoaded
+     */
+    public void loadBy${accessor_name}(${java_type} ${java_name}, int requestCode) {
+        load(() -> {
+            ${class_name} entity = db.${mod_class_name}Dao().getBy${accessor_name}(${java_name});
+            return entity == null ? Collections.emptyList() : Collections.singletonList(entity);
+        }, requestCode);
+    }
+
+    /**
+     * A method to get the {@link ${class_name}}s with some ${column_name}s and notify listeners when they are
+     * available.
+     *
+     * @param ${java_name}s the ${column_name}s of the entities
+     * @param requestCode the code to return the entities with, or 0 to return them with onDataLoaded
+     */
+    public void loadBy${accessor_name}s(List<${boxed_type}> ${java_name}s, int requestCode) {
+        load(() -> db.${mod_class_name}Dao().getBy${accessor_name}s(${java_name}s), requestCode);
+    }
+
+    /**
+     * Asynchronously delete the {@link ${class_name}}s with some ${column_name}s
+     *
+     * @param ${java_name}s the ${column_name}s of the entities
+     */
+    public void deleteBy${accessor_name}s(List<${boxed_type}> ${java_name}s) {
+        write(() -> db.${mod_class_name}Dao().deleteBy${accessor_name}s(${java_name}s));
+    }
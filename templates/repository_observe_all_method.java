@@ -0,0 +1,9 @@
+    /**
+     * A method to observe the list of {@link ${class_name}}s in our database, which is only passed on when it
+     * changed, rather than whenever its table was written to.
+     *
+     * @return the {@link ${class_name}}s
+     */
+    public LiveData<List<${class_name}>> observe${class_name}s() {
+        return Transformations.distinctUntilChanged(db.${mod_class_name}Dao().observeAll());
+    }
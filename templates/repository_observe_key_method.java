@@ -0,0 +1,10 @@
+    /**
+     * A method to observe the {@link ${class_name}} with a ${column_name}, which is only passed on when it changed.
+     *
+     * @param ${java_name} the ${column_name} of the entity
+     * @return the entity, or null if there is none
+     */
+    public LiveData<${class_name}> observeBy${accessor_name}(${java_type} ${java_name}) {
+        return Transformations.distinctUntilChanged(
+                db.${mod_class_name}Dao().observeBy${accessor_name}(${java_name}));
+    }
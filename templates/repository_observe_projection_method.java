@@ -0,0 +1,9 @@
+    /**
+     * A method to observe the {@link ${projection_class_name}}s of all the {@link ${class_name}}s, which are only
+     * passed on when they changed.
+     *
+     * @return the {@link ${projection_class_name}}s
+     */
+    public LiveData<List<${projection_class_name}>> observe${projection_class_name}List() {
+        return Transformations.distinctUntilChanged(db.${mod_class_name}Dao().observe${projection_class_name}List());
+    }
@@ -0,0 +1,11 @@
+    /**
+     * A method to get the page of {@link ${class_name}}s after a ${column_name} and notify listeners when it is
+     * available, without reading the entities before it.
+     *
+     * @param ${java_name} the ${column_name} of the last entity of the previous page
+     * @param limit       the largest number of entities to get
+     * @param requestCode the code to return the page with, or 0 to return it with onDataLoaded
+     */
+    public void loadPageAfter${accessor_name}(${java_type} ${java_name}, int limit, int requestCode) {
+        load(() -> db.${mod_class_name}Dao().getPageAfter${accessor_name}(${java_name}, limit), requestCode);
+    }
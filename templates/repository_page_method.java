@@ -0,0 +1,10 @@
+    /**
+     * A method to get a page of {@link ${class_name}}s and notify listeners when it is available.
+     *
+     * @param limit       the largest number of entities to get
+     * @param offset      the number of entities to skip
+     * @param requestCode the code to return the page with, or 0 to return it with onDataLoaded
+     */
+    public void loadPage(int limit, int offset, int requestCode) {
+        load(() -> db.${mod_class_name}Dao().getPage(limit, offset), requestCode);
+    }
@@ -0,0 +1,6 @@
+    /**
+     * @return a source of the pages of {@link ${class_name}}s for the Paging library
+     */
+    public PagingSource<Integer, ${class_name}> getPagingSource() {
+        return db.${mod_class_name}Dao().getPagingSource();
+    }
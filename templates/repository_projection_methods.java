@@ -0,0 +1,20 @@
+    /**
+     * A method to get the {@link ${projection_class_name}}s of all the {@link ${class_name}}s and notify listeners when they
+     * are available.
+     *
+     * @param requestCode the code to return them with, or 0 to return them with onDataLoaded
+     */
+    public void load${projection_class_name}List(int requestCode) {
+        load(() -> db.${mod_class_name}Dao().get${projection_class_name}List(), new ${projection_class_name}[0], requestCode);
+    }
+
+    /**
+     * A method to get a page of {@link ${projection_class_name}}s and notify listeners when it is available.
+     *
+     * @param limit       the largest number of projections to get
+     * @param offset      the number of projections to skip
+     * @param requestCode the code to return the page with, or 0 to return it with onDataLoaded
+     */
+    public void load${projection_class_name}Page(int limit, int offset, int requestCode) {
+        load(() -> db.${mod_class_name}Dao().get${projection_class_name}Page(limit, offset), new ${projection_class_name}[0], requestCode);
+    }
@@ -0,0 +1,54 @@
+import re
+import sqlite3
+
+import pytest
+
+import create_room_from_schema as room
+import database_asset
+
+
+@pytest.mark.parametrize("schema", [
+    "CREATE TABLE a(x);  -- note\nCREATE INDEX i ON a(x);\nINSERT INTO a VALUES (1);\n",
+    "CREATE TABLE a(x); CREATE INDEX i ON a(x); INSERT INTO a VALUES (1);",
+    "BEGIN TRANSACTION;\nCREATE TABLE a(x); /* note; */ CREATE INDEX i ON a(x);\n"
+    "CREATE TRIGGER t AFTER INSERT ON a BEGIN SELECT 1; END; INSERT INTO a VALUES (1);\nCOMMIT;\n",
+])
+def test_statements_that_share_a_line_or_end_in_a_comment(tmp_path, schema):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text(schema)
+    asset_file = tmp_path / "assets" / "databases" / "app.db"
+
+    assert database_asset.build_database_asset(str(schema_file), str(asset_file), version=3)
+    connection = sqlite3.connect(str(asset_file))
+    try:
+        names = {name for name, in connection.execute("SELECT name FROM sqlite_master")}
+        assert {"a", "i"} <= names
+        assert connection.execute("SELECT x FROM a").fetchall() == [(1,)]
+        assert connection.execute("PRAGMA user_version").fetchone() == (3,)
+    finally:
+        connection.close()
+    # the asset is left as it is when it is built again from the same schema
+    assert not database_asset.build_database_asset(str(schema_file), str(asset_file), version=3)
+    assert database_asset.get_asset_name(str(asset_file)) == "databases/app.db"
+
+
+def test_asset_has_the_indexes_the_entities_declare(tmp_path):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text("CREATE TABLE wallets (id INTEGER PRIMARY KEY, code TEXT UNIQUE, a INT, b INT,\n"
+                           "                      UNIQUE (a, b));\n"
+                           "CREATE INDEX wallets_by_a ON wallets (a);\n")
+    asset_file = tmp_path / "assets" / "databases" / "app.db"
+    assert database_asset.build_database_asset(str(schema_file), str(asset_file))
+
+    options = room.RoomOptions(asset=database_asset.get_asset_name(str(asset_file)))
+    for schema in (str(schema_file), str(asset_file)):
+        files = room.generate(schema, deterministic=True, options=options)
+        declared = set(re.findall(r'@Index\(name = "(\w+)"', files["data/entity/Wallets.java"]))
+        connection = sqlite3.connect(str(asset_file))
+        try:
+            # room reads the indexes created with CREATE INDEX, and leaves out those of the constraints
+            created = {name for _, name, _, origin, _ in connection.execute("PRAGMA index_list(wallets)")
+                       if origin == "c"}
+        finally:
+            connection.close()
+        assert declared == created == {"index_wallets_code", "index_wallets_a_b", "wallets_by_a"}
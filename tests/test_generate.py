@@ -0,0 +1,80 @@
+import io
+import os
+
+import pytest
+
+import create_room_from_schema as room
+
+
+SAMPLE_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_app_db.sql")
+
+
+@pytest.mark.parametrize("jobs", [0, -1])
+def test_jobs_of_zero_or_less_use_every_cpu(jobs):
+    files = room.generate(SAMPLE_SCHEMA, deterministic=True, jobs=jobs)
+    assert files == room.generate(SAMPLE_SCHEMA, deterministic=True, jobs=1)
+
+
+def test_generate_from_a_file_object():
+    files = room.generate(io.StringIO("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT NOT NULL);"),
+                          deterministic=True)
+    assert "data/entity/Notes.java" in files
+    assert "data/AppDatabase.java" in files
+
+
+def test_method_templates_can_be_overridden(tmp_path):
+    (tmp_path / "dao_page_query.java").write_text("    // the page query of ${table_name}\n")
+    try:
+        files = room.generate(SAMPLE_SCHEMA, deterministic=True, template_dir=str(tmp_path))
+    finally:
+        room.template_engine.use_template_dir(None)
+    assert "\n\n    // the page query of walletses\n" in files["data/dao/WalletsDao.java"]
+
+
+def test_entities_only_map_the_schema_table_names_with_an_asset():
+    files = room.generate(SAMPLE_SCHEMA, deterministic=True)
+    assert 'TABLE_NAME = "walletses"' in files["data/entity/Wallets.java"]
+    files = room.generate(SAMPLE_SCHEMA, deterministic=True, options=room.RoomOptions(asset="databases/app.db"))
+    assert 'TABLE_NAME = "wallets"' in files["data/entity/Wallets.java"]
+
+
+def test_watcher_keeps_its_files_when_the_schema_fails_to_parse(tmp_path, capsys):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT NOT NULL);\n")
+    output_dir = tmp_path / "output"
+    watcher = room.SchemaWatcher(str(schema_file), "com.example", "AppDatabase", "app.db", str(output_dir),
+                                 deterministic=True)
+    assert watcher.poll()
+    entity_file = output_dir / "data" / "entity" / "Notes.java"
+    entity = entity_file.read_text()
+
+    schema_file.write_text("CREATE TABLE notes (id INTEGER, body TEXT, PRIMARY KEY);\n")
+    assert not watcher.poll()
+    assert "Unable to parse the table notes" in capsys.readouterr().err
+    assert entity_file.read_text() == entity
+    # the same schema is not read again, the next change is
+    assert not watcher.poll()
+    assert capsys.readouterr().err == ""
+
+    schema_file.write_text("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT NOT NULL, tag TEXT);\n")
+    assert watcher.poll()
+    assert "tag" in entity_file.read_text()
+
+
+def test_database_version():
+    files = room.generate(SAMPLE_SCHEMA, deterministic=True, options=room.RoomOptions(version=2))
+    assert ", version = 2)" in files["data/AppDatabase.java"]
+
+
+@pytest.mark.parametrize("lines, error", [
+    ("wallets: id\nexpenses Wallets: id, amount\n", ":2: The projection Wallets has the class name of the entity of "
+                                                    "wallets"),
+    ("wallets Ids: id\nexpenses Ids: id\n", ":2: there is already a projection named Ids"),
+])
+def test_projection_class_names_must_be_their_own(tmp_path, lines, error):
+    projections_file = tmp_path / "projections.txt"
+    projections_file.write_text(lines)
+    with pytest.raises(ValueError) as exc:
+        options = room.RoomOptions(projections=room.read_projections(str(projections_file)))
+        room.generate(SAMPLE_SCHEMA, deterministic=True, options=options)
+    assert str(exc.value) == str(projections_file) + error
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+import generator_server
+
+
+SAMPLE_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_app_db.sql")
+
+
+@pytest.mark.parametrize("targets, dart", [(["room"], False), ("room", False), ("room, dart", True),
+                                           (["room", "dart"], True)])
+def test_targets_are_a_list_or_a_comma_separated_string(targets, dart):
+    response = generator_server.GeneratorServer().handle(
+        {"id": 1, "schema": SAMPLE_SCHEMA, "targets": targets, "deterministic": True})
+    assert "error" not in response
+    assert "data/entity/Wallets.java" in response["files"]
+    assert ("data/wallets.dart" in response["files"]) == dart
+
+
+@pytest.mark.parametrize("targets", [{"room": True}, [], "", ["room", 1], "room,kotlin"])
+def test_other_targets_are_an_error(targets):
+    response = generator_server.GeneratorServer().handle({"id": 1, "schema": SAMPLE_SCHEMA, "targets": targets})
+    assert response["error"].startswith("ValueError: ")
+    assert "files" not in response
@@ -0,0 +1,58 @@
+import os
+import sqlite3
+
+import schema_cache
+import schema_reader
+
+
+SCHEMA = "CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT NOT NULL);\n"
+
+
+def count_hashes(monkeypatch):
+    hashed = list()
+    hash_file = schema_cache.hash_file
+    monkeypatch.setattr(schema_cache, "hash_file", lambda path: hashed.append(path) or hash_file(path))
+    return hashed
+
+
+def test_unchanged_schema_is_not_hashed_again(tmp_path, monkeypatch):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text(SCHEMA)
+    cache_dir = str(tmp_path / "cache")
+    hashed = count_hashes(monkeypatch)
+
+    first = schema_reader.read_tables(str(schema_file), cache_dir=cache_dir)
+    second = schema_reader.read_tables(str(schema_file), cache_dir=cache_dir)
+    assert len(hashed) == 1
+    assert [table.name for table in first] == [table.name for table in second] == ["notes"]
+
+    # a change of the file changes its signature, so that it is hashed and parsed again
+    schema_file.write_text(SCHEMA + "CREATE TABLE tags (name TEXT);\n")
+    third = schema_reader.read_tables(str(schema_file), cache_dir=cache_dir)
+    assert len(hashed) == 2
+    assert [table.name for table in third] == ["notes", "tags"]
+
+
+def test_cache_key_follows_the_parser_version(tmp_path, monkeypatch):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text(SCHEMA)
+    cache_dir = str(tmp_path / "cache")
+    key = schema_cache.get_cache_key(str(schema_file), cache_dir)
+    assert key.startswith(schema_cache.get_parser_version() + "-")
+
+    monkeypatch.setattr(schema_cache, "_parser_version", "another")
+    assert schema_cache.get_cache_key(str(schema_file), cache_dir).startswith("another-")
+
+
+def test_sqlite_databases_bypass_the_cache(tmp_path, monkeypatch):
+    database_file = tmp_path / "schema.db"
+    connection = sqlite3.connect(str(database_file))
+    connection.executescript(SCHEMA)
+    connection.close()
+    cache_dir = tmp_path / "cache"
+    hashed = count_hashes(monkeypatch)
+
+    tables = schema_reader.read_tables(str(database_file), cache_dir=str(cache_dir))
+    assert [table.name for table in tables] == ["notes"]
+    assert hashed == []
+    assert not os.path.exists(str(cache_dir))
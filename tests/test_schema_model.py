@@ -0,0 +1,41 @@
+import pytest
+
+import schema_model
+
+
+# the declared type, its affinity, its java type when not null and when nullable, and its dart type
+TYPES = [
+    ("INTEGER", "INTEGER", "long", "Long", "int"),
+    ("BIGINT", "INTEGER", "long", "Long", "int"),
+    ("UNSIGNED BIG INT", "INTEGER", "long", "Long", "int"),
+    ("INT", "INTEGER", "int", "Integer", "int"),
+    ("int2", "INTEGER", "int", "Integer", "int"),
+    ("TINYINT", "INTEGER", "int", "Integer", "int"),
+    ("SMALLINT", "INTEGER", "int", "Integer", "int"),
+    ("MEDIUMINT", "INTEGER", "int", "Integer", "int"),
+    ("INT8", "INTEGER", "long", "Long", "int"),
+    ("BOOLEAN", "NUMERIC", "boolean", "Boolean", "bool"),
+    ("TEXT", "TEXT", "String", "String", "String"),
+    ("VARCHAR(255)", "TEXT", "String", "String", "String"),
+    ("NCHAR(55)", "TEXT", "String", "String", "String"),
+    ("CLOB", "TEXT", "String", "String", "String"),
+    ("BLOB", "BLOB", "byte[]", "byte[]", "String"),
+    ("", "BLOB", "String", "String", "String"),
+    ("REAL", "REAL", "double", "Double", "double"),
+    ("DOUBLE PRECISION", "REAL", "double", "Double", "double"),
+    ("FLOAT", "REAL", "double", "Double", "double"),
+    ("NUMERIC", "NUMERIC", "double", "Double", "double"),
+    ("DECIMAL(10,2)", "NUMERIC", "double", "Double", "double"),
+    ("DATE", "NUMERIC", "String", "String", "String"),
+    ("DATETIME", "NUMERIC", "String", "String", "String"),
+    ("TIMESTAMP", "NUMERIC", "long", "Long", "int"),
+]
+
+
+@pytest.mark.parametrize("data_type, affinity, java_type, nullable_java_type, dart_type", TYPES)
+def test_types_follow_the_affinity_of_the_declared_type(data_type, affinity, java_type, nullable_java_type,
+                                                        dart_type):
+    assert schema_model.get_affinity(data_type) == affinity
+    assert schema_model.get_java_type(data_type) == java_type
+    assert schema_model.get_java_type(data_type, nullable=True) == nullable_java_type
+    assert schema_model.get_dart_type(data_type) == dart_type
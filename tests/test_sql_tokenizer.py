@@ -0,0 +1,118 @@
+import io
+
+import pytest
+
+import schema_reader
+import sql_tokenizer
+
+
+SCHEMA = """-- a comment; with a semicolon
+CREATE TABLE "semi;colon" (
+    id INTEGER PRIMARY KEY, -- the key; of the table
+    note TEXT DEFAULT 'a;b(c', /* a block; comment ( */
+    [odd;name] VARCHAR(10) NOT NULL
+);
+INSERT INTO "semi;colon" VALUES (1, 'it''s;);', 'y');
+CREATE TRIGGER touch AFTER INSERT ON "semi;colon" BEGIN
+    UPDATE "semi;colon" SET note = 'z;' WHERE id = new.id;
+    SELECT CASE WHEN 1 THEN 2 END;
+END;
+/* a comment between statements; */
+CREATE UNIQUE INDEX idx ON "semi;colon" (`odd;name`);
+CREATE TABLE tail (value TEXT)
+"""
+
+EXPECTED_TABLES = {
+    "semi;colon": {"columns": [("id", "INTEGER", "primary key"), ("note", "TEXT", ""),
+                               ("odd;name", "VARCHAR(10)", "not null")],
+                   "indexes": [("idx", True, ["odd;name"], "")], "foreign_keys": []},
+    "tail": {"columns": [("value", "TEXT", ""), ("auto_incremented_id_field", "INTEGER", "primary key")],
+             "indexes": [], "foreign_keys": []},
+}
+
+
+def statements(text, chunk_size=sql_tokenizer.CHUNK_SIZE, keep=None):
+    return list(sql_tokenizer.iter_statements(io.StringIO(text), chunk_size, keep))
+
+
+def test_splits_on_top_level_semicolons():
+    result = statements(SCHEMA)
+    assert [sql_tokenizer.leading_keywords(statement, 2) for statement in result] == [
+        ["CREATE", "TABLE"], ["INSERT", "INTO"], ["CREATE", "TRIGGER"], ["CREATE", "UNIQUE"], ["CREATE", "TABLE"]]
+    assert result[1] == "INSERT INTO \"semi;colon\" VALUES (1, 'it''s;);', 'y')"
+    assert result[-1] == "CREATE TABLE tail (value TEXT)"
+
+
+@pytest.mark.parametrize("chunk_size", list(range(1, 48)) + [97, 251])
+def test_statements_across_chunk_boundaries(chunk_size):
+    assert statements(SCHEMA, chunk_size) == statements(SCHEMA)
+
+
+def test_quoted_semicolons_and_parentheses():
+    text = "CREATE TABLE `a;(` (\"b;(\" TEXT DEFAULT ';(', [c;)] INT); SELECT ';'"
+    assert statements(text) == ["CREATE TABLE `a;(` (\"b;(\" TEXT DEFAULT ';(', [c;)] INT)", "SELECT ';'"]
+    _, name, data = schema_reader.parse_statement(statements(text)[0])
+    assert name == "a;("
+    assert [column[0] for column in data["columns"]] == ["b;(", "c;)", "auto_incremented_id_field"]
+
+
+def test_comments():
+    text = "-- only; a comment\n/* a ; block\n comment */ CREATE TABLE a (x INT); -- trailing;\n/* unterminated;"
+    assert statements(text, keep=sql_tokenizer.is_create_table) == [
+        "-- only; a comment\n/* a ; block\n comment */ CREATE TABLE a (x INT)"]
+    assert list(sql_tokenizer.tokenize("a -- b;\n/* c; */ d")) == [("word", "a"), ("word", "d")]
+
+
+def test_trigger_bodies():
+    text = ("CREATE TEMP TRIGGER t BEFORE DELETE ON a BEGIN\n"
+            "  DELETE FROM b WHERE x = old.x;\n"
+            "  SELECT CASE WHEN old.x > 0 THEN RAISE(ABORT, 'no;') END;\n"
+            "END;\nCREATE TABLE c (y INT);")
+    result = statements(text)
+    assert len(result) == 2
+    assert result[0].endswith("END")
+    assert result[1] == "CREATE TABLE c (y INT)"
+
+
+def test_mapped_and_text_paths_match(tmp_path):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text(SCHEMA)
+    keep = sql_tokenizer.is_create_table_or_index
+    assert list(sql_tokenizer.iter_mapped_ddl_statements(str(schema_file), keep)) == statements(SCHEMA, keep=keep)
+    assert schema_reader.read_sql_file(str(schema_file), use_mmap=True) == EXPECTED_TABLES
+    assert schema_reader.read_sql_file(str(schema_file)) == EXPECTED_TABLES
+
+
+def test_mapped_path_of_an_empty_file(tmp_path):
+    schema_file = tmp_path / "empty.sql"
+    schema_file.write_text("")
+    assert list(sql_tokenizer.iter_mapped_schema_statements(str(schema_file))) == []
+
+
+def test_parenthesized_defaults():
+    _, name, data = schema_reader.parse_statement(
+        "CREATE TABLE t (a INTEGER DEFAULT (strftime('%s', 'now')) NOT NULL, b TEXT DEFAULT ('a,b'))")
+    assert data["columns"][:2] == [("a", "INTEGER", "not null"), ("b", "TEXT", "")]
+
+
+def test_mapped_and_text_paths_match_across_empty_statements(tmp_path):
+    text = "CREATE TABLE a (x INT);\n;\n  ; -- nothing\n;CREATE TABLE b (y INT);\n;"
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text(text)
+    keep = sql_tokenizer.is_create_table_or_index
+    assert list(sql_tokenizer.iter_mapped_ddl_statements(str(schema_file), keep)) == statements(text, keep=keep)
+    assert sorted(schema_reader.read_sql_file(str(schema_file), use_mmap=True)) == ["a", "b"]
+
+
+@pytest.mark.parametrize("statement", [
+    "CREATE TABLE broken (id INT, PRIMARY KEY)",
+    "CREATE TABLE broken (id INT, UNIQUE ())",
+    "CREATE TABLE broken (id INT REFERENCES)",
+    "CREATE TABLE broken (id INT, FOREIGN KEY (id))",
+    "CREATE TABLE broken (id INT, FOREIGN KEY (id) REFERENCES (id))",
+])
+def test_malformed_keys_name_the_table_and_the_statement(statement):
+    with pytest.raises(ValueError) as error:
+        schema_reader.parse_statement(statement)
+    assert str(error.value).startswith("Unable to parse the table broken, ")
+    assert str(error.value).endswith(": " + statement)
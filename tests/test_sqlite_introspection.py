@@ -0,0 +1,36 @@
+import sqlite3
+
+import schema_reader
+import sqlite_introspection
+
+
+SCHEMA = """CREATE TABLE parents (id INTEGER PRIMARY KEY, a INT, b INT, UNIQUE (a, b));
+CREATE TABLE children (
+    x INT REFERENCES parents ON DELETE CASCADE,
+    y INT,
+    z INT,
+    w INT REFERENCES "parents" (a) ON UPDATE SET DEFAULT,
+    CONSTRAINT pair FOREIGN KEY (y, z) REFERENCES parents (a, b) ON UPDATE SET NULL ON DELETE RESTRICT
+);
+"""
+
+FOREIGN_KEYS = [("parents", ["x"], [], "NO ACTION", "CASCADE"),
+                ("parents", ["w"], ["a"], "SET DEFAULT", "NO ACTION"),
+                ("parents", ["y", "z"], ["a", "b"], "SET NULL", "RESTRICT")]
+
+
+def test_foreign_keys_of_a_database_and_its_schema_match(tmp_path):
+    schema_file = tmp_path / "schema.sql"
+    schema_file.write_text(SCHEMA)
+    database_file = tmp_path / "schema.db"
+    connection = sqlite3.connect(str(database_file))
+    connection.executescript(SCHEMA)
+    connection.close()
+
+    assert sqlite_introspection.is_sqlite_database(str(database_file))
+    from_database = sqlite_introspection.read_sqlite_database(str(database_file))
+    from_schema = schema_reader.read_sql_file(str(schema_file))
+    assert from_database["children"]["foreign_keys"] == FOREIGN_KEYS
+    assert from_schema["children"]["foreign_keys"] == FOREIGN_KEYS
+    assert from_database["parents"]["foreign_keys"] == from_schema["parents"]["foreign_keys"] == []
+